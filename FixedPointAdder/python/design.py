@@ -0,0 +1,75 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# The repository root holds the shared fixedpoint package
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+import fixedpoint as fx
+from fixedpoint import hold, to_fixed, to_real, wrap
+
+WIDTH = 8   # FixedPointAdder.v's defaults
+FBITS = 4
+
+
+def add(a, b, width=WIDTH):
+    """
+    What FixedPointAdder registers the clock after i_start, for any number
+    of additions at once.
+
+    The operands are added one bit wider than WIDTH, so the sum is exact,
+    and a sum outside the signed WIDTH bit range saturates to MAX_VAL_EXT
+    or MIN_VAL_EXT and sets o_overflow; o_valid is high (with o_done) when
+    it doesn't. The binary point plays no part: FBITS only scales the
+    values.
+
+    Args:
+        a, b: Operands, raw two's complement fixed-point integers (negative,
+            or their unsigned 'width' bit encodings). They broadcast
+            together.
+        width: WIDTH.
+
+    Returns:
+        A tuple (o_val, o_overflow, o_valid) of arrays shaped like the
+        broadcast inputs, o_val as signed integers.
+    """
+    a, b = np.broadcast_arrays(wrap(a, width), wrap(b, width))
+    total = fx.add(a, b, width, overflow=None)
+    o_overflow = ~fx.fits(total, width)
+    return fx.saturate(total, width), o_overflow, ~o_overflow
+
+
+def stream(a, b, valid, width=WIDTH, initial=0):
+    """
+    What FixedPointAdder with STREAM=1 registers, clock by clock, for
+    operands driven one clock each: entry k is read the clock after a[k]
+    and b[k] are on the inputs.
+
+    Every clock i_valid is high adds a sample: o_done goes high with its
+    saturated sum on o_val, and o_valid with it unless o_overflow flags the
+    saturation, as in add(). On the other clocks o_valid and o_overflow are
+    low and o_val holds.
+
+    Args:
+        a, b: Operands, as for add(), one per clock.
+        valid: i_valid, one per clock.
+        width: WIDTH.
+        initial: o_val before the first sample (0 after reset).
+
+    Returns:
+        A tuple (o_val, o_overflow, o_valid) of flat arrays, one entry per
+        clock.
+    """
+    valid = np.asarray(valid, dtype=bool).ravel()
+    o_val, o_overflow, o_valid = add(np.ravel(a), np.ravel(b), width)
+    return hold(o_val, valid, initial), valid & o_overflow, valid & o_valid
+
+
+def all_pairs(width=WIDTH):
+    """
+    Every (a, b) pair of signed 'width' bit operands, 2**(2*width) of them,
+    as two flat arrays: a is the slow index, b the fast one.
+    """
+    values = np.arange(-(1 << (width - 1)), 1 << (width - 1), dtype=np.int64)
+    a, b = np.meshgrid(values, values, indexing="ij")
+    return a.ravel(), b.ravel()
@@ -32,12 +32,14 @@
 module FixedPointAdder #(
     parameter WIDTH=8,                                  // width of numbers in bits (integer and fractional)
     /* verilator lint_off UNUSEDPARAM */
-    parameter FBITS=4                                   // fractional bits within WIDTH
+    parameter FBITS=4,                                  // fractional bits within WIDTH
     /* verilator lint_on UNUSEDPARAM */
+    parameter STREAM=0                                  // 1: registered single-cycle mode, one addition per clock on i_valid
     ) (
     input wire logic i_clk,                             // clock
     input wire logic i_rst,                             // reset
-    input wire logic i_start,                           // start calculation
+    input wire logic i_start,                           // start calculation (STREAM=0)
+    input wire logic i_valid,                           // operands hold a sample to add (STREAM=1)
     output      logic o_busy,                           // calculation in progress
     output      logic o_done,                           // calculation is complete (high for one tick)
     output      logic o_valid,                          // result is valid
@@ -60,38 +62,79 @@ localparam signed [WIDTH:0] MIN_VAL_EXT  = -(2**(WIDTH-1));
 // Perform the addition using the wider intermediate sum_extended
 assign sum_extended = i_operandA + i_operandB;
 
-    always @(posedge i_clk) begin
-        if(i_rst) begin
-            o_val <= '0;                                // Reset output value to all zeros
-            o_done <= 1'b0;                             // Reset done signal
-        end else begin
-            o_done <= 1'b0;                             // Default to 0
-            o_overflow <= 1'b0;                         // Reset overflow flag
+generate
+    if (STREAM == 0) begin : gen_handshake
+        /* verilator lint_off UNUSEDSIGNAL */
+        wire unused_valid = i_valid;
+        /* verilator lint_on UNUSEDSIGNAL */
 
-            if(i_start) begin
-                o_overflow <= 1'b0;                     // Reset overflow flag
-                // Apply saturation logic based on sum_extended
-                // Compare sum_extended (WIDTH+1 bits) with MAX_VAL_EXT/MIN_VAL_EXT (also WIDTH+1 bits)
+        always @(posedge i_clk) begin
+            if(i_rst) begin
+                o_val <= '0;                                // Reset output value to all zeros
+                o_done <= 1'b0;                             // Reset done signal
+            end else begin
+                o_done <= 1'b0;                             // Default to 0
+                o_overflow <= 1'b0;                         // Reset overflow flag
+
+                if(i_start) begin
+                    o_overflow <= 1'b0;                     // Reset overflow flag
+                    // Apply saturation logic based on sum_extended
+                    // Compare sum_extended (WIDTH+1 bits) with MAX_VAL_EXT/MIN_VAL_EXT (also WIDTH+1 bits)
+                    if (sum_extended > MAX_VAL_EXT) begin
+                        // Signal flag
+                        o_overflow <= 1'b1;                // Set overflow flag
+                        // Assign the WIDTH-bit version of the max value
+                        o_val <= MAX_VAL_EXT[WIDTH-1:0];
+                    end else if (sum_extended < MIN_VAL_EXT) begin
+                        // Signal flag
+                        o_overflow <= 1'b1;                // Set overflow flag
+                        // Assign the WIDTH-bit version of the min value
+                        o_val <= MIN_VAL_EXT[WIDTH-1:0];
+                    end else begin
+                        // No saturation needed, take the lower WIDTH bits of sum_extended
+                        o_val <= $signed(sum_extended[WIDTH-1:0]);
+                    end
+                    o_done <= 1'b1;                         // Indicate that the operation is done
+                end
+            end
+        end
+    
+        assign o_valid = (o_done)&&(!o_overflow);                        // Result is valid
+        assign o_busy = (i_start) || (o_done && !o_valid);               // Busy if start is high or done but not valid
+
+    end else begin : gen_stream
+        // Registered single-cycle mode: a sample every clock i_valid is high,
+        // its saturated sum on o_val the next clock with o_done. As in the
+        // handshake mode, o_overflow flags a saturated sum and drops o_valid;
+        // o_val holds between samples and nothing is ever busy.
+        /* verilator lint_off UNUSEDSIGNAL */
+        wire unused_start = i_start;
+        /* verilator lint_on UNUSEDSIGNAL */
+
+        always @(posedge i_clk) begin
+            o_done <= i_valid;
+            o_overflow <= 1'b0;
+            if(i_valid) begin
                 if (sum_extended > MAX_VAL_EXT) begin
-                    // Signal flag
-                    o_overflow <= 1'b1;                // Set overflow flag
-                    // Assign the WIDTH-bit version of the max value
+                    o_overflow <= 1'b1;
                     o_val <= MAX_VAL_EXT[WIDTH-1:0];
                 end else if (sum_extended < MIN_VAL_EXT) begin
-                    // Signal flag
-                    o_overflow <= 1'b1;                // Set overflow flag
-                    // Assign the WIDTH-bit version of the min value
+                    o_overflow <= 1'b1;
                     o_val <= MIN_VAL_EXT[WIDTH-1:0];
                 end else begin
-                    // No saturation needed, take the lower WIDTH bits of sum_extended
                     o_val <= $signed(sum_extended[WIDTH-1:0]);
                 end
-                o_done <= 1'b1;                         // Indicate that the operation is done
+            end
+            if(i_rst) begin
+                o_val <= '0;
+                o_done <= 1'b0;
+                o_overflow <= 1'b0;
             end
         end
+
+        assign o_valid = (o_done)&&(!o_overflow);                        // Result is valid
+        assign o_busy = 1'b0;                                           // Ready for a sample every clock
     end
-    
-    assign o_valid = (o_done)&&(!o_overflow);                        // Result is valid
-    assign o_busy = (i_start) || (o_done && !o_valid);               // Busy if start is high or done but not valid
+endgenerate
 
 endmodule
@@ -64,9 +64,25 @@
 	//
 	////////////////////////////////////////////////////
 
-	// o_valid is valid when adder is done and there's no overflow
+	// o_valid is valid when adder is done and there's no overflow, in
+	// either mode
 	always @(*)
 		assert(o_valid == ((o_done)&&(!o_overflow)));
+
+	// Streaming: every sample is a result, one clock later, and the adder
+	// is never busy
+	always @(*)
+		if(STREAM != 0)
+			assert(!o_busy);
+	always @(posedge i_clk) begin
+		if((STREAM != 0)&&(f_past_valid)&&(!$past(i_rst))) begin
+			assert(o_done == $past(i_valid));
+			if(!$past(i_valid)) begin
+				assert(!o_overflow);
+				assert($stable(o_val));
+			end
+		end
+	end
 	
     ////////////////////////////////////////////////////
 	//
@@ -76,11 +92,23 @@
 
 	// If o_valid && o_done, then o_val is the sum of the operands
  	always @(posedge i_clk) begin
-		if(($past(f_past_valid))&&(f_past_valid)&&(!$past(i_rst))&&($past(i_start))&&(o_valid)&&(o_done)) begin
+		if((STREAM == 0)&&($past(f_past_valid))&&(f_past_valid)&&(!$past(i_rst))&&($past(i_start))&&(o_valid)&&(o_done)) begin
 			assert(o_val == $past(i_operandA) + $past(i_operandB));
 		end
 	end
 
+	// Streaming: o_val is the saturated sum of the sample
+	always @(posedge i_clk) begin
+		if((STREAM != 0)&&(f_past_valid)&&(!$past(i_rst))&&($past(i_valid))) begin
+			if($past(sum_extended) > MAX_VAL_EXT)
+				assert((o_overflow)&&(o_val == MAX_VAL_EXT[WIDTH-1:0]));
+			else if($past(sum_extended) < MIN_VAL_EXT)
+				assert((o_overflow)&&(o_val == MIN_VAL_EXT[WIDTH-1:0]));
+			else
+				assert((!o_overflow)&&(o_val == $past(i_operandA) + $past(i_operandB)));
+		end
+	end
+
     ////////////////////////////////////////////////////
 	//
 	// Induction
@@ -97,11 +125,23 @@
 			cover(o_valid);
 		end
 	end  
-	always @(posedge i_clk) begin
-		if((f_past_valid)&&(!$past(i_rst))) begin
-			cover(o_busy);
+	// A cover under a constant-false condition is still an unreached
+	// cover, so each mode's covers are only generated in that mode
+	generate if (STREAM == 0) begin : f_cover_handshake
+		// o_busy is tied low when streaming
+		always @(posedge i_clk) begin
+			if((f_past_valid)&&(!$past(i_rst))) begin
+				cover(o_busy);
+			end
 		end
-	end  
+	end else begin : f_cover_stream
+		// A saturated sum still comes out, with o_done
+		always @(posedge i_clk) begin
+			if((f_past_valid)&&(!$past(i_rst))) begin
+				cover((o_done)&&(o_overflow));
+			end
+		end
+	end endgenerate
 	always @(posedge i_clk) begin
 		if((f_past_valid)&&(!$past(i_rst))) begin
 			cover(o_overflow);
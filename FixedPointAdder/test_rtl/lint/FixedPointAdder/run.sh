@@ -2,7 +2,7 @@
 
 # oss-cad-suite env
 echo "        [VERILATOR] Sourcing OSS CAD Suite environment..."
-source ~/oss-cad-suite/environment
+[ -n "$OSS_CAD_SUITE" ] || source ~/oss-cad-suite/environment
 if [ $? -ne 0 ]; then
     echo "        [VERILATOR] Failed to source OSS CAD Suite environment. Exiting script."
     exit 1
@@ -15,4 +15,10 @@ if [ $? -ne 0 ]; then
     echo "        [VERILATOR] FAIL: Verilator linter failed. Exiting script."
     exit 1
 fi
+echo "        [VERILATOR] Running linter (STREAM=1)..."
+verilator --lint-only --Wall --cc -GSTREAM=1 -I${PWD}/../../../rtl/ ${PWD}/../../../rtl/FixedPointAdder.v
+if [ $? -ne 0 ]; then
+    echo "        [VERILATOR] FAIL: Verilator linter failed. Exiting script."
+    exit 1
+fi
 echo "        [VERILATOR] PASS: Verilator linter passed!"
@@ -1,8 +1,111 @@
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
 import cocotb
-from cocotb.triggers import Timer
+from cocotb.triggers import FallingEdge
+
+# FixedPointAdder/python holds the vectorized model
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / "python"))
+from design import add, hold
+
+# The cocotb directory holds what both FixedPointAdder benches share
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from adder import check, operands, reset
+
+# The repository root holds the shared test tools
+sys.path.insert(0, str(Path(__file__).resolve().parents[5]))
+from tools.latency import LatencyMonitor
+
+# Must match the parameters the runner builds with
+WIDTH = int(os.getenv("ADD_WIDTH", "8"))
+FBITS = int(os.getenv("ADD_FBITS", "4"))
+# Operand pairs: "all" of them (the default up to WIDTH=10), or a number of random ones
+PAIRS = os.getenv("ADD_PAIRS", "all" if WIDTH <= 10 else "100000")
+SEED = int(os.getenv("ADD_SEED", "1"))
+# JSON file to add the latency histograms to
+LATENCY_REPORT = os.getenv("LATENCY_REPORT")
+
+async def issue(dut, a, b, start):
+    """
+    Drives one addition (or none, where start is 0) per clock, back to back
+    in one simulation, and reads every output the clock after.
+    Returns o_val, o_overflow, o_valid, o_done and o_busy for each clock.
+    """
+    results = np.zeros((len(a), 5), dtype=np.int64)
+    # Inputs change on the falling edge, outputs are read on the next one
+    await FallingEdge(dut.i_clk)
+    for k, (x, y, s) in enumerate(zip(a.tolist(), b.tolist(), start.tolist())):
+        dut.i_operandA.value = x
+        dut.i_operandB.value = y
+        dut.i_start.value = s
+        await FallingEdge(dut.i_clk)
+        results[k] = (dut.o_val.value.signed_integer, int(dut.o_overflow.value), int(dut.o_valid.value),
+                      int(dut.o_done.value), int(dut.o_busy.value))
+    dut.i_start.value = 0
+    return results
 
 @cocotb.test()
-async def test_FixedPointAdder(dut):
-    """Empty testbench that simply prints PASS."""
-    await Timer(1, units="ns")  # Wait for a small amount of time
-    dut._log.info("PASS")
\ No newline at end of file
+async def test_add_all_pairs(dut):
+    """Every operand pair (or random ones), one per clock with i_start held high, checked against the model in bulk"""
+    await reset(dut)
+
+    a, b = operands(WIDTH, PAIRS, SEED)
+    results = await issue(dut, a, b, np.ones(len(a), dtype=np.int64))
+
+    o_val, o_overflow, o_valid = add(a, b, WIDTH)
+    assert results[:, 3].all(), f"o_done low the clock after i_start for {int((results[:, 3] == 0).sum())} pairs"
+    assert results[:, 4].all(), "o_busy low with i_start high"
+    bad = check(dut, a, b, results, (o_val, o_overflow, o_valid), FBITS)
+    dut._log.info(f"WIDTH={WIDTH} FBITS={FBITS}: {len(a)} pairs in {len(a)} clocks, "
+                  f"{int(o_overflow.sum())} saturated, {bad} mismatches")
+    assert bad == 0, "dut doesn't match the model"
+
+@cocotb.test()
+async def test_add_idle_clocks(dut):
+    """Random i_start pulses: o_done, o_overflow and o_valid only follow a start, o_val holds in between"""
+    await reset(dut)
+
+    rng = np.random.default_rng(SEED)
+    n = 4096
+    low, high = -(1 << (WIDTH - 1)), 1 << (WIDTH - 1)
+    a = rng.integers(low, high, n, dtype=np.int64)
+    b = rng.integers(low, high, n, dtype=np.int64)
+    start = rng.integers(0, 2, n, dtype=np.int64)
+    results = await issue(dut, a, b, start)
+
+    o_val, o_overflow, o_valid = add(a, b, WIDTH)
+    started = start == 1
+    # o_val keeps the last result (0 after reset) on clocks without a start
+    o_val = hold(o_val, started)
+    o_overflow = started & o_overflow
+    o_valid = started & o_valid
+    assert np.array_equal(results[:, 3], start), "o_done doesn't follow i_start by one clock"
+    assert np.array_equal(results[:, 4], start | o_overflow), "o_busy isn't i_start or a saturated result"
+    bad = check(dut, a, b, results, (o_val, o_overflow, o_valid), FBITS)
+    dut._log.info(f"WIDTH={WIDTH} FBITS={FBITS}: {int(started.sum())} starts in {n} clocks, {bad} mismatches")
+    assert bad == 0, "dut doesn't match the model"
+
+@cocotb.test()
+async def test_add_latency_histogram(dut):
+    """Random i_start pulses timed on the ports: saturated or not, every addition takes one clock"""
+    await reset(dut)
+
+    rng = np.random.default_rng(SEED)
+    n = 4096
+    low, high = -(1 << (WIDTH - 1)), 1 << (WIDTH - 1)
+    a = rng.integers(low, high, n, dtype=np.int64)
+    b = rng.integers(low, high, n, dtype=np.int64)
+    start = rng.integers(0, 2, n, dtype=np.int64)
+    monitor = LatencyMonitor(dut.i_clk, dut.i_start, dut.o_done, f"FixedPointAdder WIDTH={WIDTH} FBITS={FBITS}",
+                             sample_done=lambda: int(dut.o_overflow.value),
+                             classify=lambda _, overflow: "overflow" if overflow else "result").start()
+    await issue(dut, a, b, start)
+    monitor.stop()
+    dut._log.info(monitor.summary())
+    if LATENCY_REPORT:
+        monitor.write_json(LATENCY_REPORT)
+
+    assert monitor.latencies == [1] * int(start.sum()), "an addition took more than one clock"
@@ -0,0 +1,128 @@
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+import cocotb
+from cocotb.triggers import FallingEdge
+from cocotb.utils import get_sim_time
+
+# FixedPointAdder/python holds the vectorized model
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / "python"))
+from design import stream
+
+# The cocotb directory holds what both FixedPointAdder benches share
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from adder import check, operands, reset
+
+# The repository root holds the shared test tools
+sys.path.insert(0, str(Path(__file__).resolve().parents[5]))
+from tools.latency import LatencyMonitor
+
+# Must match the parameters the runner builds with (and STREAM=1)
+WIDTH = int(os.getenv("ADD_WIDTH", "8"))
+FBITS = int(os.getenv("ADD_FBITS", "4"))
+# Operand pairs: "all" of them (the default up to WIDTH=10), or a number of random ones
+PAIRS = os.getenv("ADD_PAIRS", "all" if WIDTH <= 10 else "100000")
+# Probability of an idle clock between samples in the bubbles test
+BUBBLES = float(os.getenv("ADD_BUBBLES", "0.25"))
+SEED = int(os.getenv("ADD_SEED", "1"))
+# JSON file to add the latency histograms to
+LATENCY_REPORT = os.getenv("LATENCY_REPORT")
+
+async def drive(dut, a, b, valid):
+    """
+    Drives one clock of operands and i_valid per entry and reads every
+    output the clock after.
+    Returns o_val, o_overflow, o_valid, o_done and o_busy for each clock.
+    """
+    results = np.zeros((len(a), 5), dtype=np.int64)
+    # Inputs change on the falling edge, outputs are read on the next one
+    await FallingEdge(dut.i_clk)
+    for k, (x, y, v) in enumerate(zip(a.tolist(), b.tolist(), valid.tolist())):
+        dut.i_operandA.value = x
+        dut.i_operandB.value = y
+        dut.i_valid.value = v
+        await FallingEdge(dut.i_clk)
+        results[k] = (dut.o_val.value.signed_integer, int(dut.o_overflow.value), int(dut.o_valid.value),
+                      int(dut.o_done.value), int(dut.o_busy.value))
+    dut.i_valid.value = 0
+    return results
+
+def check_stream(dut, a, b, valid, results, expected):
+    assert np.array_equal(results[:, 3], valid), "o_done doesn't follow i_valid by one clock"
+    assert not results[:, 4].any(), "o_busy high in streaming mode"
+    return check(dut, a, b, results, expected, FBITS)
+
+@cocotb.test()
+async def test_stream_full_rate(dut):
+    """Every operand pair (or random ones) at one sample per clock: a result every clock, one clock later"""
+    await reset(dut)
+
+    a, b = operands(WIDTH, PAIRS, SEED)
+    valid = np.ones(len(a), dtype=np.int64)
+    start = get_sim_time(units="ns")
+    results = await drive(dut, a, b, valid)
+    clocks = int(get_sim_time(units="ns") - start)
+
+    # one clock lines the testbench up with the falling edge
+    results_per_clock = int(results[:, 3].sum()) / (clocks - 1)
+    bad = check_stream(dut, a, b, valid, results, stream(a, b, valid, WIDTH))
+    dut._log.info(f"WIDTH={WIDTH} FBITS={FBITS}: {len(a)} samples, {int(results[:, 3].sum())} results "
+                  f"in {clocks - 1} clocks ({results_per_clock:.2f} per clock), {bad} mismatches")
+    assert results_per_clock == 1, "streaming mode doesn't sustain one addition per clock"
+    assert bad == 0, "dut doesn't match the model"
+
+@cocotb.test()
+async def test_stream_bubbles(dut):
+    """Random idle clocks between samples: o_done follows i_valid by one clock, o_val holds in between"""
+    await reset(dut)
+
+    rng = np.random.default_rng(SEED)
+    n = 4096
+    low, high = -(1 << (WIDTH - 1)), 1 << (WIDTH - 1)
+    # Geometric idle clocks between samples, so each clock is idle with
+    # probability BUBBLES
+    idle = rng.geometric(1 - BUBBLES, n) - 1
+    starts = np.cumsum(idle + 1) - 1
+    valid = np.zeros(starts[-1] + 1, dtype=np.int64)
+    valid[starts] = 1
+    a = rng.integers(low, high, len(valid), dtype=np.int64)
+    b = rng.integers(low, high, len(valid), dtype=np.int64)
+    results = await drive(dut, a, b, valid)
+
+    bad = check_stream(dut, a, b, valid, results, stream(a, b, valid, WIDTH))
+    dut._log.info(f"WIDTH={WIDTH} FBITS={FBITS}: {n} samples in {len(valid)} clocks, {bad} mismatches")
+    assert bad == 0, "dut doesn't match the model"
+
+@cocotb.test()
+async def test_stream_latency_histogram(dut):
+    """Full rate then random bubbles, timed on the ports: one clock latency and i_valid's rate out of o_done"""
+    await reset(dut)
+
+    rng = np.random.default_rng(SEED)
+    n = 4096
+    low, high = -(1 << (WIDTH - 1)), 1 << (WIDTH - 1)
+    idle = rng.geometric(1 - BUBBLES, n) - 1
+    starts = np.cumsum(idle + 1) - 1
+    bubbles = np.zeros(starts[-1] + 1, dtype=np.int64)
+    bubbles[starts] = 1
+    for name, valid in (("full rate", np.ones(n, dtype=np.int64)), (f"bubbles {BUBBLES}", bubbles)):
+        a = rng.integers(low, high, len(valid), dtype=np.int64)
+        b = rng.integers(low, high, len(valid), dtype=np.int64)
+        monitor = LatencyMonitor(dut.i_clk, dut.i_valid, dut.o_done,
+                                 f"FixedPointAdder STREAM=1 WIDTH={WIDTH} FBITS={FBITS} {name}",
+                                 sample_done=lambda: int(dut.o_overflow.value),
+                                 classify=lambda _, overflow: "overflow" if overflow else "result").start()
+        await drive(dut, a, b, valid)
+        monitor.stop()
+        dut._log.info(monitor.summary())
+        if LATENCY_REPORT:
+            monitor.write_json(LATENCY_REPORT)
+
+        report = monitor.report()
+        assert monitor.latencies == [1] * int(valid.sum()), f"{name}: a sample took more than one clock"
+        # From the first sample to the last result
+        rate = valid.sum() / (len(valid) - np.argmax(valid))
+        assert report["throughput"]["ops_per_clock"] == rate, f"{name}: o_done doesn't keep up with i_valid"
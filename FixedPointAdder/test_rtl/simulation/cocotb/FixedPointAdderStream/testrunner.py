@@ -0,0 +1,15 @@
+import sys
+from pathlib import Path
+
+# The repository root holds the shared test tools
+sys.path.insert(0, str(Path(__file__).resolve().parents[5]))
+from tools.runner import Bench, main
+
+# Every operand pair of the default build, random ones of a wide build,
+# both in streaming mode
+BENCH = Bench(__file__, "FixedPointAdder",
+              builds=[{"WIDTH": 8, "FBITS": 4, "STREAM": 1}, {"WIDTH": 16, "FBITS": 8, "STREAM": 1}],
+              env_prefix="ADD_")
+
+if __name__ == "__main__":
+    sys.exit(main(BENCH))
@@ -0,0 +1,54 @@
+"""
+What the FixedPointAdder and FixedPointAdderStream testbenches share:
+the operand pairs, the reset and the bulk check against the model.
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import FallingEdge
+
+# FixedPointAdder/python holds the vectorized model
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "python"))
+from design import all_pairs, to_real
+
+def operands(width, pairs, seed):
+    """Every operand pair if 'pairs' is "all", else that many random ones after the corners."""
+    if pairs == "all":
+        return all_pairs(width)
+    rng = np.random.default_rng(seed)
+    low, high = -(1 << (width - 1)), 1 << (width - 1)
+    a = rng.integers(low, high, int(pairs), dtype=np.int64)
+    b = rng.integers(low, high, int(pairs), dtype=np.int64)
+    # and the corners, where the sum saturates
+    corners = np.array([low, low + 1, -1, 0, 1, high - 1], dtype=np.int64)
+    ca, cb = np.meshgrid(corners, corners, indexing="ij")
+    return np.concatenate([ca.ravel(), a]), np.concatenate([cb.ravel(), b])
+
+async def reset(dut):
+    cocotb.start_soon(Clock(dut.i_clk, 1, units="ns").start())
+    dut.i_start.value = 0
+    dut.i_valid.value = 0
+    dut.i_operandA.value = 0
+    dut.i_operandB.value = 0
+    dut.i_rst.value = 1
+    await FallingEdge(dut.i_clk)
+    await FallingEdge(dut.i_clk)
+    dut.i_rst.value = 0
+
+def check(dut, a, b, results, expected, fbits):
+    """
+    Compares o_val, o_overflow and o_valid (the first three columns of
+    'results', one row per clock) with the model's, logging the first
+    mismatches; returns how many clocks mismatch.
+    """
+    o_val, o_overflow, o_valid = expected
+    bad = (results[:, 0] != o_val) | (results[:, 1] != o_overflow) | (results[:, 2] != o_valid)
+    for k in np.flatnonzero(bad)[:8]:
+        dut._log.error(f"clock {k}, {to_real(a[k], fbits)} + {to_real(b[k], fbits)}: "
+                       f"dut {to_real(results[k, 0], fbits)} ovf {results[k, 1]} valid {results[k, 2]}, "
+                       f"model {to_real(o_val[k], fbits)} ovf {int(o_overflow[k])} valid {int(o_valid[k])}")
+    return int(bad.sum())
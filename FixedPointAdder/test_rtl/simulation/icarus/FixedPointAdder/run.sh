@@ -8,7 +8,7 @@ WAVEFORM="dump.vcd"
 
 # oss-cad-suite env
 echo "        [ICARUS] Sourcing OSS CAD Suite environment..."
-source ~/oss-cad-suite/environment
+[ -n "$OSS_CAD_SUITE" ] || source ~/oss-cad-suite/environment
 if [ $? -ne 0 ]; then
     echo "        [ICARUS] Failed to source OSS CAD Suite environment. Exiting script."
     exit 1
@@ -1,2 +1,2 @@
 #!/bin/bash
-clear; ./test_all.sh | tee >(cat > test_log.txt)
\ No newline at end of file
+clear; ./test_all.sh "$@" | tee >(cat > test_log.txt); exit ${PIPESTATUS[0]}
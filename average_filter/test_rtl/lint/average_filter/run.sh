@@ -1,7 +1,7 @@
 # !/bin/bash
 
 # oss-cad-suite env
-source ~/oss-cad-suite/environment
+[ -n "$OSS_CAD_SUITE" ] || source ~/oss-cad-suite/environment
 
 # Run verilator as linter
 verilator --lint-only --Wall --cc ${PWD}/../../../rtl/average_filter.v
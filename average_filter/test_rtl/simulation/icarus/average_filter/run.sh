@@ -7,7 +7,7 @@ OUTPUT="testbench"
 WAVEFORM="dump.vcd"
 
 # oss-cad-suite env
-source ~/oss-cad-suite/environment
+[ -n "$OSS_CAD_SUITE" ] || source ~/oss-cad-suite/environment
 
 # Check if the RTL module exists
 if [ ! -f "$RTL_MODULE" ]; then
@@ -1,5 +1,4 @@
 import numpy as np
-import matplotlib.pyplot as plt
 
 def boxcar_average_filter(data, num_samples, data_width):
     """
@@ -29,6 +28,34 @@ def boxcar_average_filter(data, num_samples, data_width):
 
     return filtered_data
 
+def boxcar(data, num_samples, data_width=8):
+    """
+    Bit-exact model of boxcar_filter.v, for samples taken on consecutive
+    i_ce clocks after a reset (gaps in i_ce are fine once o_ce is high).
+
+    The accumulator holds the sum of the last num_samples samples (of all
+    of them while it fills), and o_data is that sum shifted right
+    arithmetically by INDEX_WIDTH = $clog2(NUM_SAMPLES) bits: the average
+    when num_samples is a power of two. o_ce rises with the
+    num_samples-th sample.
+
+    Args:
+        data: i_data, raw two's complement DATA_WIDTH bit samples
+            (negative, or their unsigned encodings).
+        num_samples: NUM_SAMPLES.
+        data_width: DATA_WIDTH.
+
+    Returns:
+        A tuple (o_data, o_ce) of arrays, entry k read after the clock
+        that takes data[k].
+    """
+    half = 1 << (data_width - 1)
+    data = ((np.asarray(data, dtype=np.int64) + half) & ((half << 1) - 1)) - half
+    sums = np.cumsum(data)
+    sums[num_samples:] = sums[num_samples:] - sums[:-num_samples]
+    index_width = (num_samples - 1).bit_length()
+    return sums >> index_width, np.arange(len(data)) >= num_samples - 1
+
 def generate_test_data(num_data_points, noise_level=0.5):
     """
     Generates test data with added noise.
@@ -45,6 +72,8 @@ def generate_test_data(num_data_points, noise_level=0.5):
     return signal + noise
 
 def main():
+    import matplotlib.pyplot as plt
+
     try:
         num_data_points = int(input("Enter the number of data points: "))
         num_samples = int(input("Enter the NUM_SAMPLES (number of samples to average): "))
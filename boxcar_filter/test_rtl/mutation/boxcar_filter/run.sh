@@ -2,7 +2,7 @@
 
     # Source the OSS CAD Suite environment
     echo "        [MCY] Sourcing OSS CAD Suite environment..."
-    source ~/oss-cad-suite/environment
+    [ -n "$OSS_CAD_SUITE" ] || source ~/oss-cad-suite/environment
     if [ $? -ne 0 ]; then
         echo "        [MCY] FAIL: Failed to source OSS CAD Suite environment. Exiting script."
         exit 1
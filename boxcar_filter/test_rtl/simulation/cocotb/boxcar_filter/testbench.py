@@ -1,8 +1,68 @@
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
 import cocotb
-from cocotb.triggers import Timer
+from cocotb.clock import Clock
+from cocotb.triggers import FallingEdge, RisingEdge
+
+# boxcar_filter/python holds the model
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / "python"))
+from design import boxcar
+
+# Must match the parameters the runner builds with
+DATA_WIDTH = int(os.getenv("BOXCAR_DATA_WIDTH", "8"))
+NUM_SAMPLES = int(os.getenv("BOXCAR_NUM_SAMPLES", "2"))
+SAMPLES = int(os.getenv("BOXCAR_SAMPLES", "10000"))  # random samples, around the full scale runs
+BUBBLES = float(os.getenv("BOXCAR_BUBBLES", "0.2"))  # chance of an idle clock, below 1
+SEED = int(os.getenv("BOXCAR_SEED", "1"))
+
+async def reset_dut(dut):
+    dut.i_ce.value = 0
+    dut.i_data.value = 0
+    dut.i_reset_n.value = 0
+    await RisingEdge(dut.i_clk)
+    await RisingEdge(dut.i_clk)
+    dut.i_reset_n.value = 1
 
 @cocotb.test()
 async def test_boxcar_filter(dut):
-    """Empty testbench that simply prints PASS."""
-    await Timer(1, units="ns")  # Wait for a small amount of time
-    dut._log.info("PASS")
\ No newline at end of file
+    """Random and full scale samples, with idle clocks once the window is full, against the model"""
+    cocotb.start_soon(Clock(dut.i_clk, 1, units="ns").start())
+    await reset_dut(dut)
+
+    rng = np.random.default_rng(SEED)
+    low, high = -(1 << (DATA_WIDTH - 1)), 1 << (DATA_WIDTH - 1)
+    random = rng.integers(low, high, SAMPLES)
+    data = np.concatenate([random[:SAMPLES // 2], np.full(2 * NUM_SAMPLES, high - 1), np.full(2 * NUM_SAMPLES, low),
+                           random[SAMPLES // 2:]])
+    # The window fills on consecutive clocks, then each sample follows a
+    # geometric number of idle clocks
+    idle = rng.geometric(1 - BUBBLES, len(data)) - 1
+    idle[:NUM_SAMPLES] = 0
+    o_data = np.zeros(len(data), dtype=np.int64)
+    o_ce = np.zeros(len(data), dtype=bool)
+
+    # Inputs change on the falling edge, outputs are read on the next one
+    await FallingEdge(dut.i_clk)
+    for k, (sample, idle_k) in enumerate(zip(data.tolist(), idle.tolist())):
+        dut.i_ce.value = 0
+        for _ in range(idle_k):
+            await FallingEdge(dut.i_clk)
+        dut.i_ce.value = 1
+        dut.i_data.value = sample & ((1 << DATA_WIDTH) - 1)
+        await FallingEdge(dut.i_clk)
+        o_data[k] = dut.o_data.value.signed_integer
+        o_ce[k] = bool(dut.o_ce.value)
+    dut.i_ce.value = 0
+
+    model_data, model_ce = boxcar(data, NUM_SAMPLES, DATA_WIDTH)
+    assert np.array_equal(o_ce, model_ce), f"o_ce doesn't rise with sample {NUM_SAMPLES}"
+    bad = model_ce & (o_data != model_data)
+    for k in np.flatnonzero(bad)[:8]:
+        dut._log.error(f"sample {k} ({data[k]}): dut o_data {o_data[k]}, model {model_data[k]}")
+    dut._log.info(f"DATA_WIDTH={DATA_WIDTH} NUM_SAMPLES={NUM_SAMPLES}: {len(data)} samples, "
+                  f"{int(bad.sum())} mismatches")
+    assert not bad.any(), "dut doesn't match the model"
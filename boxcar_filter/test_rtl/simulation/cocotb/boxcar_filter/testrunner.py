@@ -0,0 +1,15 @@
+import sys
+from pathlib import Path
+
+# The repository root holds the shared test tools
+sys.path.insert(0, str(Path(__file__).resolve().parents[5]))
+from tools.runner import Bench, main
+
+# Power of two windows average; NUM_SAMPLES=3 shifts its sum by 2 bits
+BENCH = Bench(__file__, "boxcar_filter",
+              builds=[{"DATA_WIDTH": 8, "NUM_SAMPLES": 2}, {"DATA_WIDTH": 8, "NUM_SAMPLES": 3},
+                      {"DATA_WIDTH": 12, "NUM_SAMPLES": 8}, {"DATA_WIDTH": 16, "NUM_SAMPLES": 16}],
+              env_prefix="BOXCAR_")
+
+if __name__ == "__main__":
+    sys.exit(main(BENCH))
@@ -0,0 +1,30 @@
+import numpy as np
+
+LGDLY = 4  # delayw.v's defaults
+DW = 12
+
+
+def delayw(words, delay, dw=DW):
+    """
+    Model of delayw.v with i_delay (or FIXED_DELAY) held at 'delay', for
+    words taken on i_ce clocks; clocks without i_ce hold the outputs.
+
+    Read after the i_ce clock that takes words[k], o_word is words[k] and
+    o_delayed is words[k - delay] (words[k] itself for a delay of 0). The
+    first 'delay' o_delayed values come from before the words, so they're
+    not modelled.
+
+    Args:
+        words: i_word, one per i_ce clock.
+        delay: The delay in i_ce clocks, 0 to 2**LGDLY - 1.
+        dw: DW; the words are truncated to it.
+
+    Returns:
+        A tuple (o_word, o_delayed, known) of arrays; o_delayed only holds
+        where 'known'.
+    """
+    words = np.asarray(words, dtype=np.int64) & ((1 << dw) - 1)
+    known = np.arange(len(words)) >= delay
+    o_delayed = np.zeros_like(words)
+    o_delayed[known] = words[:len(words) - delay]
+    return words, o_delayed, known
@@ -2,18 +2,15 @@
 
 # Source the OSS CAD Suite environment
 echo "          [COCOTB] Sourcing OSS CAD Suite environment..."
-source ~/oss-cad-suite/environment
+[ -n "$OSS_CAD_SUITE" ] || source ~/oss-cad-suite/environment
 if [ $? -ne 0 ]; then
     echo "          [COCOTB] FAIL: Failed to source OSS CAD Suite environment. Exiting script."
     exit 1
 fi
 
-# Copy original delayw.v
-cp ${PWD}/../../../../rtl/delayw.v .
-
 # Call cocoTB
 echo "        [COCOTB][ICARUS] Running testbench..."
-python3 testrunner_icarus.py
+python3 testrunner.py --sim icarus
 if [ $? -ne 0 ]; then
     echo "          [COCOTB][ICARUS] FAIL: Simulation failed. Exiting script."
     exit 1
@@ -21,12 +18,9 @@ fi
 echo "        [COCOTB][ICARUS] PASS: CocoTB simulation passed!"
 
 echo "        [COCOTB][VERILATOR] Running testbench..."
-python3 testrunner_verilator.py
+python3 testrunner.py --sim verilator
 if [ $? -ne 0 ]; then
     echo "          [COCOTB][VERILATOR] FAIL: Simulation failed. Exiting script."
     exit 1
 fi
 echo "        [COCOTB][VERILATOR] PASS: CocoTB simulation passed!"
-
-# Remove delayw.-v
-rm delayw.v
\ No newline at end of file
@@ -1,8 +1,72 @@
-import cocotb
-from cocotb.triggers import Timer
-
-@cocotb.test()
-async def test_template(dut):
-    """Empty testbench that simply prints PASS."""
-    await Timer(1, units="ns")  # Wait for a small amount of time
-    dut._log.info("PASS")
\ No newline at end of file
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import FallingEdge, RisingEdge
+
+# delayw/python holds the model
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / "python"))
+from design import delayw
+
+# Must match the parameters the runner builds with
+LGDLY = int(os.getenv("DELAYW_LGDLY", "4"))
+DW = int(os.getenv("DELAYW_DW", "12"))
+WORDS = int(os.getenv("DELAYW_WORDS", "256"))  # words per delay, after the first 'delay'
+BUBBLES = float(os.getenv("DELAYW_BUBBLES", "0.2"))  # chance of an idle clock, below 1
+SEED = int(os.getenv("DELAYW_SEED", "1"))
+
+def delays():
+    """Every delay, or the shortest, the longest and a few random ones for a deep memory."""
+    top = (1 << LGDLY) - 1
+    if top < 64:
+        return list(range(top + 1))
+    rng = np.random.default_rng(SEED)
+    return sorted({0, 1, 2, 3, top - 1, top, *rng.integers(4, top - 1, 8).tolist()})
+
+@cocotb.test()
+async def test_delays(dut):
+    """Random words, with idle clocks, through each delay in turn, against the model"""
+    cocotb.start_soon(Clock(dut.i_clk, 1, units="ns").start())
+    dut.i_ce.value = 0
+    dut.i_word.value = 0
+    dut.i_delay.value = 0
+    dut.i_reset.value = 1
+    await RisingEdge(dut.i_clk)
+    dut.i_reset.value = 0
+
+    rng = np.random.default_rng(SEED)
+    bad_delays = []
+    # Inputs change on the falling edge, outputs are read on the next one
+    await FallingEdge(dut.i_clk)
+    for delay in delays():
+        words = rng.integers(0, 1 << DW, WORDS + delay)
+        idle = rng.geometric(1 - BUBBLES, len(words)) - 1
+        o_word = np.zeros(len(words), dtype=np.int64)
+        o_delayed = np.zeros(len(words), dtype=np.int64)
+        dut.i_delay.value = delay
+        for k, (word, idle_k) in enumerate(zip(words.tolist(), idle.tolist())):
+            dut.i_ce.value = 0
+            for _ in range(idle_k):
+                await FallingEdge(dut.i_clk)
+            dut.i_ce.value = 1
+            dut.i_word.value = word
+            await FallingEdge(dut.i_clk)
+            o_word[k] = dut.o_word.value.integer
+            # Before 'delay' words have gone in, o_delayed is older words (or unknown)
+            o_delayed[k] = dut.o_delayed.value.integer if k >= delay else 0
+        dut.i_ce.value = 0
+
+        model_word, model_delayed, known = delayw(words, delay, DW)
+        bad = (o_word != model_word) | (known & (o_delayed != model_delayed))
+        for k in np.flatnonzero(bad)[:4]:
+            dut._log.error(f"delay {delay}, word {k}: dut o_word {o_word[k]:#x} o_delayed {o_delayed[k]:#x}, "
+                           f"model o_word {model_word[k]:#x} o_delayed {model_delayed[k]:#x}")
+        if bad.any():
+            bad_delays.append(delay)
+
+    dut._log.info(f"LGDLY={LGDLY} DW={DW}: {len(delays())} delays, {len(bad_delays)} with mismatches")
+    assert not bad_delays, f"dut doesn't match the model for delays {bad_delays}"
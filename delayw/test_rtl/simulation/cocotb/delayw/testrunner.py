@@ -0,0 +1,14 @@
+import sys
+from pathlib import Path
+
+# The repository root holds the shared test tools
+sys.path.insert(0, str(Path(__file__).resolve().parents[5]))
+from tools.runner import Bench, main
+
+# Every delay of the shallower memories, a few of the deepest
+BENCH = Bench(__file__, "delayw",
+              builds=[{"LGDLY": 4, "DW": 12}, {"LGDLY": 2, "DW": 8}, {"LGDLY": 6, "DW": 16}, {"LGDLY": 8, "DW": 24}],
+              env_prefix="DELAYW_")
+
+if __name__ == "__main__":
+    sys.exit(main(BENCH))
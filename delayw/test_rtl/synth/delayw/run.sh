@@ -6,7 +6,7 @@ RTL_MODULE="delayw.v"
 
 # Source the OSS CAD Suite environment
 echo "        [YOSYS] Sourcing OSS CAD Suite environment..."
-source ~/oss-cad-suite/environment
+[ -n "$OSS_CAD_SUITE" ] || source ~/oss-cad-suite/environment
 if [ $? -ne 0 ]; then
     echo "        [YOSYS] Failed to source OSS CAD Suite environment. Exiting script."
     exit 1
@@ -0,0 +1,14 @@
+"""
+Vectorized Q(m,n) fixed-point arithmetic for the blocks' Python models.
+
+Values are raw two's complement integers (the bits the RTL holds) in numpy
+arrays, with the binary point and word width passed to each operation, so
+a model is written the way the RTL computes: exact intermediates, then a
+rounding and an overflow rule. int64 arrays carry words up to 62 bits;
+wider intermediates fall back to object arrays of Python integers.
+"""
+from .qformat import (INT64_BITS, OVERFLOW, ROUNDING, add, as_raw, div, fits, hold, limits, mul, saturate, shift,
+                      sqrt, to_fixed, to_real, wrap)
+
+__all__ = ["INT64_BITS", "OVERFLOW", "ROUNDING", "add", "as_raw", "div", "fits", "hold", "limits", "mul", "saturate",
+           "shift", "sqrt", "to_fixed", "to_real", "wrap"]
@@ -0,0 +1,77 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Run as a script or with -m from the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import fixedpoint as fx
+
+
+def operations(width, fbits):
+    """The benchmarked operations, as name and a function of operands a, b."""
+    return {
+        "add (saturate)": lambda a, b: fx.add(a, b, width),
+        "add (wrap)": lambda a, b: fx.add(a, b, width, overflow="wrap"),
+        "mul (floor, saturate)": lambda a, b: fx.mul(a, b, fbits, width),
+        "mul (half_even, saturate)": lambda a, b: fx.mul(a, b, fbits, width, rounding="half_even"),
+        "div (zero, saturate)": lambda a, b: fx.div(a, b, fbits, width),
+        "div (half_even, saturate)": lambda a, b: fx.div(a, b, fbits, width, rounding="half_even"),
+        "sqrt (floor)": lambda a, b: fx.sqrt(abs(a), fbits, width),
+        "shift (half_even)": lambda a, b: fx.shift(a, fbits, "half_even"),
+        "saturate": lambda a, b: fx.saturate(a * 4, width),
+        "wrap": lambda a, b: fx.wrap(a * 4, width),
+    }
+
+
+def benchmark(width, fbits, n, repeat, seed=1):
+    """
+    Operations per second of each operation on n random 'width' bit operand
+    pairs, the best of 'repeat' runs, as rows of name and rate. Products and
+    quotients wider than INT64_BITS run on object arrays, a lot slower.
+    """
+    rng = np.random.default_rng(seed)
+    low, high = fx.limits(width)
+    a = rng.integers(low, high, n, endpoint=True, dtype=np.int64)
+    b = rng.integers(low, high, n, endpoint=True, dtype=np.int64)
+    rows = []
+    for name, op in operations(width, fbits).items():
+        best = min(_time(op, a, b) for _ in range(repeat))
+        rows.append({"name": name, "ops_per_s": n / best})
+    return rows
+
+
+def _time(op, a, b):
+    start = time.perf_counter()
+    op(a, b)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Throughput of the fixedpoint operations on random operands')
+    parser.add_argument('--width', type=int, default=16, help='word width (default 16)')
+    parser.add_argument('--fbits', type=int, default=8, help='fractional bits (default 8)')
+    parser.add_argument('-n', type=int, default=1_000_000, help='operands per run (default 1000000)')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per operation, the best counts (default 5)')
+    parser.add_argument('--min-rate', type=float, default=0,
+                        help='exit with an error if an operation runs slower (ops/s, e.g. 1e7)')
+    parser.add_argument('--json', action='store_true', help='print the figures as JSON')
+    args = parser.parse_args()
+
+    rows = benchmark(args.width, args.fbits, args.n, args.repeat)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print(f"WIDTH={args.width} FBITS={args.fbits}: {args.n} operands, best of {args.repeat}")
+        for row in rows:
+            print(f"{row['name']:28s} {row['ops_per_s'] / 1e6:9.1f} Mops/s")
+    slow = [row['name'] for row in rows if row['ops_per_s'] < args.min_rate]
+    if slow:
+        sys.exit(f"slower than {args.min_rate:.3g} ops/s: {', '.join(slow)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+from math import isqrt
+
+import numpy as np
+
+ROUNDING = ("floor", "zero", "half_even")
+OVERFLOW = ("saturate", "wrap", None)
+
+# Largest intermediate, in bits plus sign, that int64 arrays hold; wider
+# ones fall back to object arrays of Python integers
+INT64_BITS = 62
+
+
+def _bits(x):
+    """Bits needed for the magnitudes in integer array x (0 if empty)."""
+    if x.size == 0:
+        return 0
+    return max(int(x.max()), -int(x.min())).bit_length()
+
+
+def as_raw(x, bits=0):
+    """
+    Raw fixed-point integers as an int64 array, or an object array of Python
+    integers if they (grown by 'bits' more bits) wouldn't fit in int64.
+    """
+    x = np.asarray(x)
+    if x.dtype == object:
+        return x
+    if x.dtype.kind not in "iub":
+        raise TypeError(f"raw fixed-point values must be integers, not {x.dtype}")
+    if x.dtype.kind == "u" and x.dtype.itemsize == 8:
+        return x.astype(object)
+    x = x.astype(np.int64)
+    if _bits(x) + bits > INT64_BITS:
+        return x.astype(object)
+    return x
+
+
+def limits(width, signed=True):
+    """The smallest and largest raw values of a 'width' bit word."""
+    if signed:
+        return -(1 << (width - 1)), (1 << (width - 1)) - 1
+    return 0, (1 << width) - 1
+
+
+def _limits(x, width, signed):
+    """limits(), narrowed to what x's dtype holds (the rest can't occur)."""
+    low, high = limits(width, signed)
+    if x.dtype == object:
+        # kept as Python integers, however numpy unwraps 0-d results
+        return np.array(low, dtype=object), np.array(high, dtype=object)
+    info = np.iinfo(x.dtype)
+    return max(low, int(info.min)), min(high, int(info.max))
+
+
+def to_fixed(x, fbits, rounding="zero"):
+    """
+    Reals to raw fixed-point integers with 'fbits' fractional bits. The
+    default truncates towards zero like int(x * 2**fbits).
+    """
+    x = np.asarray(x, dtype=np.float64) * 2.0**fbits
+    if rounding == "zero":
+        x = np.trunc(x)
+    elif rounding == "floor":
+        x = np.floor(x)
+    elif rounding == "half_even":
+        x = np.rint(x)
+    else:
+        raise ValueError(f"rounding must be one of {ROUNDING}, not {rounding!r}")
+    return x.astype(np.int64)
+
+
+def to_real(raw, fbits):
+    """Raw fixed-point integers to reals."""
+    return np.asarray(raw, dtype=np.float64) / 2.0**fbits
+
+
+def hold(values, update, initial=0):
+    """
+    A register written with values[k] wherever update[k], as read after
+    each write in turn: every entry without an update repeats the last
+    written value, 'initial' before the first.
+    """
+    values = np.asarray(values).ravel()
+    update = np.asarray(update, dtype=bool).ravel()
+    last = np.maximum.accumulate(np.where(update, np.arange(len(update)), -1))
+    return np.where(last >= 0, values[np.maximum(last, 0)], initial)
+
+
+def fits(x, width, signed=True):
+    """Whether each raw value fits a 'width' bit word without overflow."""
+    x = as_raw(x)
+    low, high = _limits(x, width, signed)
+    return (x >= low) & (x <= high)
+
+
+def wrap(x, width, signed=True):
+    """
+    Raw values reduced to 'width' bits, as a register that narrow keeps
+    them: two's complement wrap-around (modulo 2**width if unsigned).
+    Also turns the unsigned encodings of signed words into their values.
+    """
+    x = as_raw(x)
+    if x.dtype != object and width >= INT64_BITS:
+        x = x.astype(object)
+    mask = (1 << width) - 1
+    x = x & mask
+    if signed:
+        x = x - ((x >> (width - 1)) << width)
+    return x
+
+
+def saturate(x, width, signed=True):
+    """Raw values clipped to the range of a 'width' bit word."""
+    x = as_raw(x)
+    low, high = _limits(x, width, signed)
+    return np.minimum(np.maximum(x, low), high)
+
+
+def _bound(x, width, signed, overflow):
+    if overflow == "saturate":
+        return saturate(x, width, signed)
+    if overflow == "wrap":
+        return wrap(x, width, signed)
+    if overflow is None:
+        return x
+    raise ValueError(f"overflow must be one of {OVERFLOW}, not {overflow!r}")
+
+
+def _divide(num, den, rounding):
+    """num / den for integer arrays with den > 0, rounded to an integer."""
+    if rounding == "floor":
+        return num // den
+    if rounding == "zero":
+        q = abs(num) // den
+        return np.where(num < 0, -q, q)
+    if rounding == "half_even":
+        q = num // den
+        r = num - q * den
+        up = (2 * r > den) | ((2 * r == den) & ((q & 1) == 1))
+        return q + up
+    raise ValueError(f"rounding must be one of {ROUNDING}, not {rounding!r}")
+
+
+def shift(x, n, rounding="floor"):
+    """
+    Raw values scaled by 2**-n: n > 0 drops n fractional bits, rounded as
+    'rounding' says ("floor" is the >>> of the RTL, which just drops them),
+    and n < 0 appends -n zero bits like <<<.
+    """
+    x = as_raw(x, max(-n, 0))
+    if n <= 0:
+        return x << -n
+    if rounding == "floor":
+        return x >> n
+    if rounding == "half_even":
+        q = x >> n
+        r = x & ((1 << n) - 1)
+        half = 1 << (n - 1)
+        return q + ((r > half) | ((r == half) & ((q & 1) == 1)))
+    return _divide(x, 1 << n, rounding)
+
+
+def add(a, b, width, signed=True, overflow="saturate"):
+    """
+    a + b for raw values with the same binary point, worked out one bit
+    wider so the sum is exact, then reduced to 'width' bits: "saturate"
+    clips it (FixedPointAdder), "wrap" keeps the low bits, None returns the
+    exact sum (compare with fits() for an overflow flag).
+    """
+    a = as_raw(a, 1)
+    b = as_raw(b, 1)
+    return _bound(a + b, width, signed, overflow)
+
+
+def mul(a, b, fbits, width, signed=True, rounding="floor", overflow="saturate"):
+    """
+    a * b for raw values, dropping 'fbits' fractional bits from the product
+    with 'rounding' (b's fractional bits, to keep a's binary point), then
+    reduced to 'width' bits as for add(). The defaults are gain.v's: an
+    arithmetic shift right and saturation.
+    """
+    a = as_raw(a)
+    b = as_raw(b)
+    if a.dtype != object and b.dtype != object and _bits(a) + _bits(b) > INT64_BITS:
+        a = a.astype(object)
+    return _bound(shift(a * b, fbits, rounding), width, signed, overflow)
+
+
+def div(a, b, fbits, width, signed=True, rounding="zero", overflow="saturate"):
+    """
+    a / b for raw values with the same binary point, with 'fbits'
+    fractional bits in the quotient, rounded as 'rounding' says and reduced
+    to 'width' bits as for add(). The defaults truncate towards zero like a
+    long division on magnitudes; the signed divider rounds "half_even" and
+    the unsigned one is "floor" (the same for non-negative operands).
+    Division by zero gives 0: the cores flag it instead of dividing.
+    """
+    a = as_raw(a, fbits)
+    b = as_raw(b)
+    a, b = np.broadcast_arrays(a, b)
+    dbz = b == 0
+    num = np.where(b < 0, -a, a) << fbits
+    q = _divide(num, np.where(dbz, 1, abs(b)), rounding)
+    return np.where(dbz, 0, _bound(q, width, signed, overflow))
+
+
+def sqrt(x, fbits, width, rounding="floor"):
+    """
+    sqrt(x) for non-negative raw values, with the binary point kept: the
+    integer square root of x * 2**fbits, floor(...) as sqrtFixedPoint
+    computes it (or "half_even", to nearest), reduced to 'width' bits.
+    """
+    x = as_raw(x, fbits + 1) << fbits
+    if (x < 0).any():
+        raise ValueError("square root of a negative value")
+    if x.dtype == object:
+        root = np.array([isqrt(int(v)) for v in x.ravel()], dtype=object).reshape(x.shape)
+    else:
+        # The float64 square root is within one of the answer for x below
+        # 2**62; the two integer corrections make it exact
+        root = np.sqrt(x.astype(np.float64)).astype(np.int64)
+        root -= root * root > x
+        root += (root + 1) * (root + 1) <= x
+    if rounding == "half_even":
+        # sqrt(x) >= root + 1/2 exactly when x > root**2 + root (never equal)
+        root = root + (x > root * root + root)
+    elif rounding != "floor":
+        raise ValueError(f"rounding must be 'floor' or 'half_even', not {rounding!r}")
+    return wrap(root, width, signed=False)
@@ -0,0 +1,144 @@
+import importlib.util
+import sys
+from fractions import Fraction
+from math import isqrt
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+import fixedpoint as fx
+
+
+def model(block):
+    """A block's python/design.py, imported under its own name."""
+    spec = importlib.util.spec_from_file_location(f"{block}_design", ROOT / block / "python" / "design.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def pairs(width, signed=True):
+    low, high = fx.limits(width, signed)
+    values = np.arange(low, high + 1, dtype=np.int64)
+    a, b = np.meshgrid(values, values, indexing="ij")
+    return a.ravel(), b.ravel()
+
+
+def rounded(value, rounding):
+    """A Fraction rounded to an integer, the slow and obvious way."""
+    if rounding == "floor":
+        return value.numerator // value.denominator
+    if rounding == "zero":
+        return int(value)
+    return round(value)  # Fraction rounds half to even
+
+
+@pytest.mark.parametrize("rounding", fx.ROUNDING)
+@pytest.mark.parametrize("overflow", fx.OVERFLOW)
+def test_operations_match_python_integers(rounding, overflow):
+    width, fbits = 6, 3
+    a, b = pairs(width)
+
+    def bound(x):
+        low, high = fx.limits(width)
+        if overflow == "saturate":
+            return min(max(x, low), high)
+        if overflow == "wrap":
+            return (x - low) % (1 << width) + low
+        return x
+
+    expected_add = [bound(x + y) for x, y in zip(a.tolist(), b.tolist())]
+    expected_mul = [bound(rounded(Fraction(x * y, 1 << fbits), rounding)) for x, y in zip(a.tolist(), b.tolist())]
+    expected_div = [bound(rounded(Fraction(x << fbits, y), rounding)) if y else 0 for x, y in zip(a.tolist(), b.tolist())]
+    assert fx.add(a, b, width, overflow=overflow).tolist() == expected_add
+    assert fx.mul(a, b, fbits, width, rounding=rounding, overflow=overflow).tolist() == expected_mul
+    assert fx.div(a, b, fbits, width, rounding=rounding, overflow=overflow).tolist() == expected_div
+
+
+def test_shift_and_sqrt_match_python_integers():
+    x = np.arange(-4096, 4096, dtype=np.int64)
+    for n in (-3, 0, 1, 4):
+        for rounding in fx.ROUNDING:
+            expected = [rounded(Fraction(v, 1 << n) if n >= 0 else Fraction(v << -n), rounding) for v in x.tolist()]
+            assert fx.shift(x, n, rounding).tolist() == expected
+    rad = np.arange(0, 1 << 12, dtype=np.int64)
+    assert fx.sqrt(rad, 6, 12).tolist() == [isqrt(v << 6) for v in rad.tolist()]
+    assert fx.sqrt(rad, 6, 12, "half_even").tolist() == [round(Fraction(v << 6) ** 0.5) for v in rad.tolist()]
+
+
+def test_wide_words_fall_back_to_python_integers():
+    rng = np.random.default_rng(1)
+    width, fbits = 100, 40
+    a = [int(v) for v in rng.integers(-(1 << 62), 1 << 62, 1000)]
+    b = [int(v) << 37 | 12345 for v in rng.integers(-(1 << 62), 1 << 62, 1000)]
+    a_obj, b_obj = np.array(a, dtype=object), np.array(b, dtype=object)
+    assert fx.add(a_obj, b_obj, width, overflow=None).tolist() == [x + y for x, y in zip(a, b)]
+    assert fx.mul(a_obj, b_obj, fbits, 2 * width, overflow=None).tolist() == [(x * y) >> fbits for x, y in zip(a, b)]
+    assert fx.wrap(b_obj, 64).tolist() == [(y + (1 << 63)) % (1 << 64) - (1 << 63) for y in b]
+    # int64 operands whose products don't fit int64 switch over on their own
+    c = np.array([1 << 40, -(1 << 40), 3], dtype=np.int64)
+    assert fx.mul(c, c, 0, 128, overflow=None).tolist() == [1 << 80, 1 << 80, 9]
+    assert fx.saturate(c, 64).dtype == np.int64
+
+
+def test_hold():
+    values = np.array([5, 6, 7, 8, 9])
+    assert fx.hold(values, [False, True, False, False, True], initial=-1).tolist() == [-1, 6, 6, 6, 9]
+    assert fx.hold(values, np.ones(5, dtype=bool)).tolist() == values.tolist()
+    assert fx.hold(values, np.zeros(5, dtype=bool)).tolist() == [0] * 5
+
+
+def test_add_is_FixedPointAdder():
+    adder = model("FixedPointAdder")
+    a, b = adder.all_pairs(8)
+    o_val, o_overflow, _ = adder.add(a, b, 8)
+    assert np.array_equal(fx.add(a, b, 8), o_val)
+    assert np.array_equal(~fx.fits(fx.add(a, b, 8, overflow=None), 8), o_overflow)
+
+
+def test_mul_is_gain():
+    gain = model("gain")
+    data = np.array([0, 1000, -1000, 32767, -32768, -32768, 16384, 12345], dtype=np.int64)
+    coeff = np.array([8192, 8192, 4096, 16384, 16384, -65536, 12288, -8191], dtype=np.int64)
+    o_data, o_pos_clip, o_neg_clip, _ = gain.gain(data, coeff)
+    # 1.0, 1.0, 0.5, clips at 2.0, clips at 2.0; the 2**31 product wraps to
+    # -2**31 in the product register; then 1.5 and just under -1.0, floored
+    assert o_data.tolist() == [0, 1000, -500, 32767, -32768, -32768, 24576, -12344]
+    assert o_pos_clip.tolist() == [False, False, False, True, False, False, False, False]
+    assert o_neg_clip.tolist() == [False, False, False, False, True, True, False, False]
+    unclipped = ~(o_pos_clip | o_neg_clip)
+    assert np.array_equal(fx.mul(data, coeff, 13, 16)[unclipped], o_data[unclipped])
+
+
+@pytest.mark.parametrize("width, fbits", [(8, 4), (7, 0), (6, 5)])
+def test_div_is_the_unsigned_divider(width, fbits):
+    divider = model("simpleFixedPointUnsignedLongDivision")
+    a, b = pairs(width, signed=False)
+    o_val, o_valid, o_dbz, o_ovf = divider.divide(a, b, width, fbits, hold_o_val=False)
+    quotient = fx.div(a, b, fbits, width, signed=False, rounding="floor", overflow=None)
+    assert np.array_equal(~o_dbz & ~fx.fits(quotient, width, signed=False), o_ovf)
+    assert np.array_equal(np.where(o_valid, quotient, 0), o_val)
+
+
+@pytest.mark.parametrize("width, fbits", [(8, 4), (7, 1), (6, 3)])
+def test_div_is_the_signed_divider(width, fbits):
+    divider = model("simpleFixedPointSignedLongDivision")
+    a, b = pairs(width)
+    o_val, o_valid, o_dbz, o_ovf = divider.divide(a, b, width, fbits, hold_o_val=False)
+    # The core flags the most negative operands and any quotient whose
+    # truncated magnitude doesn't fit, then rounds the magnitude
+    low, _ = fx.limits(width)
+    truncated = fx.div(a, b, fbits, width, rounding="zero", overflow=None)
+    fits = (a != low) & (b != low) & fx.fits(abs(truncated), width)
+    assert np.array_equal(~o_dbz & ~fits, o_ovf)
+    quotient = fx.div(a, b, fbits, width, rounding="half_even", overflow="wrap")
+    assert np.array_equal(np.where(o_valid, quotient, 0), o_val)
+
+
+@pytest.mark.parametrize("width, fbits", [(16, 8), (9, 4), (12, 0)])
+def test_sqrt_is_sqrtFixedPoint(width, fbits):
+    rad = np.arange(1 << width, dtype=np.int64)
+    assert np.array_equal(fx.sqrt(rad, fbits, width), model("sqrtFixedPoint").sqrt(rad, width, fbits)[0])
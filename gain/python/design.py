@@ -0,0 +1,52 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# The repository root holds the shared fixedpoint package
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+import fixedpoint as fx
+from fixedpoint import hold, to_fixed, to_real, wrap
+
+DATA_WIDTH = 16   # gain.v's defaults
+FRAC_BITS = 13
+COEFF_WIDTH = 17  # i_gain_coeff
+
+
+def gain(data, coeff, ce=None, data_width=DATA_WIDTH, frac_bits=FRAC_BITS):
+    """
+    What gain registers, clock by clock, for samples driven one clock each:
+    entry k is read the clock after data[k], coeff[k] and ce[k] are on the
+    inputs.
+
+    The product is worked out 2*DATA_WIDTH bits wide (wrapping there), and
+    o_data is it shifted right by FRAC_BITS, or MAX_AUDIO_VAL/MIN_AUDIO_VAL
+    with o_pos_clip/o_neg_clip when the product is beyond them scaled by
+    2**FRAC_BITS. Without i_ce the product register holds and the clip
+    flags clear, so o_data goes back to the unclipped shifted product.
+
+    Args:
+        data: i_data, raw two's complement DATA_WIDTH bit samples
+            (negative, or their unsigned encodings); o_data keeps their
+            binary point.
+        coeff: i_gain_coeff, raw 17 bit gains with FRAC_BITS fractional
+            bits (1.0 is 2**frac_bits).
+        ce: i_ce, one per clock (every clock if None).
+        data_width: DATA_WIDTH, up to 31 bits.
+        frac_bits: FRAC_BITS.
+
+    Returns:
+        A tuple (o_data, o_pos_clip, o_neg_clip, o_ce) of flat arrays, one
+        entry per clock, o_data as signed integers.
+    """
+    data, coeff = np.broadcast_arrays(wrap(np.ravel(data), data_width), wrap(np.ravel(coeff), COEFF_WIDTH))
+    ce = np.ones(len(data), dtype=bool) if ce is None else np.asarray(ce, dtype=bool).ravel()
+    product_width = 2 * data_width
+    low, high = fx.limits(data_width)
+
+    product = fx.mul(data, coeff, 0, product_width, overflow="wrap")
+    o_pos_clip = ce & (product > wrap(high << frac_bits, product_width))
+    o_neg_clip = ce & (product < wrap(low << frac_bits, product_width))
+    shifted = wrap(fx.shift(hold(product, ce), frac_bits), data_width)
+    o_data = np.where(o_pos_clip, high, np.where(o_neg_clip, low, shifted))
+    return o_data, o_pos_clip, o_neg_clip, ce
@@ -1,3 +1,6 @@
 #!/bin/bash
 
-g++ src/main.cpp include/nco.h -o output/nco_example -lm
+g++ -O2 src/main.cpp include/nco.h -o output/nco_example -lm
+
+# Shared library with the C interface of src/nco.cpp, for python/nco_cpp.py
+g++ -O2 -shared -fPIC -Iinclude src/nco.cpp -o output/libnco.so -lm
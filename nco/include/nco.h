@@ -29,6 +29,7 @@
 #define _nco_H_
 
 #include <math.h> // Required for sin() and M_PI
+#include <stddef.h> // Required for size_t
 
 class NCO {
 public:
@@ -95,6 +96,24 @@ public:
         // Finally return the table lookup value
         return m_table[index];
     }
+
+    // Bulk version of operator(): writes the next n samples to out.
+    // The phase state is kept in locals for the duration of the loop, so
+    // the compiler can keep it in registers instead of reloading it from
+    // the object for every sample.
+    void generate(float *out, size_t n) {
+        const unsigned  shift = (sizeof(unsigned) * 8) - m_lglen;
+        const unsigned  mask = m_mask, dphase = m_dphase;
+        const float     *table = m_table;
+        unsigned        phase = m_phase;
+
+        for(size_t k = 0; k < n; k++) {
+            phase += dphase;
+            out[k] = table[(phase >> shift) & mask];
+        }
+
+        m_phase = phase;
+    }
 }; // Corrected: Added missing semicolon after class definition
 
 # endif // _nco_H_
\ No newline at end of file
@@ -0,0 +1,169 @@
+import numpy as np
+from pathlib import Path
+
+# Shared by nco.v and mcnco.v
+SINTABLE_HEX = Path(__file__).resolve().parent.parent / "rtl" / "sintable.hex"
+
+
+def load_sintable(lgtbl, ow, path=SINTABLE_HEX):
+    """
+    Loads the sine table the way sintable.v's $readmemh does.
+
+    Args:
+        lgtbl: Log, base two, of the table size (LGTBL/PW).
+        ow: Output width in bits (OW).
+        path: Path to the hex file, with optional '@address' records.
+
+    Returns:
+        A numpy int64 array of 2**lgtbl entries. Entries beyond the end of
+        the file stay 0, entries beyond the table are dropped, and every
+        value is truncated to ow bits.
+    """
+    table = np.zeros(1 << lgtbl, dtype=np.int64)
+    addr = 0
+    with open(path) as fp:
+        for token in fp.read().split():
+            if token.startswith('@'):
+                addr = int(token[1:], 16)
+                continue
+            if addr < len(table):
+                table[addr] = int(token, 16)
+            addr += 1
+
+    return table & ((1 << ow) - 1)
+
+
+def sintable(lgtbl, ow):
+    """
+    The full-wave sine table sintable.v reads, for any table size and width.
+
+    Entry n is sin(2*pi*n / 2**lgtbl) scaled to the largest positive ow-bit
+    value and truncated toward zero, as ow-bit two's complement;
+    rtl/sintable.hex is sintable(17, 13).
+
+    Args:
+        lgtbl: Log, base two, of the table size (LGTBL/PW).
+        ow: Output width in bits (OW).
+
+    Returns:
+        A numpy int64 array of 2**lgtbl unsigned ow-bit entries, as
+        load_sintable() returns them.
+    """
+    n = np.arange(1 << lgtbl)
+    table = np.trunc(np.sin(2 * np.pi * n / (1 << lgtbl)) * ((1 << (ow - 1)) - 1)).astype(np.int64)
+
+    return table & ((1 << ow) - 1)
+
+
+def write_sintable(path, lgtbl, ow):
+    """
+    Writes sintable(lgtbl, ow) as a $readmemh file laid out like
+    rtl/sintable.hex: an '@address' record and eight entries per line.
+    """
+    table = sintable(lgtbl, ow)
+    digits = (ow + 3) // 4
+    with open(path, "w") as fp:
+        for addr in range(0, len(table), 8):
+            words = " ".join(f"{int(value):0{digits}x}" for value in table[addr:addr + 8])
+            fp.write(f"@{addr:08x} {words} \n")
+
+
+def nco_phases(dphase, num_samples, phase=0, w=32):
+    """
+    Phase accumulator values for any number of NCO channels at once.
+
+    Args:
+        dphase: Phase step(s), i_dphase/r_step; scalar or array of channels.
+        num_samples: Number of samples (enabled clocks) per channel.
+        phase: Accumulator value(s) before the first sample.
+        w: Accumulator width (W).
+
+    Returns:
+        A tuple (phases, next_phase). phases has shape
+        (num_samples,) + shape of dphase and holds the accumulator value
+        each sample is looked up with; next_phase is the accumulator value
+        after the last sample, to continue a run in another batch.
+    """
+    mask = np.uint64((1 << w) - 1)
+    dphase = np.asarray(dphase, dtype=np.uint64)
+    phase = np.asarray(phase, dtype=np.uint64)
+
+    # uint64 products wrap modulo 2^64, which keeps them exact modulo 2^w
+    k = np.arange(num_samples, dtype=np.uint64).reshape((-1,) + (1,) * dphase.ndim)
+    phases = (phase + k * dphase) & mask
+    next_phase = (phase + np.uint64(num_samples) * dphase) & mask
+
+    return phases, next_phase
+
+
+def nco(dphase, num_samples, lgtbl=9, ow=8, w=32, phase=0, table=None):
+    """
+    Vectorized model of nco.v (and of each channel of mcnco.v).
+
+    Sample n of a channel is the table entry addressed by the top lgtbl
+    bits of the phase accumulator after n steps, i.e. o_val one clock after
+    the n-th i_ce.
+
+    Args:
+        dphase: Phase step(s); an array models several channels at once.
+        num_samples: Number of samples per channel.
+        lgtbl: Log, base two, of the table size (LGTBL).
+        ow: Output width (OW).
+        w: Accumulator width (W).
+        phase: Starting accumulator value(s).
+        table: Sine table, defaults to load_sintable(lgtbl, ow).
+
+    Returns:
+        A tuple (samples, next_phase); samples has the shape of the phases
+        returned by nco_phases().
+    """
+    if table is None:
+        table = load_sintable(lgtbl, ow)
+
+    phases, next_phase = nco_phases(dphase, num_samples, phase, w)
+    samples = table[(phases >> np.uint64(w - lgtbl)).astype(np.intp)]
+
+    return samples, next_phase
+
+
+def mcnco(dphases, num_sweeps, lgtbl=9, ow=8, w=32, phase=0, table=None):
+    """
+    Model of the channel-tagged output stream of mcnco.v.
+
+    Args:
+        dphases: Phase step of every channel (r_step bank), length 2**LGCH.
+        num_sweeps: Number of i_ce sweeps over all channels.
+        lgtbl, ow, w, phase, table: As for nco().
+
+    Returns:
+        A tuple (channels, values, next_phase) of flat arrays in output
+        order: channel 0..NCH-1 for the first sweep, then the next sweep.
+    """
+    samples, next_phase = nco(dphases, num_sweeps, lgtbl, ow, w, phase, table)
+    channels = np.broadcast_to(np.arange(samples.shape[1]), samples.shape)
+
+    return channels.ravel(), samples.ravel(), next_phase
+
+
+def main():
+    import matplotlib.pyplot as plt
+
+    lgtbl, ow, w = 9, 8, 32
+    frequencies = np.array([0.01, 0.02, 0.05, 0.1])
+    dphases = (frequencies * 2**w).astype(np.uint64)
+
+    samples, _ = nco(dphases, 400, lgtbl, ow, w)
+
+    plt.figure(figsize=(12, 6))
+    for ch, f in enumerate(frequencies):
+        plt.plot(samples[:, ch], label=f'channel {ch}, f = {f} fs')
+    plt.title(f'NCO model output (LGTBL={lgtbl}, OW={ow})')
+    plt.xlabel('Sample Number')
+    plt.ylabel('o_val')
+    plt.legend()
+    plt.grid(True, linestyle='--', alpha=0.7)
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import ctypes
+from pathlib import Path
+
+import numpy as np
+
+# Built by buid_cpp.sh from src/nco.cpp
+DEFAULT_LIBRARY = Path(__file__).resolve().parent.parent / "output" / "libnco.so"
+
+_float_p = ctypes.POINTER(ctypes.c_float)
+
+
+def load_library(path=DEFAULT_LIBRARY):
+    """
+    Loads the NCO shared library and declares its C interface.
+
+    Args:
+        path: Path to libnco.so.
+
+    Returns:
+        The ctypes.CDLL handle.
+    """
+    lib = ctypes.CDLL(str(path))
+
+    lib.nco_create.argtypes = [ctypes.c_int]
+    lib.nco_create.restype = ctypes.c_void_p
+    lib.nco_destroy.argtypes = [ctypes.c_void_p]
+    lib.nco_destroy.restype = None
+    lib.nco_frequency.argtypes = [ctypes.c_void_p, ctypes.c_float]
+    lib.nco_frequency.restype = None
+    lib.nco_set_phase.argtypes = [ctypes.c_void_p, ctypes.c_uint]
+    lib.nco_set_phase.restype = None
+    lib.nco_get_phase.argtypes = [ctypes.c_void_p]
+    lib.nco_get_phase.restype = ctypes.c_uint
+    lib.nco_sample.argtypes = [ctypes.c_void_p]
+    lib.nco_sample.restype = ctypes.c_float
+    lib.nco_generate.argtypes = [ctypes.c_void_p, _float_p, ctypes.c_size_t]
+    lib.nco_generate.restype = None
+
+    return lib
+
+
+class NCO:
+    """
+    The C++ NCO golden model (include/nco.h), driven through ctypes.
+
+    generate() has the C++ code write straight into a numpy buffer, so
+    samples are produced at memory bandwidth with no per-sample Python
+    overhead and no intermediate copy.
+    """
+    def __init__(self, lgtblsize, frequency=None, library=None):
+        self._handle = None
+        self._lib = load_library(library or DEFAULT_LIBRARY)
+        self._handle = self._lib.nco_create(lgtblsize)
+        if not self._handle:
+            raise MemoryError("nco_create() failed.")
+        if frequency is not None:
+            self.frequency(frequency)
+
+    def frequency(self, f):
+        """Sets the output frequency, relative to a sample rate of 1.0."""
+        self._lib.nco_frequency(self._handle, f)
+
+    @property
+    def phase(self):
+        """The 32-bit phase accumulator."""
+        return self._lib.nco_get_phase(self._handle)
+
+    @phase.setter
+    def phase(self, value):
+        self._lib.nco_set_phase(self._handle, value & 0xFFFFFFFF)
+
+    def __call__(self):
+        """The next sample, one at a time like the C++ operator()."""
+        return self._lib.nco_sample(self._handle)
+
+    def generate(self, n=None, out=None):
+        """
+        Generates the next samples.
+
+        Args:
+            n: Number of samples, when no output buffer is given.
+            out: Optional C-contiguous float32 array to fill in place.
+
+        Returns:
+            The float32 array holding the samples (out, when given).
+        """
+        if out is None:
+            if n is None:
+                raise ValueError("Either n or out must be given.")
+            out = np.empty(n, dtype=np.float32)
+        elif out.dtype != np.float32 or not out.flags.c_contiguous or not out.flags.writeable:
+            raise ValueError("out must be a writeable, C-contiguous float32 array.")
+
+        self._lib.nco_generate(self._handle, out.ctypes.data_as(_float_p), out.size)
+
+        return out
+
+    def close(self):
+        if self._handle:
+            self._lib.nco_destroy(self._handle)
+            self._handle = None
+
+    def __del__(self):
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,36 @@
+import shutil
+import subprocess
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from nco_cpp import NCO
+
+NCO_DIR = Path(__file__).resolve().parent.parent
+
+pytestmark = pytest.mark.skipif(shutil.which("g++") is None, reason="g++ is needed to build libnco.so")
+
+
+@pytest.fixture(scope="module")
+def library(tmp_path_factory):
+    """libnco.so built as buid_cpp.sh builds it, in a scratch directory."""
+    path = tmp_path_factory.mktemp("nco") / "libnco.so"
+    subprocess.run(["g++", "-O2", "-shared", "-fPIC", f"-I{NCO_DIR / 'include'}", str(NCO_DIR / "src" / "nco.cpp"),
+                    "-o", str(path), "-lm"], check=True)
+    return path
+
+
+@pytest.mark.parametrize("lgtblsize", [9, 12])
+@pytest.mark.parametrize("frequency, phase", [(0.01, 0), (0.123456, 0x89abcdef), (0.49, 0xffffff00)])
+def test_generate_is_operator(library, lgtblsize, frequency, phase):
+    n = 5000
+    with NCO(lgtblsize, frequency, library) as one, NCO(lgtblsize, frequency, library) as bulk:
+        one.phase = bulk.phase = phase
+        samples = np.array([one() for _ in range(n)], dtype=np.float32)
+        assert np.array_equal(bulk.generate(n), samples)
+        assert bulk.phase == one.phase
+        # and it carries on from there, into a buffer given in place
+        out = np.zeros(7, dtype=np.float32)
+        assert bulk.generate(out=out) is out
+        assert np.array_equal(out, [one() for _ in range(7)])
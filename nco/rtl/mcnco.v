@@ -0,0 +1,152 @@
+// =============================================================================
+// File        : mcnco.v
+// Author      : @fjpolo
+// email       : fjpolo@gmail.com
+// Description : Time-multiplexed multichannel NCO. NCH phase accumulators
+//               share a single sintable, which is read once per channel
+//               (NCH times) for every sample clock enable. The per-channel
+//               phase steps live in a Wishbone-writable register bank.
+// License     : MIT License
+//
+// Copyright (c) 2025 | @fjpolo
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in all
+// copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+// =============================================================================
+
+`default_nettype none
+`timescale 1ps/1ps
+
+module	mcnco(i_clk, i_reset,
+		// Wishbone interface to the phase step (frequency) bank
+		i_wb_cyc, i_wb_stb, i_wb_we, i_wb_addr, i_wb_data,
+			o_wb_ack, o_wb_stall, o_wb_data,
+		i_ce, o_valid, o_channel, o_val);
+	parameter	LGCH = 4,   // Log, base two, of the number of channels
+			    LGTBL = 9,  // Log, base two, of the table size
+			    W = 32,     // Word-size, at most the 32-bit bus width
+			    OW = 8;     // Output width
+	localparam	NCH = (1<<LGCH);
+	localparam	P = LGTBL;
+	//
+	input	wire		        i_clk;
+	input	wire		        i_reset;
+	//
+	input	wire		        i_wb_cyc, i_wb_stb, i_wb_we;
+	input	wire	[LGCH-1:0]	i_wb_addr;
+	input	wire	[31:0]	    i_wb_data;
+	output	reg		            o_wb_ack;
+	output	wire		        o_wb_stall;
+	output	reg	    [31:0]	    o_wb_data;
+	//
+	// Sample clock enable.  Each i_ce starts a sweep over all NCH channels,
+	// one channel per clock, so i_ce may be raised at most once every NCH
+	// clocks.  An i_ce arriving on the last clock of a sweep starts the
+	// next sweep right away; one arriving earlier is ignored.
+	input	wire		        i_ce;
+	output	wire		        o_valid;
+	output	reg	    [LGCH-1:0]	o_channel;
+	output	wire    [OW-1:0]	o_val;
+
+	integer	k;
+
+	// Phase step bank, r_step[ch] = 2^W * f[ch]/fs, written over Wishbone
+	reg	[W-1:0]	r_step	[0:NCH-1];
+
+	initial	for(k=0; k<NCH; k=k+1)
+		r_step[k] = 0;
+	always @(posedge i_clk)
+	if ((i_wb_stb)&&(i_wb_we))
+		r_step[i_wb_addr] <= i_wb_data[W-1:0];
+
+	// Channel sequencer
+	reg			r_busy;
+	reg	[LGCH-1:0]	r_ch;
+
+	initial	r_busy = 1'b0;
+	initial	r_ch   = 0;
+	always @(posedge i_clk)
+	if (i_reset)
+	begin
+		r_busy <= 1'b0;
+		r_ch   <= 0;
+	end else if ((i_ce)&&((!r_busy)||(r_ch == NCH-1)))
+	begin
+		r_busy <= 1'b1;
+		r_ch   <= 0;
+	end else if (r_busy)
+	begin
+		if (r_ch == NCH-1)
+			r_busy <= 1'b0;
+		r_ch <= r_ch + 1'b1;
+	end
+
+	// Phase accumulator bank, one accumulator advanced per clock
+	reg	[W-1:0]	r_phase	[0:NCH-1];
+	wire	[W-1:0]	w_phase;
+
+	initial	for(k=0; k<NCH; k=k+1)
+		r_phase[k] = 0;
+	assign	w_phase = r_phase[r_ch];
+	always @(posedge i_clk)
+	if (r_busy)
+		// PHI[ch][n] = PHI[ch][n-1] + 2^W * f[ch] / fs
+		r_phase[r_ch] <= w_phase + r_step[r_ch];
+
+	// Shared SIN LUT, looked up with the phase before the update exactly
+	// like nco.v.  The channel tag and valid flag travel alongside.
+	sintable #(.PW(P), .OW(OW))
+	stbl(
+		.i_clk(i_clk),
+		.i_reset(i_reset),
+		.i_ce(1'b1),
+		.i_phase(w_phase[(W-1):(W-P)]),
+		.o_val(o_val),
+		.i_aux(r_busy),
+		.o_aux(o_valid)
+		);
+
+	initial	o_channel = 0;
+	always @(posedge i_clk)
+		o_channel <= r_ch;
+
+	// Bus return: read back the phase step of the addressed channel
+	initial	o_wb_data = 0;
+	always @(posedge i_clk)
+	begin
+		o_wb_data <= 0;
+		o_wb_data[W-1:0] <= r_step[i_wb_addr];
+	end
+
+	// Always ack on the clock following any request
+	initial	o_wb_ack = 1'b0;
+	always @(posedge i_clk)
+	if (i_reset)
+		o_wb_ack <= 1'b0;
+	else
+		o_wb_ack <= (i_wb_stb);
+
+	// Never stall
+	assign	o_wb_stall = 1'b0;
+
+	// verilator lint_off UNUSED
+	wire	unused;
+	assign	unused = i_wb_cyc;
+	// verilator lint_on  UNUSED
+
+endmodule
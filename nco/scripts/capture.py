@@ -0,0 +1,118 @@
+import numpy as np
+
+# Sample formats written by the capture producers:
+#   'f32' - src/main.cpp capture mode (float32 in [-1, 1])
+#   'u32' - RTL simulations, one o_val per 32-bit word ($fwrite "%u")
+CAPTURE_DTYPES = {
+    'f32': np.dtype('<f4'),
+    'u32': np.dtype('<u4'),
+    'i32': np.dtype('<i4'),
+    'u16': np.dtype('<u2'),
+    'i16': np.dtype('<i2'),
+}
+
+# Samples reduced per step by envelope(); bounds the working set to a few MB
+# regardless of the capture size.
+CHUNK_SAMPLES = 1 << 22
+
+
+def open_capture(path, fmt='f32'):
+    """
+    Memory-maps a raw little-endian binary capture.
+
+    Args:
+        path: Path to the capture file.
+        fmt: Sample format, one of CAPTURE_DTYPES.
+
+    Returns:
+        A read-only 1-D numpy array backed by the file. A trailing partial
+        sample, as left by an interrupted simulation, is ignored.
+    """
+    if fmt not in CAPTURE_DTYPES:
+        raise ValueError(f"Unknown capture format '{fmt}', expected one of {sorted(CAPTURE_DTYPES)}.")
+
+    dtype = CAPTURE_DTYPES[fmt]
+    with open(path, 'rb') as fp:
+        fp.seek(0, 2)
+        num_samples = fp.tell() // dtype.itemsize
+
+    # np.memmap refuses zero-length mappings
+    if num_samples == 0:
+        return np.empty(0, dtype=dtype)
+
+    return np.memmap(path, dtype=dtype, mode='r', shape=(num_samples,))
+
+
+class CaptureWriter:
+    """
+    Appends blocks of samples to a raw little-endian binary capture.
+
+    Used by the cocotb testbenches so that RTL runs produce the same format
+    as the C++ example.
+    """
+    def __init__(self, path, fmt='u32'):
+        self.dtype = CAPTURE_DTYPES[fmt]
+        self.num_samples = 0
+        self._fp = open(path, 'wb')
+
+    def write(self, samples):
+        """Writes a block (any array-like) of samples."""
+        block = np.ascontiguousarray(samples, dtype=self.dtype)
+        block.tofile(self._fp)
+        self.num_samples += block.size
+
+    def close(self):
+        self._fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def envelope(samples, num_bins):
+    """
+    Min/max envelope decimation for plotting.
+
+    Splits the samples into num_bins equal spans and keeps the minimum and
+    maximum of each, so every peak survives the decimation. The input is
+    reduced CHUNK_SAMPLES at a time, so memory-mapped captures are streamed
+    from disk rather than loaded.
+
+    Args:
+        samples: A 1-D numpy array (typically from open_capture()).
+        num_bins: Number of output bins, i.e. horizontal plot resolution.
+
+    Returns:
+        A tuple (x, y) of 2*num_bins points tracing the envelope, or the raw
+        samples when there are fewer than 2*num_bins of them.
+    """
+    if num_bins <= 0:
+        raise ValueError("Number of bins must be positive.")
+
+    num_samples = len(samples)
+    if num_samples <= 2 * num_bins:
+        return np.arange(num_samples), np.asarray(samples)
+
+    # Drop the tail that does not fill a whole bin
+    bin_len = num_samples // num_bins
+    bins_per_chunk = max(1, CHUNK_SAMPLES // bin_len)
+
+    lo = np.empty(num_bins, dtype=samples.dtype)
+    hi = np.empty(num_bins, dtype=samples.dtype)
+    for first in range(0, num_bins, bins_per_chunk):
+        last = min(first + bins_per_chunk, num_bins)
+        chunk = np.asarray(samples[first * bin_len:last * bin_len]).reshape(last - first, bin_len)
+        chunk.min(axis=1, out=lo[first:last])
+        chunk.max(axis=1, out=hi[first:last])
+
+    # Trace min and max at the start and middle of each bin
+    x = np.empty(2 * num_bins, dtype=np.int64)
+    x[0::2] = np.arange(num_bins) * bin_len
+    x[1::2] = x[0::2] + bin_len // 2
+    y = np.empty(2 * num_bins, dtype=samples.dtype)
+    y[0::2] = lo
+    y[1::2] = hi
+
+    return x, y
@@ -1,7 +1,65 @@
 #include <iostream> // Required for input/output operations (e.g., std::cout)
+#include <cstdio>   // Required for binary capture output (fopen/fwrite)
+#include <cstdlib>  // Required for strtoul/strtof
+#include <cstring>  // Required for memcpy
+#include <cstdint>  // Required for fixed-width integer types
 #include "../include/nco.h"
 
-int main() {
+// Number of samples converted and written per fwrite() call in capture mode.
+static const size_t CAPTURE_BLOCK = 1 << 16;
+
+// Write the float samples as raw little-endian IEEE-754 binary32 words,
+// independent of the host byte order.
+static size_t write_le_f32(FILE *fp, const float *samples, size_t n) {
+    static unsigned char bytes[CAPTURE_BLOCK * 4];
+
+    for(size_t k = 0; k < n; k++) {
+        uint32_t word;
+        memcpy(&word, &samples[k], sizeof(word));
+        bytes[4*k + 0] = (unsigned char)(word);
+        bytes[4*k + 1] = (unsigned char)(word >> 8);
+        bytes[4*k + 2] = (unsigned char)(word >> 16);
+        bytes[4*k + 3] = (unsigned char)(word >> 24);
+    }
+
+    return fwrite(bytes, 4, n, fp);
+}
+
+// Capture mode: stream num_samples samples to a raw binary file that
+// scripts/capture.py can memory-map.
+static int capture(NCO &nco, const char *path, unsigned long num_samples) {
+    static float block[CAPTURE_BLOCK];
+
+    FILE *fp = fopen(path, "wb");
+    if (fp == NULL) {
+        std::cerr << "Could not open capture file: " << path << std::endl;
+        return 1;
+    }
+
+    unsigned long remaining = num_samples;
+    while (remaining > 0) {
+        size_t n = (remaining < CAPTURE_BLOCK) ? remaining : CAPTURE_BLOCK;
+
+        nco.generate(block, n);
+
+        if (write_le_f32(fp, block, n) != n) {
+            std::cerr << "Short write to capture file: " << path << std::endl;
+            fclose(fp);
+            return 1;
+        }
+        remaining -= n;
+    }
+
+    fclose(fp);
+    std::cout << "Wrote " << num_samples << " samples (float32, little-endian) to " << path << std::endl;
+
+    return 0;
+}
+
+// Usage:
+//   nco_example                                  print 200 samples as text
+//   nco_example <capture.bin> [samples] [freq]   write raw float32 samples
+int main(int argc, char **argv) {
     // Define the logarithm of the table size for the NCO.
     // A value of 10 means the table will have 2^10 = 1024 entries.
     const int LG_TABLE_SIZE = 10;
@@ -14,8 +72,17 @@ int main() {
     // This value is relative to the NCO's internal SAMPLE_RATE.
     // For example, if SAMPLE_RATE is 1.0, a frequency of 0.1 means 0.1 cycles per sample.
     float desiredFrequency = 0.01f; // A small frequency to see multiple cycles over many samples
+    if (argc > 3)
+        desiredFrequency = strtof(argv[3], NULL);
     myNCO.frequency(desiredFrequency);
 
+    if (argc > 1) {
+        unsigned long num_samples = 1000000;
+        if (argc > 2)
+            num_samples = strtoul(argv[2], NULL, 0);
+        return capture(myNCO, argv[1], num_samples);
+    }
+
     std::cout << "Generating NCO samples with frequency: " << desiredFrequency << std::endl;
     std::cout << "----------------------------------------------------" << std::endl;
 
@@ -35,4 +102,4 @@ int main() {
     std::cout << "NCO sample generation complete." << std::endl;
 
     return 0; // Indicate successful execution
-}
\ No newline at end of file
+}
@@ -26,3 +26,37 @@
 // SOFTWARE.
 // =============================================================================
 #include "nco.h"
+
+// C interface for the shared library built by buid_cpp.sh (output/libnco.so),
+// used by python/nco_cpp.py through ctypes.
+extern "C" {
+
+NCO *nco_create(int lgtblsize) {
+    return new NCO(lgtblsize);
+}
+
+void nco_destroy(NCO *nco) {
+    delete nco;
+}
+
+void nco_frequency(NCO *nco, float f) {
+    nco->frequency(f);
+}
+
+void nco_set_phase(NCO *nco, unsigned phase) {
+    nco->m_phase = phase;
+}
+
+unsigned nco_get_phase(const NCO *nco) {
+    return nco->m_phase;
+}
+
+float nco_sample(NCO *nco) {
+    return (*nco)();
+}
+
+void nco_generate(NCO *nco, float *out, size_t n) {
+    nco->generate(out, n);
+}
+
+}
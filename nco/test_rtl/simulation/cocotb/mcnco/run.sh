@@ -0,0 +1,26 @@
+# !/bin/bash
+
+# Source the OSS CAD Suite environment
+echo "          [COCOTB] Sourcing OSS CAD Suite environment..."
+[ -n "$OSS_CAD_SUITE" ] || source ~/oss-cad-suite/environment
+if [ $? -ne 0 ]; then
+    echo "          [COCOTB] FAIL: Failed to source OSS CAD Suite environment. Exiting script."
+    exit 1
+fi
+
+# Call cocoTB
+echo "        [COCOTB][ICARUS] Running testbench..."
+python3 testrunner.py --sim icarus
+if [ $? -ne 0 ]; then
+    echo "          [COCOTB][ICARUS] FAIL: Simulation failed. Exiting script."
+    exit 1
+fi
+echo "        [COCOTB][ICARUS] PASS: CocoTB simulation passed!"
+
+echo "        [COCOTB][VERILATOR] Running testbench..."
+python3 testrunner.py --sim verilator
+if [ $? -ne 0 ]; then
+    echo "          [COCOTB][VERILATOR] FAIL: Simulation failed. Exiting script."
+    exit 1
+fi
+echo "        [COCOTB][VERILATOR] PASS: CocoTB simulation passed!"
@@ -0,0 +1,119 @@
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import RisingEdge
+
+# nco/python holds the vectorized NCO model and the sine table
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / "python"))
+from design import mcnco, sintable
+
+# Must match the parameters the runner builds with
+LGCH = int(os.getenv("MCNCO_LGCH", "4"))
+LGTBL = int(os.getenv("MCNCO_LGTBL", "9"))
+OW = int(os.getenv("MCNCO_OW", "8"))
+W=32     # must match mcnco.v
+NCH=1 << LGCH
+NUM_SWEEPS = int(os.getenv("MCNCO_SWEEPS", "4096"))
+
+async def reset_dut(dut):
+    dut.i_wb_cyc.value = 0
+    dut.i_wb_stb.value = 0
+    dut.i_wb_we.value = 0
+    dut.i_wb_addr.value = 0
+    dut.i_wb_data.value = 0
+    dut.i_ce.value = 0
+    dut.i_reset.value = 1
+    await RisingEdge(dut.i_clk)
+    await RisingEdge(dut.i_clk)
+    dut.i_reset.value = 0
+    await RisingEdge(dut.i_clk)
+
+async def wb_write(dut, addr, data):
+    dut.i_wb_cyc.value = 1
+    dut.i_wb_stb.value = 1
+    dut.i_wb_we.value = 1
+    dut.i_wb_addr.value = addr
+    dut.i_wb_data.value = data
+    await RisingEdge(dut.i_clk)
+    dut.i_wb_cyc.value = 0
+    dut.i_wb_stb.value = 0
+    dut.i_wb_we.value = 0
+
+async def wb_read(dut, addr):
+    dut.i_wb_cyc.value = 1
+    dut.i_wb_stb.value = 1
+    dut.i_wb_we.value = 0
+    dut.i_wb_addr.value = addr
+    await RisingEdge(dut.i_clk)
+    dut.i_wb_cyc.value = 0
+    dut.i_wb_stb.value = 0
+    await RisingEdge(dut.i_clk)
+    assert dut.o_wb_ack.value == 1, "o_wb_ack is not 1!"
+    return dut.o_wb_data.value.integer
+
+async def run_sweeps(dut, num_sweeps, period):
+    """Raise i_ce every 'period' clocks and capture the tagged output stream."""
+    total = num_sweeps * NCH
+    channels = np.empty(total, dtype=np.int64)
+    values = np.empty(total, dtype=np.int64)
+    count = 0
+
+    # Outputs are sampled at each rising edge (i.e. as settled during the
+    # previous clock), then the inputs for the next clock are driven.
+    cycle = 0
+    while count < total:
+        await RisingEdge(dut.i_clk)
+        if dut.o_valid.value:
+            channels[count] = dut.o_channel.value.integer
+            values[count] = dut.o_val.value.integer
+            count += 1
+        dut.i_ce.value = 1 if ((cycle % period == 0) and (cycle // period < num_sweeps)) else 0
+        cycle += 1
+        assert cycle < (num_sweeps + 2) * period + NCH, "mcnco stopped producing samples"
+
+    return channels, values
+
+async def check_all_channels(dut, dphases, period, phase):
+    """Program the step bank, run NUM_SWEEPS sweeps and compare in bulk."""
+    for ch in range(NCH):
+        await wb_write(dut, ch, int(dphases[ch]))
+    for ch in range(NCH):
+        assert await wb_read(dut, ch) == dphases[ch], f"r_step[{ch}] read back wrong"
+
+    channels, values = await run_sweeps(dut, NUM_SWEEPS, period)
+    # Against the quantized sine, not the file the simulation read, so a
+    # table of the wrong size or width fails
+    model_channels, model_values, next_phase = mcnco(dphases, NUM_SWEEPS, LGTBL, OW, W, phase,
+                                                     sintable(LGTBL, OW))
+
+    assert np.array_equal(channels, model_channels), "o_channel sequence doesn't match"
+    mismatches = np.flatnonzero(values != model_values)
+    if len(mismatches):
+        first = mismatches[0]
+        dut._log.error(f"{len(mismatches)} mismatches, first at sweep {first // NCH} channel "
+                       f"{channels[first]}: dut {values[first]} model {model_values[first]}")
+    assert len(mismatches) == 0, "dut o_val doesn't match model o_val"
+    dut._log.info(f"{len(values)} samples over {NCH} channels match the model")
+
+    return next_phase
+
+@cocotb.test()
+async def test_all_channels(dut):
+    """Check every channel in bulk, back-to-back and with idle clocks between sweeps"""
+    cocotb.start_soon(Clock(dut.i_clk, 1, units="ns").start())
+    await reset_dut(dut)
+    rng = np.random.default_rng(1)
+
+    # i_ce every NCH clocks: the table is read on every clock
+    phase = np.zeros(NCH, dtype=np.uint64)
+    dphases = rng.integers(0, 2**W, NCH, dtype=np.uint64)
+    phase = await check_all_channels(dut, dphases, NCH, phase)
+
+    # Retune every channel; the accumulators carry on from where they were
+    dphases = rng.integers(0, 2**W, NCH, dtype=np.uint64)
+    await check_all_channels(dut, dphases, NCH + 5, phase)
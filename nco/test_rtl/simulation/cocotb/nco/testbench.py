@@ -1,8 +1,100 @@
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
 import cocotb
-from cocotb.triggers import Timer
+from cocotb.clock import Clock
+from cocotb.triggers import FallingEdge, RisingEdge, Timer
+
+# nco/scripts holds the binary capture reader/writer, nco/python the model
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / "scripts"))
+from capture import CaptureWriter
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / "python"))
+from design import load_sintable, nco, sintable
+
+# Must match the parameters the runner builds with
+LGTBL = int(os.getenv("NCO_LGTBL", "9"))
+OW = int(os.getenv("NCO_OW", "8"))
+DPHASE = 42949673                                   # 0.01 cycles/sample with W=32
+NUM_SAMPLES = int(os.getenv("NCO_SAMPLES", "200"))
+CAPTURE = os.getenv("NCO_CAPTURE")                  # raw binary capture of o_val
+CAPTURE_BLOCK = 4096                                # samples buffered per write
 
 @cocotb.test()
 async def test_nco(dut):
     """Empty testbench that simply prints PASS."""
     await Timer(1, units="ns")  # Wait for a small amount of time
-    dut._log.info("PASS")
\ No newline at end of file
+    dut._log.info("PASS")
+
+@cocotb.test()
+async def test_sintable(dut):
+    """The table the simulation loaded is the quantized sine for LGTBL and OW"""
+    await Timer(1, units="ns")
+    # sintable.v reads sintable.hex from the simulation directory
+    words = [token for token in Path("sintable.hex").read_text().split() if not token.startswith('@')]
+    assert len(words) == 1 << LGTBL, f"sintable.hex has {len(words)} entries, LGTBL={LGTBL} needs {1 << LGTBL}"
+    assert max(int(word, 16) for word in words) < 1 << OW, f"sintable.hex has entries wider than OW={OW}"
+    bad = np.flatnonzero(load_sintable(LGTBL, OW, "sintable.hex") != sintable(LGTBL, OW))
+    assert not len(bad), f"sintable.hex doesn't hold a quantized sine from entry {bad[0]}"
+
+@cocotb.test()
+async def test_nco_model(dut):
+    """o_val against the model for a few phase steps, with i_ce held high"""
+    cocotb.start_soon(Clock(dut.i_clk, 1, units="ns").start())
+    dut.i_reset.value = 1
+    dut.i_ce.value = 0
+    dut.i_ld.value = 0
+    await RisingEdge(dut.i_clk)
+    dut.i_reset.value = 0
+
+    # Inputs change on the falling edge, outputs are read on the next one
+    await FallingEdge(dut.i_clk)
+    for dphase in (DPHASE, 3 * DPHASE + 12345, (1 << 31) - 1, (1 << 32) - DPHASE):
+        dut.i_dphase.value = dphase
+        dut.i_ld.value = 1
+        await FallingEdge(dut.i_clk)
+        dut.i_ld.value = 0
+        # The phase carries on from the last step: take it off the next sample
+        phase = dut.r_phase.value.integer
+        dut.i_ce.value = 1
+        o_val = []
+        for _ in range(NUM_SAMPLES):
+            await FallingEdge(dut.i_clk)
+            o_val.append(dut.o_val.value.integer)
+        dut.i_ce.value = 0
+        await FallingEdge(dut.i_clk)
+
+        samples, _ = nco(dphase, NUM_SAMPLES, LGTBL, OW, phase=phase, table=sintable(LGTBL, OW))
+        bad = [k for k in range(NUM_SAMPLES) if o_val[k] != samples[k]]
+        dut._log.info(f"LGTBL={LGTBL} OW={OW} i_dphase={dphase:#010x}: {NUM_SAMPLES} samples, {len(bad)} mismatches")
+        assert not bad, f"o_val doesn't match the model from sample {bad[0]}: {o_val[bad[0]]} vs {samples[bad[0]]}"
+
+@cocotb.test()
+async def test_nco_capture(dut):
+    """Run the NCO with i_ce held high and stream o_val to NCO_CAPTURE."""
+    if CAPTURE is None:
+        dut._log.info("NCO_CAPTURE not set, skipping capture")
+        return
+
+    cocotb.start_soon(Clock(dut.i_clk, 1, units="ns").start())
+    dut.i_reset.value = 0
+    dut.i_ce.value = 0
+    dut.i_dphase.value = DPHASE
+    dut.i_ld.value = 1
+    await RisingEdge(dut.i_clk)
+    dut.i_ld.value = 0
+    dut.i_ce.value = 1
+
+    block = []
+    with CaptureWriter(CAPTURE, 'u32') as capture:
+        for _ in range(NUM_SAMPLES):
+            await RisingEdge(dut.i_clk)
+            block.append(dut.o_val.value.integer)
+            if len(block) == CAPTURE_BLOCK:
+                capture.write(block)
+                block = []
+        capture.write(block)
+
+    dut._log.info(f"Wrote {capture.num_samples} samples to {CAPTURE}")
@@ -0,0 +1,21 @@
+import sys
+from pathlib import Path
+
+# The repository root holds the shared test tools, nco/python the table generator
+sys.path.insert(0, str(Path(__file__).resolve().parents[5]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / "python"))
+from tools.runner import Bench, main
+from design import write_sintable
+
+
+def sintable_hex(parameters, directory):
+    """A sintable.hex sized for the build, where sintable.v's $readmemh looks for it."""
+    write_sintable(Path(directory) / "sintable.hex", parameters["LGTBL"], parameters["OW"])
+
+
+BENCH = Bench(__file__, "nco", sources=["nco", "sintable"], generate=sintable_hex,
+              builds=[{"LGTBL": 9, "OW": 8}, {"LGTBL": 6, "OW": 4}, {"LGTBL": 12, "OW": 13}, {"LGTBL": 14, "OW": 16}],
+              env_prefix="NCO_")
+
+if __name__ == "__main__":
+    sys.exit(main(BENCH))
@@ -9,7 +9,7 @@ WAVEFORM="dump.vcd"
 
 # oss-cad-suite env
 echo "        [ICARUS] Sourcing OSS CAD Suite environment..."
-source ~/oss-cad-suite/environment
+[ -n "$OSS_CAD_SUITE" ] || source ~/oss-cad-suite/environment
 if [ $? -ne 0 ]; then
     echo "        [ICARUS] Failed to source OSS CAD Suite environment. Exiting script."
     exit 1
@@ -34,8 +34,9 @@ if [ $? -ne 0 ]; then
 fi
 
 # Run the simulation and generate waveform
+# Set NCO_CAPTURE=<file> to also write o_val as a raw binary capture
 echo "        [ICARUS] Running simulation and generating waveform..."
-vvp "$OUTPUT" -lxt2
+vvp "$OUTPUT" -lxt2 ${NCO_CAPTURE:+"+capture=$NCO_CAPTURE"}
 
 # Check if simulation was successful
 if [ $? -ne 0 ]; then
@@ -61,6 +61,12 @@ module testbench; // Testbench module name
     // Declare a memory for the sine lookup table in the testbench
     reg [OW-1:0] sine_lut_tb [0:TABLE_SIZE-1];
 
+    // Optional raw binary capture of o_val (+capture=<file>), one
+    // little-endian 32-bit word per sample, read by nco/scripts/capture.py
+    integer     capture_fd;
+    reg [8*256-1:0] capture_file;
+    reg [31:0]  capture_word;
+
     // Clock generation
     always #((CLK_PERIOD / 2)) i_clk = ~i_clk;
 
@@ -97,6 +103,14 @@ module testbench; // Testbench module name
         // Ensure sintable.hex is correctly formatted (OW bits per line, TABLE_SIZE lines)
         $readmemh("sintable.hex", sine_lut_tb);
 
+        // Open the capture file if one was requested
+        capture_fd = 0;
+        if ($value$plusargs("capture=%s", capture_file)) begin
+            capture_fd = $fopen(capture_file, "wb");
+            if (capture_fd == 0)
+                $display("ERROR: could not open capture file %0s", capture_file);
+        end
+
         // Setup VCD (Value Change Dump) for waveform viewing
         $dumpfile("testbench.vcd");
         $dumpvars(0, testbench); // Dump all signals in the current scope
@@ -156,6 +170,13 @@ module testbench; // Testbench module name
                 //          $time, samples_checked - 1, expected_o_val, expected_o_val, o_val, o_val);
             end
 
+            // "%u" writes the raw 32-bit word, little-endian
+            if (capture_fd != 0) begin
+                capture_word = 0;
+                capture_word[OW-1:0] = o_val;
+                $fwrite(capture_fd, "%u", capture_word);
+            end
+
             // Now, update tb_r_phase to reflect the NCO's phase for the *next* sample.
             // This tb_r_phase will be used to calculate expected_o_val for the *next* iteration.
             tb_r_phase = tb_r_phase + i_dphase;
@@ -179,6 +200,9 @@ module testbench; // Testbench module name
         end
         $display("====================================================================================================\n");
 
+        if (capture_fd != 0)
+            $fclose(capture_fd);
+
         // End simulation
         $finish;
     end
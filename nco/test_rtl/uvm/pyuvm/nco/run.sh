@@ -8,11 +8,13 @@
         exit 1
     fi
 
-    # Copy original rtl here
+    # Copy original rtl here, sintable.v loads sintable.hex from the run directory
     cp ${PWD}/../../../../rtl/nco.v .
+    cp ${PWD}/../../../../rtl/sintable.v .
+    cp ${PWD}/../../../../rtl/sintable.hex .
 
     # Build pyUVM
     make SIM=icarus
 
     # Remove testbench
-    rm nco.v
\ No newline at end of file
+    rm nco.v sintable.v sintable.hex
\ No newline at end of file
@@ -1,115 +1,287 @@
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
 import cocotb
 from cocotb.clock import Clock
-from cocotb.triggers import RisingEdge, FallingEdge, ClockCycles
+from cocotb.triggers import RisingEdge, ClockCycles
 from pyuvm import *
-import random
 
-class DataTransaction(uvm_sequence_item):
-    def __init__(self, name="data_tr"):
+# nco/python holds the vectorized NCO model
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / "python"))
+from design import load_sintable, nco
+
+LGTBL = 9   # must match nco.v
+W = 32      # must match nco.v
+OW = 8      # must match nco.v
+NUM_SAMPLES = int(os.getenv("NCO_UVM_SAMPLES", str(10**6)))  # enabled cycles in the long run
+BATCH = 4096       # samples per monitor batch
+RUN_CHUNK = 65536  # clocks per run item, bounds the size of each item
+SEED = int(os.getenv("NCO_UVM_SEED", "1"))
+
+#
+# Sequence items
+#
+class NcoLoadItem(uvm_sequence_item):
+    """Pulse i_ld with a new phase step, optionally with i_ce high."""
+    def __init__(self, name="load_item", dphase=0, ce=False):
         super().__init__(name)
-        self.data = 0
-        self.result = None
+        self.dphase = dphase
+        self.ce = ce
 
-    def randomize(self):
-        self.data = random.randint(0, 255)
+    def __str__(self):
+        return f"{self.get_name()} : dphase: 0x{self.dphase:08x} ce: {int(self.ce)}"
 
-    def __eq__(self, other):
-        return self.data == other.data
+class NcoRunItem(uvm_sequence_item):
+    """Drive i_ce with a per-clock enable pattern."""
+    def __init__(self, name="run_item", ce=None):
+        super().__init__(name)
+        self.ce = np.ones(0, dtype=bool) if ce is None else ce
 
     def __str__(self):
-        return f"{self.get_name()} : Data: 0x{self.data:02x}"
+        return f"{self.get_name()} : {len(self.ce)} clocks, {int(self.ce.sum())} enabled"
+
+#
+# Sequence library
+#
+def to_dphase(frequency):
+    """Phase step for a frequency relative to the sample rate."""
+    return int(frequency * 2**W) & (2**W - 1)
+
+class NcoLoadSeq(uvm_sequence):
+    """Load one phase step."""
+    def __init__(self, name="load_seq", dphase=0, ce=False):
+        super().__init__(name)
+        self.dphase = dphase
+        self.ce = ce
+
+    async def body(self):
+        item = NcoLoadItem("load_item", self.dphase, self.ce)
+        await self.start_item(item)
+        await self.finish_item(item)
+
+class NcoRunSeq(uvm_sequence):
+    """Run for num_cycles clocks with i_ce high with probability density."""
+    def __init__(self, name="run_seq", num_cycles=0, density=1.0, rng=None):
+        super().__init__(name)
+        self.num_cycles = num_cycles
+        self.density = density
+        self.rng = rng or np.random.default_rng(SEED)
+
+    async def body(self):
+        for first in range(0, self.num_cycles, RUN_CHUNK):
+            n = min(RUN_CHUNK, self.num_cycles - first)
+            if self.density >= 1.0:
+                ce = np.ones(n, dtype=bool)
+            else:
+                ce = self.rng.random(n) < self.density
+            item = NcoRunItem("run_item", ce)
+            await self.start_item(item)
+            await self.finish_item(item)
+
+class NcoFrequencySweepSeq(uvm_sequence):
+    """Step through a list of frequencies, running each at full rate."""
+    def __init__(self, name="frequency_sweep_seq", frequencies=(), cycles_per_frequency=2048):
+        super().__init__(name)
+        self.frequencies = frequencies
+        self.cycles_per_frequency = cycles_per_frequency
+
+    async def body(self):
+        for f in self.frequencies:
+            await NcoLoadSeq("load_seq", to_dphase(f)).start(self.sequencer)
+            await NcoRunSeq("run_seq", self.cycles_per_frequency).start(self.sequencer)
+
+class NcoRandomRetuneSeq(uvm_sequence):
+    """Random phase steps, enable densities and load/enable overlaps."""
+    def __init__(self, name="random_retune_seq", num_loads=64, max_cycles=4096):
+        super().__init__(name)
+        self.num_loads = num_loads
+        self.max_cycles = max_cycles
+
+    async def body(self):
+        rng = np.random.default_rng(SEED + 1)
+        for _ in range(self.num_loads):
+            dphase = int(rng.integers(0, 2**W))
+            await NcoLoadSeq("load_seq", dphase, ce=bool(rng.integers(0, 2))).start(self.sequencer)
+            await NcoRunSeq("run_seq", int(rng.integers(1, self.max_cycles)),
+                            float(rng.choice([1.0, 0.5, 0.1])), rng).start(self.sequencer)
 
+class NcoLongRunSeq(uvm_sequence):
+    """A single frequency for num_samples enabled clocks."""
+    def __init__(self, name="long_run_seq", num_samples=NUM_SAMPLES, frequency=0.01):
+        super().__init__(name)
+        self.num_samples = num_samples
+        self.frequency = frequency
+
+    async def body(self):
+        await NcoLoadSeq("load_seq", to_dphase(self.frequency)).start(self.sequencer)
+        await NcoRunSeq("run_seq", self.num_samples).start(self.sequencer)
+
+class NcoRegressionSeq(uvm_sequence):
+    """Every sequence of the library, one after the other."""
+    async def body(self):
+        await NcoFrequencySweepSeq("frequency_sweep_seq",
+                                   (0.0, 0.001, 0.01, 0.1, 0.25, 0.5, 0.75, 0.999)).start(self.sequencer)
+        await NcoRandomRetuneSeq("random_retune_seq").start(self.sequencer)
+        await NcoLongRunSeq("long_run_seq").start(self.sequencer)
+
+#
+# Agent
+#
 class ncoDriver(uvm_driver):
     def start_of_simulation_phase(self):
         self.dut = cocotb.top
-        
+
     async def run_phase(self):
+        dut = self.dut
         while True:
             item = await self.seq_item_port.get_next_item()
-            self.dut.i_data.value = item.data
-            await RisingEdge(self.dut.i_clk)  # Wait for clock edge
-            await FallingEdge(self.dut.i_clk)  # Wait for output to stabilize
-            item.result = int(self.dut.o_data.value)
+            if isinstance(item, NcoLoadItem):
+                dut.i_dphase.value = item.dphase
+                dut.i_ld.value = 1
+                dut.i_ce.value = int(item.ce)
+                await RisingEdge(dut.i_clk)
+                dut.i_ld.value = 0
+                dut.i_ce.value = 0
+            else:
+                # Only write i_ce when it changes
+                ce = 0
+                for enable in item.ce.tolist():
+                    if enable != ce:
+                        ce = enable
+                        dut.i_ce.value = int(ce)
+                    await RisingEdge(dut.i_clk)
+                dut.i_ce.value = 0
             self.seq_item_port.item_done()
 
+class NcoBatch:
+    """Consecutive o_val samples produced with the same phase step."""
+    def __init__(self, dphase, samples):
+        self.dphase = dphase
+        self.samples = samples
+
 class ncoMonitor(uvm_monitor):
+    """
+    Samples o_val on the clock after every enabled clock and publishes the
+    samples as NcoBatch arrays. A batch closes when it is full or when a
+    new phase step is loaded.
+    """
     def build_phase(self):
         self.ap = uvm_analysis_port("ap", self)
-        
+        self.dphase = 0
+        self.samples = np.empty(BATCH, dtype=np.int64)
+        self.count = 0
+
+    def flush(self):
+        if self.count:
+            self.ap.write(NcoBatch(self.dphase, self.samples[:self.count].copy()))
+            self.count = 0
+
     async def run_phase(self):
         dut = cocotb.top
+        prev_ce = False
+        new_dphase = None
         while True:
+            # Values read at the edge are the ones the edge samples, o_val
+            # being the result of the previous edge
             await RisingEdge(dut.i_clk)
-            if dut.i_reset_n.value:
-                tr = DataTransaction()
-                tr.data = int(dut.i_data.value)
-                await FallingEdge(dut.i_clk)  # Sample output after clock edge
-                tr.result = int(dut.o_data.value)
-                self.ap.write(tr)
+            if prev_ce:
+                self.samples[self.count] = dut.o_val.value.integer
+                self.count += 1
+                if self.count == BATCH:
+                    self.flush()
+            if new_dphase is not None:
+                # r_step changed on the previous edge, after its own sample
+                self.flush()
+                self.dphase = new_dphase
+                new_dphase = None
+
+            prev_ce = bool(dut.i_ce.value)
+            if prev_ce and dut.i_reset.value:
+                self.logger.error("i_ce asserted during i_reset, samples will be lost")
+            if dut.i_ld.value:
+                new_dphase = dut.i_dphase.value.integer
 
 class ncoAgent(uvm_agent):
     def build_phase(self):
         self.monitor = ncoMonitor.create("monitor", self)
         self.driver = ncoDriver.create("driver", self)
         self.sequencer = uvm_sequencer("sequencer", self)
-        
+
     def connect_phase(self):
         self.driver.seq_item_port.connect(self.sequencer.seq_item_export)
 
-class ncoScoreboard(uvm_scoreboard):
+#
+# Scoreboard
+#
+class ncoScoreboard(uvm_subscriber):
+    """
+    Checks each batch against the vectorized model as soon as it arrives,
+    so memory stays bounded by one batch however long the run is.
+    """
     def build_phase(self):
-        self.fifo = uvm_tlm_analysis_fifo("fifo", self)
-        self.analysis_export = self.fifo.analysis_export
-        
+        self.table = load_sintable(LGTBL, OW)
+        self.phase = 0
+        self.samples_checked = 0
+        self.mismatches = 0
+
+    def write(self, batch):
+        expected, next_phase = nco(batch.dphase, len(batch.samples), LGTBL, OW, W,
+                                   self.phase, self.table)
+        bad = np.flatnonzero(batch.samples != expected)
+        if len(bad):
+            first = bad[0]
+            self.logger.error(f"{len(bad)} mismatches in batch at sample {self.samples_checked}, first at "
+                              f"sample {self.samples_checked + first}: dut {batch.samples[first]} "
+                              f"model {expected[first]} (dphase 0x{batch.dphase:08x})")
+            self.mismatches += len(bad)
+        self.phase = int(next_phase)
+        self.samples_checked += len(batch.samples)
+
     def check_phase(self):
-        while self.fifo.can_get():
-            _, tr = self.fifo.try_get()
-            if tr.data != tr.result:
-                self.logger.error(f"Data mismatch! Input: 0x{tr.data:02x}, Output: 0x{tr.result:02x}")
-                assert False, "Output does not match input"
-            else:
-                self.logger.info(f"Match! Input: 0x{tr.data:02x}, Output: 0x{tr.result:02x}")
+        assert self.samples_checked > 0, "No samples were checked"
+        assert self.mismatches == 0, f"{self.mismatches} samples do not match the model"
+
+    def report_phase(self):
+        self.logger.info(f"{self.samples_checked} samples checked, {self.mismatches} mismatches")
 
 class ncoEnv(uvm_env):
     def build_phase(self):
         self.agent = ncoAgent.create("agent", self)
         self.scoreboard = ncoScoreboard.create("scoreboard", self)
-        
+
     def connect_phase(self):
         self.agent.monitor.ap.connect(self.scoreboard.analysis_export)
 
-class RandomSequence(uvm_sequence):
-    async def body(self):
-        for _ in range(10):
-            tr = DataTransaction()
-            await self.start_item(tr)
-            tr.randomize()
-            await self.finish_item(tr)
-
 class ncoTest(uvm_test):
     def build_phase(self):
         self.env = ncoEnv.create("env", self)
-        
+
     async def run_phase(self):
         self.raise_objection()
         dut = cocotb.top
-        
+
         # Initialize clock and reset
         cocotb.start_soon(Clock(dut.i_clk, 10, "ns").start())
-        dut.i_reset_n.value = 0
-        dut.i_data.value = 0
+        dut.i_reset.value = 1
+        dut.i_ld.value = 0
+        dut.i_dphase.value = 0
+        dut.i_ce.value = 0
         await ClockCycles(dut.i_clk, 5)
-        dut.i_reset_n.value = 1
+        dut.i_reset.value = 0
         await ClockCycles(dut.i_clk, 2)  # Wait 2 cycles after reset
-        
+
         # Run test
-        seq = RandomSequence("random_seq")
+        seq = NcoRegressionSeq("regression_seq")
         await seq.start(self.env.agent.sequencer)
-        
-        # Wait for completion
-        await ClockCycles(dut.i_clk, 10)
+
+        # Let the last sample reach the monitor, then hand over the partial batch
+        await ClockCycles(dut.i_clk, 3)
+        self.env.agent.monitor.flush()
         self.drop_objection()
 
 @cocotb.test()
 async def run_test(dut):
-    await uvm_root().run_test("ncoTest")
\ No newline at end of file
+    await uvm_root().run_test("ncoTest")
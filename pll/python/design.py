@@ -0,0 +1,365 @@
+import numpy as np
+
+# o_err encodings, as driven by pll.v
+ERR_NONE = 0b00
+ERR_LAG = 0b01      # input leads the counter, the counter speeds up
+ERR_LEAD = 0b11     # counter leads the input, the counter slows down
+
+# o_dbg, the boxcar over o_err that pll.v instantiates under Verilator
+DBG_NAVG = 0xeff    # samples summed, i_navg of the boxcar
+DBG_WIDTH = 14      # o_dbg width, IW + LGMEM
+
+
+def loop_corrections(i_lgcoeff, phase_bits=32):
+    """
+    phase_correction and freq_correction as registered from i_lgcoeff.
+
+    Returns:
+        A tuple (phase_correction, freq_correction) of uint64 arrays,
+        2^(phase_bits-1) >> i_lgcoeff and 2^(phase_bits-3) >> 2*i_lgcoeff.
+    """
+    i_lgcoeff = np.asarray(i_lgcoeff, dtype=np.uint64)
+    msb = np.uint64(phase_bits - 1)
+    phase_correction = (np.uint64(1) << msb) >> i_lgcoeff
+    # Shifting by the full width or more gives zero, as in Verilog
+    freq_correction = (np.uint64(1) << (msb - np.uint64(2))) >> np.minimum(np.uint64(2) * i_lgcoeff, np.uint64(63))
+
+    return phase_correction, freq_correction
+
+
+class PLL:
+    """
+    Cycle-accurate model of pll.v, vectorized over independent instances.
+
+    Every register of the RTL is a numpy array with one entry per instance,
+    and step() advances all of them by one i_clk edge at once. Inputs may be
+    scalars (shared by every instance) or arrays (one value per instance),
+    so a single object can run a whole grid of (lgcoeff, input frequency,
+    jitter) combinations in lockstep.
+
+    The model follows the RTL to the bit, including the one clock delay
+    between i_lgcoeff and phase_correction/freq_correction, the
+    OPT_GLITCHLESS hold and the OPT_TRACK_FREQUENCY step updates.
+    """
+    def __init__(self, num_instances, phase_bits=32, opt_track_frequency=True,
+                 initial_phase_step=0, opt_glitchless=True):
+        if not 3 <= phase_bits <= 64:
+            raise ValueError("phase_bits must be between 3 and 64.")
+
+        self.num_instances = num_instances
+        self.phase_bits = phase_bits
+        self.opt_track_frequency = opt_track_frequency
+        self.opt_glitchless = opt_glitchless
+
+        self._mask = np.uint64((1 << phase_bits) - 1)
+        self._msb = np.uint64(phase_bits - 1)
+
+        # Registers, with the values of their initial statements
+        self.agreed_output = np.zeros(num_instances, dtype=bool)
+        self.ctr = np.zeros(num_instances, dtype=np.uint64)
+        self.phase_correction = np.zeros(num_instances, dtype=np.uint64)
+        self.freq_correction = np.zeros(num_instances, dtype=np.uint64)
+        self.r_step = np.full(num_instances, initial_phase_step, dtype=np.uint64) & self._mask
+        self.o_err = np.zeros(num_instances, dtype=np.uint8)
+
+    @property
+    def o_phase(self):
+        return self.ctr
+
+    def settle(self, i_lgcoeff):
+        """
+        Sets phase_correction/freq_correction as if i_lgcoeff had been
+        applied for a clock already, without advancing anything else.
+        """
+        self.phase_correction, self.freq_correction = loop_corrections(
+            np.broadcast_to(np.asarray(i_lgcoeff, dtype=np.uint64), self.num_instances), self.phase_bits)
+
+    def step(self, i_input, i_lgcoeff, i_ce=True, i_ld=False, i_step=0):
+        """
+        Advances every instance by one clock.
+
+        Args:
+            i_input: Incoming clock bit(s).
+            i_lgcoeff: Log2 of the loop coefficient, 0..31.
+            i_ce: Clock enable(s).
+            i_ld: Load strobe(s) for i_step.
+            i_step: Phase step(s) to load, phase_bits-1 wide.
+
+        Returns:
+            A tuple (o_phase, o_err) of the register values after the edge.
+        """
+        n = self.num_instances
+        i_input = np.broadcast_to(np.asarray(i_input, dtype=bool), n)
+        i_ce = np.broadcast_to(np.asarray(i_ce, dtype=bool), n)
+        i_ld = np.broadcast_to(np.asarray(i_ld, dtype=bool), n)
+        i_lgcoeff = np.broadcast_to(np.asarray(i_lgcoeff, dtype=np.uint64), n)
+
+        ctr, r_step = self.ctr, self.r_step
+        pc, fc = self.phase_correction, self.freq_correction
+        mask = self._mask
+
+        # Combinational logic, from the values before the edge
+        ctr_msb = (ctr >> self._msb).astype(bool)
+        phase_err = ctr_msb != i_input
+        lead = np.where(self.agreed_output, ~ctr_msb & i_input, ctr_msb & ~i_input)
+
+        # agreed_output
+        agreed = np.where(i_input & ctr_msb, True,
+                          np.where(~i_input & ~ctr_msb, False, self.agreed_output))
+        self.agreed_output = np.where(i_ce, agreed, self.agreed_output)
+
+        # ctr: step, step - correction (unless that would glitch), or
+        # step + correction
+        if self.opt_glitchless:
+            slow_ok = r_step > pc
+        else:
+            slow_ok = True
+        next_ctr = np.where(~phase_err, ctr + r_step,
+                   np.where(lead, np.where(slow_ok, ctr + r_step - pc, ctr),
+                            ctr + r_step + pc)) & mask
+        self.ctr = np.where(i_ce, next_ctr, ctr)
+
+        # o_err
+        err = np.where(~phase_err, ERR_NONE, np.where(lead, ERR_LEAD, ERR_LAG)).astype(np.uint8)
+        self.o_err = np.where(i_ce, err, self.o_err)
+
+        # r_step, frequency tracking
+        if self.opt_track_frequency:
+            tracked = np.where(lead, r_step - fc, r_step + fc) & mask
+            r_step = np.where(i_ce & phase_err, tracked, r_step)
+        loaded = np.asarray(i_step, dtype=np.uint64) & (mask >> np.uint64(1))
+        self.r_step = np.where(i_ld, loaded, r_step)
+
+        # Loop coefficients, registered from i_lgcoeff
+        self.phase_correction, self.freq_correction = loop_corrections(i_lgcoeff, self.phase_bits)
+
+        return self.ctr, self.o_err
+
+    def run(self, i_input, i_lgcoeff, i_ce=True, record_phase=True):
+        """
+        Runs every instance over a block of clocks.
+
+        Args:
+            i_input: Boolean array of shape (num_clocks, num_instances).
+            i_lgcoeff: Log2 loop coefficient(s), held for the whole block.
+            i_ce: Clock enable(s), scalar, per instance or per clock and
+                instance.
+            record_phase: Also return the o_phase trace.
+
+        Returns:
+            A tuple (o_phase, o_err) of (num_clocks, num_instances) traces,
+            o_phase being None when record_phase is False. The state is
+            kept, so consecutive blocks continue the same run.
+        """
+        num_clocks = len(i_input)
+        i_ce = np.asarray(i_ce, dtype=bool)
+        per_clock_ce = i_ce.ndim == 2
+
+        o_phase = np.empty((num_clocks, self.num_instances), dtype=np.uint64) if record_phase else None
+        o_err = np.empty((num_clocks, self.num_instances), dtype=np.uint8)
+        for k in range(num_clocks):
+            phase, err = self.step(i_input[k], i_lgcoeff, i_ce[k] if per_clock_ce else i_ce)
+            if record_phase:
+                o_phase[k] = phase
+            o_err[k] = err
+
+        return o_phase, o_err
+
+
+def err_sign(o_err):
+    """Maps o_err codes to -1 (counter leads), 0 or +1 (counter lags)."""
+    o_err = np.asarray(o_err)
+    return np.where(o_err == ERR_LEAD, -1, np.where(o_err == ERR_LAG, 1, 0)).astype(np.int8)
+
+
+def dbg_trace(o_err, navg=DBG_NAVG, width=DBG_WIDTH):
+    """
+    o_dbg as pll.v drives it under Verilator, from an o_err trace.
+
+    The boxcar takes o_err in on every i_ce, i.e. the value from the
+    previous enabled clock, and its sum follows one clock later, so o_dbg
+    after clock j sums o_err from clocks j-navg-1 to j-2.
+
+    Args:
+        o_err: o_err after each clock, i_ce high on every clock from
+            power-up (o_err starting at 0).
+        navg: Boxcar length.
+        width: o_dbg width.
+
+    Returns:
+        A uint64 array of raw o_dbg values, one per clock.
+    """
+    sample = np.concatenate([[0], err_sign(o_err)[:-1]]).astype(np.int64)
+    total = np.concatenate([[0], np.cumsum(sample)])
+    j = np.arange(len(sample))
+    o_dbg = total[j] - total[np.maximum(j - navg, 0)]
+
+    return o_dbg.astype(np.uint64) & np.uint64((1 << width) - 1)
+
+
+def decode_dbg(o_dbg, width=DBG_WIDTH):
+    """Raw o_dbg values to signed sums of err_sign(o_err)."""
+    o_dbg = np.asarray(o_dbg, dtype=np.int64)
+    return np.where(o_dbg >= 1 << (width - 1), o_dbg - (1 << width), o_dbg)
+
+
+class DbgLockDetector:
+    """
+    Running lock-quality metric from o_dbg.
+
+    The metric is the bias |o_dbg| / navg: the net fraction of clocks over
+    the boxcar window on which the loop had to push the counter the same
+    way. Locked, leads and lags balance out and the bias stays near zero;
+    while pulling in, or slipping cycles, one sign dominates.
+
+    Lock is declared once the window has filled and the bias has then
+    stayed at or below the threshold for 'hold' consecutive clocks.
+    """
+    def __init__(self, navg=DBG_NAVG, threshold=0.05, hold=4096, width=DBG_WIDTH):
+        self.navg = navg
+        self.threshold = threshold
+        self.hold = hold
+        self.width = width
+
+        self.clocks = 0
+        self.bias = np.nan
+        self.lock_time = None   # clock at which the final good run started
+        self._good_since = None
+
+    @property
+    def locked(self):
+        return self.lock_time is not None
+
+    def update(self, o_dbg):
+        """
+        Adds a batch of consecutive raw o_dbg samples.
+
+        Returns:
+            The bias of every sample in the batch.
+        """
+        bias = np.abs(decode_dbg(o_dbg, self.width)) / self.navg
+        clock = self.clocks + np.arange(len(bias))
+        good = (bias <= self.threshold) & (clock > self.navg)
+        self.clocks += len(bias)
+        if not len(bias):
+            return bias
+        self.bias = bias[-1]
+
+        # Start of the run of good samples the batch ends with
+        bad = np.flatnonzero(~good)
+        if len(bad):
+            self._good_since = None if bad[-1] == len(bias) - 1 else int(clock[bad[-1]]) + 1
+        elif self._good_since is None:
+            self._good_since = int(clock[0])
+
+        if self.lock_time is None and self._good_since is not None \
+                and self.clocks - self._good_since >= self.hold:
+            self.lock_time = self._good_since
+
+        return bias
+
+
+def input_clock(frequency, num_clocks, jitter=0.0, phase=0.0, rng=None):
+    """
+    Square-wave i_input samples for one or more reference clocks.
+
+    Args:
+        frequency: Input frequency(ies) in cycles per i_clk (i_ce) cycle.
+        num_clocks: Number of clocks to generate.
+        jitter: RMS phase jitter(s), in cycles of the input clock, added as
+            independent Gaussian noise on every sample.
+        phase: Starting phase(s), in cycles.
+        rng: numpy Generator for the jitter.
+
+    Returns:
+        A tuple (i_input, next_phase): a boolean array of shape
+        (num_clocks,) + broadcast shape of the arguments, high during the
+        second half of each input cycle like the counter MSB, and the
+        jitter-free phase to continue from in the next block.
+    """
+    frequency, jitter, phase = np.broadcast_arrays(np.asarray(frequency, dtype=float),
+                                                   np.asarray(jitter, dtype=float),
+                                                   np.asarray(phase, dtype=float))
+    k = np.arange(num_clocks).reshape((-1,) + (1,) * frequency.ndim)
+    cycles = phase + k * frequency
+    if np.any(jitter > 0):
+        rng = rng or np.random.default_rng()
+        cycles = cycles + jitter * rng.standard_normal(cycles.shape)
+    next_phase = np.mod(phase + num_clocks * frequency, 1.0)
+
+    return np.mod(cycles, 1.0) >= 0.5, next_phase
+
+
+def sweep(lgcoeffs, frequencies, jitters, num_clocks, phase_bits=32, initial_step=None,
+          opt_track_frequency=True, opt_glitchless=True, block=4096, seed=None, record_phase=True):
+    """
+    Runs one PLL instance per (lgcoeff, frequency, jitter) combination.
+
+    Args:
+        lgcoeffs, frequencies, jitters: Values to combine; frequencies in
+            input cycles per clock, jitters in RMS input cycles.
+        num_clocks: Number of clocks to run.
+        phase_bits: PHASE_BITS of the modelled core.
+        initial_step: Phase step loaded before the run (INITIAL_PHASE_STEP);
+            defaults to the nominal step of each instance's frequency.
+        block: Clocks of input generated at a time.
+        seed: Seed for the jitter.
+        record_phase: Also return the o_phase traces.
+
+    Returns:
+        A dict with the flattened grid ('lgcoeff', 'frequency', 'jitter',
+        one entry per instance) and the 'o_phase' and 'o_err' traces of
+        shape (num_clocks, num_instances).
+    """
+    lg, freq, jit = (a.ravel() for a in np.meshgrid(np.asarray(lgcoeffs), np.asarray(frequencies, dtype=float),
+                                                    np.asarray(jitters, dtype=float), indexing='ij'))
+    n = len(lg)
+
+    if initial_step is None:
+        initial_step = np.round(freq * 2.0**phase_bits).astype(np.uint64)
+    pll = PLL(n, phase_bits, opt_track_frequency, 0, opt_glitchless)
+    pll.r_step[:] = initial_step
+    pll.r_step &= np.uint64((1 << phase_bits) - 1)
+
+    # The coefficients only reach phase_correction one clock after
+    # i_lgcoeff, as in the RTL, so settle them before the reference starts.
+    pll.settle(lg)
+
+    rng = np.random.default_rng(seed)
+    o_phase = np.empty((num_clocks, n), dtype=np.uint64) if record_phase else None
+    o_err = np.empty((num_clocks, n), dtype=np.uint8)
+    phase = np.zeros(n)
+    for first in range(0, num_clocks, block):
+        count = min(block, num_clocks - first)
+        i_input, phase = input_clock(freq, count, jit, phase, rng)
+        ph, err = pll.run(i_input, lg, record_phase=record_phase)
+        if record_phase:
+            o_phase[first:first + count] = ph
+        o_err[first:first + count] = err
+
+    return {'lgcoeff': lg, 'frequency': freq, 'jitter': jit, 'o_phase': o_phase, 'o_err': o_err}
+
+
+def main():
+    import matplotlib.pyplot as plt
+
+    num_clocks = 20000
+    result = sweep(lgcoeffs=[4, 6, 8], frequencies=[0.01], jitters=[0.0], num_clocks=num_clocks,
+                   initial_step=int(0.0099 * 2**32), seed=1)
+
+    fig, (ax1, ax2) = plt.subplots(2, 1, sharex=True, figsize=(12, 6))
+    for i, lg in enumerate(result['lgcoeff']):
+        err = err_sign(result['o_err'][:, i]).astype(float)
+        ax1.plot(np.convolve(err, np.ones(256) / 256, 'same'), label=f'i_lgcoeff = {lg}')
+        ax2.plot(result['o_phase'][:, i] / 2.0**32, label=f'i_lgcoeff = {lg}')
+    ax1.set_ylabel('o_err (256-clock average)')
+    ax1.set_title('PLL model: 1% frequency offset, no jitter')
+    ax1.legend()
+    ax2.set_ylabel('o_phase (cycles)')
+    ax2.set_xlabel('Clock')
+    plt.tight_layout()
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
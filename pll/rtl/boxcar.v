@@ -0,0 +1,138 @@
+// =============================================================================
+// File        : boxcar.v
+// Author      : @fjpolo
+// email       : fjpolo@gmail.com
+// Description : Running (boxcar) sum of the last i_navg samples, as used by
+//               pll.v to filter o_err into o_dbg under Verilator. The
+//               samples live in a 2^LGMEM entry memory read one clock
+//               ahead of the sum, so it maps onto block RAM.
+// License     : MIT License
+//
+// Copyright (c) 2025 | @fjpolo
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in all
+// copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+// =============================================================================
+
+`default_nettype none
+`timescale 1ps/1ps
+
+module	boxcar(i_clk, i_reset, i_navg, i_ce, i_sample, o_result);
+	parameter		IW = 16,	// Input sample width
+				LGMEM = 6;	// Log, base two, of the memory size
+	parameter		OW = IW+LGMEM;	// Output width
+	parameter	[0:0]	OPT_SIGNED = 1'b1;
+	parameter	[0:0]	OPT_FIXED = 1'b0;
+	parameter	[LGMEM-1:0]	FIXED_NAVG = -1;
+	//
+	input	wire			i_clk, i_reset;
+	//
+	// Number of samples averaged, 1..2^LGMEM-1, or 0 for all 2^LGMEM of
+	// them.  Ignored when OPT_FIXED is set.  Changing it restarts the sum.
+	input	wire	[LGMEM-1:0]	i_navg;
+	//
+	input	wire			i_ce;
+	input	wire	[IW-1:0]	i_sample;
+	// Sum of the last navg samples, two clocks after the i_ce that
+	// brought the newest of them in
+	output	reg	[OW-1:0]	o_result;
+
+	integer	k;
+
+	wire	[LGMEM-1:0]	navg;
+	wire	[LGMEM:0]	window;
+
+	assign	navg = (OPT_FIXED) ? FIXED_NAVG : i_navg;
+	assign	window = (navg == 0) ? { 1'b1, {(LGMEM){1'b0}} } : { 1'b0, navg };
+
+	// Sample memory
+	reg	[IW-1:0]	mem	[0:(1<<LGMEM)-1];
+	reg	[LGMEM-1:0]	wraddr;
+
+	initial	for(k=0; k<(1<<LGMEM); k=k+1)
+		mem[k] = 0;
+	always @(posedge i_clk)
+	if (i_ce)
+		mem[wraddr] <= i_sample;
+
+	initial	wraddr = 0;
+	always @(posedge i_clk)
+	if (i_reset)
+		wraddr <= 0;
+	else if (i_ce)
+		wraddr <= wraddr + 1'b1;
+
+	// Samples written since the reset or the last change of navg,
+	// saturating at the window length.  Until the window is full, nothing
+	// leaves the sum.
+	reg	[LGMEM-1:0]	last_navg;
+	reg	[LGMEM:0]	fill;
+	wire			primed;
+
+	initial	last_navg = 0;
+	always @(posedge i_clk)
+		last_navg <= navg;
+
+	initial	fill = 0;
+	always @(posedge i_clk)
+	if ((i_reset)||(navg != last_navg))
+		fill <= 0;
+	else if ((i_ce)&&(!primed))
+		fill <= fill + 1'b1;
+
+	assign	primed = (fill >= window);
+
+	// First stage: the sample entering the window, and the one leaving it
+	reg			r_ce;
+	reg	[IW-1:0]	r_sample, r_leaving;
+
+	initial	r_ce = 1'b0;
+	always @(posedge i_clk)
+	if (i_reset)
+		r_ce <= 1'b0;
+	else
+		r_ce <= i_ce;
+
+	initial	r_sample  = 0;
+	initial	r_leaving = 0;
+	always @(posedge i_clk)
+	if (i_ce)
+	begin
+		r_sample  <= i_sample;
+		// Read before the write above: with navg == 0 this is the
+		// sample 2^LGMEM writes ago
+		if ((primed)&&(navg == last_navg))
+			r_leaving <= mem[wraddr - navg];
+		else
+			r_leaving <= 0;
+	end
+
+	// Second stage: the running sum
+	wire	[OW-1:0]	w_sample, w_leaving;
+
+	assign	w_sample  = { {(OW-IW){OPT_SIGNED && r_sample[IW-1]}},  r_sample };
+	assign	w_leaving = { {(OW-IW){OPT_SIGNED && r_leaving[IW-1]}}, r_leaving };
+
+	initial	o_result = 0;
+	always @(posedge i_clk)
+	if ((i_reset)||(navg != last_navg))
+		o_result <= 0;
+	else if (r_ce)
+		o_result <= o_result + w_sample - w_leaving;
+
+endmodule
@@ -0,0 +1,266 @@
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# pll/python holds the batched PLL model
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "python"))
+from design import PLL, err_sign, input_clock
+
+
+class LockMetrics:
+    """
+    Streaming lock, phase error and cycle-slip statistics for a batch of
+    PLL instances.
+
+    Traces are reduced to per-window figures as they arrive, so the memory
+    used does not depend on the run length:
+      - error density: the fraction of clocks with a non-zero o_err. The
+        counter MSB and the input disagree for about twice the phase error
+        (in cycles) per cycle, so a density of 0.1 is ~0.05 cycles of error.
+      - phase error: o_phase against the jitter-free reference phase,
+        wrapped to [-0.5, 0.5) cycles, and its unwrapped running value.
+
+    A run is locked from the start of the first window after which every
+    window's error density stays at or below the threshold, provided that
+    covers at least 'hold' windows at the end of the run.
+    """
+    def __init__(self, num_instances, window=1024, threshold=0.1, phase_bits=32, hold=4):
+        self.num_instances = num_instances
+        self.window = window
+        self.threshold = threshold
+        self.hold = hold
+        self.phase_scale = 2.0**-phase_bits
+
+        self._density = []
+        self._err_mean = []
+        self._err_msq = []
+        self._unwrapped = []
+
+        # Partial window carried between updates
+        self._pending_err = np.empty((0, num_instances), dtype=np.int8)
+        self._pending_phase = np.empty((0, num_instances))
+
+        # Unwrapping state
+        self._last_wrapped = np.zeros(num_instances)
+        self._last_unwrapped = np.zeros(num_instances)
+
+    def update(self, o_phase, o_err, ref_phase):
+        """
+        Adds a block of traces.
+
+        Args:
+            o_phase, o_err: (num_clocks, num_instances) model or RTL traces.
+            ref_phase: Jitter-free reference phase, in cycles, for every
+                clock, broadcastable to o_phase.
+        """
+        phase_err = o_phase * self.phase_scale - ref_phase
+        phase_err = np.mod(phase_err + 0.5, 1.0) - 0.5
+
+        # Unwrap across the block boundary
+        steps = np.diff(np.concatenate([self._last_wrapped[None], phase_err]), axis=0)
+        steps = np.mod(steps + 0.5, 1.0) - 0.5
+        unwrapped = self._last_unwrapped + np.cumsum(steps, axis=0)
+        self._last_wrapped = phase_err[-1]
+        self._last_unwrapped = unwrapped[-1]
+
+        err = np.concatenate([self._pending_err, np.abs(err_sign(o_err))])
+        phase = np.concatenate([self._pending_phase, unwrapped])
+        num_windows = len(err) // self.window
+        if num_windows:
+            shape = (num_windows, self.window, self.num_instances)
+            err_w = err[:num_windows * self.window].reshape(shape)
+            phase_w = phase[:num_windows * self.window].reshape(shape)
+            wrapped_w = np.mod(phase_w + 0.5, 1.0) - 0.5
+
+            self._density.append(err_w.mean(axis=1))
+            self._err_mean.append(wrapped_w.mean(axis=1))
+            self._err_msq.append((wrapped_w**2).mean(axis=1))
+            self._unwrapped.append(phase_w.mean(axis=1))
+        self._pending_err = err[num_windows * self.window:]
+        self._pending_phase = phase[num_windows * self.window:]
+
+    def results(self):
+        """
+        Returns:
+            A dict of per-instance arrays:
+              'locked': True when the run ends locked,
+              'lock_time': clocks to lock (NaN when not locked),
+              'phase_err_mean'/'phase_err_rms': steady-state phase error in
+                  cycles, over the locked part of the run,
+              'slips': cycle slips over the locked part (the whole run
+                  when not locked),
+              'slip_rate': slips per million clocks over the same part.
+        """
+        n = self.num_instances
+        nan = np.full(n, np.nan)
+        if not self._density:
+            return {'locked': np.zeros(n, dtype=bool), 'lock_time': nan, 'phase_err_mean': nan,
+                    'phase_err_rms': nan, 'slips': np.zeros(n, dtype=np.int64), 'slip_rate': nan}
+
+        density = np.concatenate(self._density)
+        err_mean = np.concatenate(self._err_mean)
+        err_msq = np.concatenate(self._err_msq)
+        unwrapped = np.concatenate(self._unwrapped)
+        num_windows = len(density)
+
+        # First window after the last one above the threshold
+        above = density > self.threshold
+        last_above = np.where(above.any(axis=0), num_windows - 1 - np.argmax(above[::-1], axis=0), -1)
+        first_locked = last_above + 1
+        locked = first_locked <= num_windows - min(self.hold, num_windows)
+        lock_time = np.where(locked, first_locked * self.window, np.nan)
+
+        windows = np.arange(num_windows)[:, None]
+        in_lock = windows >= np.where(locked, first_locked, 0)
+        count = in_lock.sum(axis=0)
+        mean = np.where(locked, (err_mean * in_lock).sum(axis=0) / np.maximum(count, 1), np.nan)
+        rms = np.where(locked, np.sqrt((err_msq * in_lock).sum(axis=0) / np.maximum(count, 1)), np.nan)
+
+        # A slip is the window-averaged unwrapped error moving a whole cycle
+        # away from where the previous slip (or the start) left it
+        slips = np.zeros(n, dtype=np.int64)
+        start = np.where(locked, first_locked, 0)
+        reference = np.round(unwrapped[np.minimum(start, num_windows - 1), np.arange(n)])
+        for w in range(num_windows):
+            active = w >= start
+            delta = unwrapped[w] - reference
+            slipped = active & (np.abs(delta) >= 1.0)
+            slips += np.where(slipped, np.abs(np.trunc(delta)).astype(np.int64), 0)
+            reference = np.where(slipped, reference + np.trunc(delta), reference)
+        slip_rate = slips / (count * self.window) * 1e6
+
+        return {'locked': locked, 'lock_time': lock_time, 'phase_err_mean': mean,
+                'phase_err_rms': rms, 'slips': slips, 'slip_rate': slip_rate}
+
+
+def characterize(lgcoeffs, offsets, jitters, frequency=0.01, num_clocks=200000, phase_bits=32,
+                 window=1024, threshold=0.1, hold=4, block=4096, seed=None,
+                 opt_track_frequency=True, opt_glitchless=True):
+    """
+    Runs one PLL instance per (lgcoeff, frequency offset, jitter) point.
+
+    Every instance is loaded with the nominal step for 'frequency' while
+    its input runs at frequency * (1 + offset), starting from a random
+    phase so that every point has to pull in.
+
+    Returns:
+        A dict with the flattened grid ('lgcoeff', 'offset', 'jitter') and
+        the LockMetrics results, one entry per point.
+    """
+    lg, off, jit = (a.ravel() for a in np.meshgrid(np.asarray(lgcoeffs), np.asarray(offsets, dtype=float),
+                                                  np.asarray(jitters, dtype=float), indexing='ij'))
+    n = len(lg)
+    freq = frequency * (1.0 + off)
+
+    pll = PLL(n, phase_bits, opt_track_frequency, int(round(frequency * 2.0**phase_bits)), opt_glitchless)
+    pll.settle(lg)
+    metrics = LockMetrics(n, window, threshold, phase_bits, hold)
+
+    rng = np.random.default_rng(seed)
+    phase = rng.random(n)
+    for first in range(0, num_clocks, block):
+        count = min(block, num_clocks - first)
+        # o_phase after a clock follows the input sampled on that clock
+        ref = np.mod(phase + (np.arange(count)[:, None] + 1) * freq, 1.0)
+        i_input, phase = input_clock(freq, count, jit, phase, rng)
+        o_phase, o_err = pll.run(i_input, lg)
+        metrics.update(o_phase, o_err, ref)
+
+    return dict(lgcoeff=lg, offset=off, jitter=jit, **metrics.results())
+
+
+def format_table(result):
+    """Formats characterize() results as a text table."""
+    lines = [f"{'lgcoeff':>7} {'offset':>10} {'jitter':>8} {'locked':>6} {'lock_time':>10} "
+             f"{'err_mean':>9} {'err_rms':>9} {'slips':>6} {'slips/Mclk':>10}"]
+    for i in range(len(result['lgcoeff'])):
+        lock_time = result['lock_time'][i]
+        lines.append(f"{result['lgcoeff'][i]:>7d} {result['offset'][i]:>10.3g} {result['jitter'][i]:>8.3g} "
+                     f"{'yes' if result['locked'][i] else 'no':>6} "
+                     f"{'-' if np.isnan(lock_time) else int(lock_time):>10} "
+                     f"{result['phase_err_mean'][i]:>9.4f} {result['phase_err_rms'][i]:>9.4f} "
+                     f"{result['slips'][i]:>6d} {result['slip_rate'][i]:>10.2f}")
+    return "\n".join(lines)
+
+
+def plot_heatmaps(result, lgcoeffs, offsets, jitters, path=None):
+    """One lock-time and one RMS phase error heatmap (lgcoeff vs offset) per jitter."""
+    import matplotlib.pyplot as plt
+
+    shape = (len(lgcoeffs), len(offsets), len(jitters))
+    lock_time = result['lock_time'].reshape(shape)
+    rms = result['phase_err_rms'].reshape(shape)
+
+    fig, axes = plt.subplots(2, len(jitters), figsize=(4 * len(jitters) + 2, 8), squeeze=False)
+    for j, jitter in enumerate(jitters):
+        for row, (data, label) in enumerate([(lock_time, 'lock time (clocks)'), (rms, 'RMS phase error (cycles)')]):
+            ax = axes[row, j]
+            image = ax.imshow(data[:, :, j], aspect='auto', origin='lower', interpolation='nearest')
+            ax.set_xticks(range(len(offsets)), [f'{o:.2g}' for o in offsets], rotation=45)
+            ax.set_yticks(range(len(lgcoeffs)), [str(lg) for lg in lgcoeffs])
+            ax.set_xlabel('frequency offset')
+            ax.set_ylabel('i_lgcoeff')
+            ax.set_title(f'{label}\njitter = {jitter:g} cycles RMS')
+            fig.colorbar(image, ax=ax)
+    fig.suptitle('PLL characterization (blank: no lock)')
+    fig.tight_layout()
+
+    if path:
+        fig.savefig(path)
+    else:
+        plt.show()
+
+
+def parse_list(text, kind=float):
+    """Parses 'a,b,c' or 'start:stop[:step]' (inclusive for integers)."""
+    if ':' in text:
+        parts = [kind(p) for p in text.split(':')]
+        if kind is int:
+            return list(range(parts[0], parts[1] + 1, parts[2] if len(parts) > 2 else 1))
+        return list(np.linspace(parts[0], parts[1], int(parts[2]) if len(parts) > 2 else 5))
+    return [kind(p) for p in text.split(',')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lock-time, phase error and cycle-slip characterization of pll.v')
+    parser.add_argument('--lgcoeffs', default='2:12', help="i_lgcoeff values, 'a,b,c' or 'start:stop' (default: 2:12)")
+    parser.add_argument('--offsets', default='0,0.001,0.005,0.01,0.02',
+                        help="relative input frequency offsets, 'a,b,c' or 'start:stop:count'")
+    parser.add_argument('--jitters', default='0,0.01,0.05', help='RMS input jitter in cycles')
+    parser.add_argument('--frequency', type=float, default=0.01, help='nominal input frequency in cycles per clock')
+    parser.add_argument('--clocks', type=int, default=200000, help='clocks to simulate')
+    parser.add_argument('--phase-bits', type=int, default=32, help='PHASE_BITS')
+    parser.add_argument('--window', type=int, default=1024, help='lock detection window in clocks')
+    parser.add_argument('--threshold', type=float, default=0.1, help='maximum o_err density when locked')
+    parser.add_argument('--hold', type=int, default=4, help='windows a lock must last at the end of the run')
+    parser.add_argument('--no-track-frequency', action='store_true', help='model OPT_TRACK_FREQUENCY=0')
+    parser.add_argument('--no-glitchless', action='store_true', help='model OPT_GLITCHLESS=0')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--csv', help='also write the table as CSV')
+    parser.add_argument('--heatmap', help="save the heatmaps to this file ('show' to display them)")
+    args = parser.parse_args()
+
+    lgcoeffs = parse_list(args.lgcoeffs, int)
+    offsets = parse_list(args.offsets)
+    jitters = parse_list(args.jitters)
+
+    result = characterize(lgcoeffs, offsets, jitters, args.frequency, args.clocks, args.phase_bits,
+                          args.window, args.threshold, args.hold, seed=args.seed,
+                          opt_track_frequency=not args.no_track_frequency,
+                          opt_glitchless=not args.no_glitchless)
+    print(format_table(result))
+
+    if args.csv:
+        columns = ['lgcoeff', 'offset', 'jitter', 'locked', 'lock_time', 'phase_err_mean',
+                   'phase_err_rms', 'slips', 'slip_rate']
+        data = np.column_stack([result[c].astype(float) for c in columns])
+        np.savetxt(args.csv, data, delimiter=',', header=','.join(columns), comments='')
+
+    if args.heatmap:
+        plot_heatmaps(result, lgcoeffs, offsets, jitters, None if args.heatmap == 'show' else args.heatmap)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,204 @@
-import cocotb
-from cocotb.triggers import Timer
-
-@cocotb.test()
-async def test_template(dut):
-    """Empty testbench that simply prints PASS."""
-    await Timer(1, units="ns")  # Wait for a small amount of time
-    dut._log.info("PASS")
\ No newline at end of file
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import FallingEdge, RisingEdge, Timer
+
+# pll/python holds the batched PLL model, pll/scripts the lock metrics
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / "python"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / "scripts"))
+from design import PLL, DBG_NAVG, DbgLockDetector, dbg_trace, decode_dbg, input_clock
+from characterize import LockMetrics, format_table, parse_list
+
+PHASE_BITS = 32  # must match pll.v
+FREQUENCY = 0.01
+NUM_POINTS = int(os.getenv("PLL_CHAR_POINTS", "8"))
+NUM_CLOCKS = int(os.getenv("PLL_CHAR_CLOCKS", "8192"))
+WINDOW = int(os.getenv("PLL_CHAR_WINDOW", "512"))
+LGCOEFFS = parse_list(os.getenv("PLL_CHAR_LGCOEFFS", "2:12"), int)
+OFFSETS = parse_list(os.getenv("PLL_CHAR_OFFSETS", "0,0.001,0.005,0.01,0.02"))
+JITTERS = parse_list(os.getenv("PLL_CHAR_JITTERS", "0,0.01,0.05"))
+SEED = int(os.getenv("PLL_CHAR_SEED", "1"))
+# Lock test, run only where o_dbg exists (Verilator)
+LOCK_LGCOEFF = int(os.getenv("PLL_LOCK_LGCOEFF", "12"))
+LOCK_OFFSET = float(os.getenv("PLL_LOCK_OFFSET", "0.02"))
+LOCK_JITTER = float(os.getenv("PLL_LOCK_JITTER", "0.01"))
+LOCK_MAX_CLOCKS = int(os.getenv("PLL_LOCK_MAX_CLOCKS", str(10**6)))
+BATCH = 4096  # o_dbg samples per monitor batch
+
+@cocotb.test()
+async def test_template(dut):
+    """Empty testbench that simply prints PASS."""
+    await Timer(1, units="ns")  # Wait for a small amount of time
+    dut._log.info("PASS")
+
+class DbgMonitor:
+    """
+    Samples o_dbg (and o_err) after every enabled clock and hands them to a
+    DbgLockDetector a batch at a time. 'locked' is set once the detector
+    reports lock.
+    """
+    def __init__(self, dut, detector):
+        self.dut = dut
+        self.detector = detector
+        self.locked = False
+        self.o_dbg = np.empty(BATCH, dtype=np.uint64)
+        self.o_err = np.empty(BATCH, dtype=np.uint8)
+        self.count = 0
+        self.dbg_batches = []
+        self.err_batches = []
+
+    def flush(self):
+        if self.count:
+            self.dbg_batches.append(self.o_dbg[:self.count].copy())
+            self.err_batches.append(self.o_err[:self.count].copy())
+            self.detector.update(self.dbg_batches[-1])
+            self.locked = self.detector.locked
+            self.count = 0
+
+    async def run(self):
+        dut = self.dut
+        prev_ce = False
+        while True:
+            # Values read at the edge are the results of the previous edge
+            await RisingEdge(dut.i_clk)
+            if prev_ce:
+                self.o_dbg[self.count] = dut.o_dbg.value.integer
+                self.o_err[self.count] = dut.o_err.value.integer
+                self.count += 1
+                if self.count == BATCH:
+                    self.flush()
+            prev_ce = bool(dut.i_ce.value)
+
+async def run_point(dut, lgcoeff, i_step, i_input):
+    """Load i_step, then clock i_input through with i_ce high; returns the traces."""
+    num_clocks = len(i_input)
+    o_phase = np.empty(num_clocks, dtype=np.uint64)
+    o_err = np.empty(num_clocks, dtype=np.uint8)
+
+    # Inputs change on the falling edge, outputs are read on the next
+    # falling edge, half a clock after the rising edge that set them.
+    await FallingEdge(dut.i_clk)
+    dut.i_lgcoeff.value = lgcoeff
+    dut.i_step.value = i_step
+    dut.i_ld.value = 1
+    dut.i_ce.value = 0
+    await FallingEdge(dut.i_clk)
+    dut.i_ld.value = 0
+    dut.i_ce.value = 1
+    for k, bit in enumerate(i_input.tolist()):
+        dut.i_input.value = int(bit)
+        await FallingEdge(dut.i_clk)
+        o_phase[k] = dut.o_phase.value.integer
+        o_err[k] = dut.o_err.value.integer
+    dut.i_ce.value = 0
+
+    return o_phase, o_err
+
+@cocotb.test()
+async def test_characterization_subset(dut):
+    """Run a random subset of the characterization grid on the RTL and the model"""
+    cocotb.start_soon(Clock(dut.i_clk, 10, units="ns").start())
+    dut.i_ld.value = 0
+    dut.i_step.value = 0
+    dut.i_ce.value = 0
+    dut.i_input.value = 0
+    dut.i_lgcoeff.value = 0
+
+    rng = np.random.default_rng(SEED)
+    grid = [(lg, off, jit) for lg in LGCOEFFS for off in OFFSETS for jit in JITTERS]
+    points = [grid[i] for i in rng.choice(len(grid), min(NUM_POINTS, len(grid)), replace=False)]
+    i_step = int(round(FREQUENCY * 2.0**PHASE_BITS)) & ((1 << (PHASE_BITS - 1)) - 1)
+
+    # A single model instance follows the RTL from point to point, state included
+    model = PLL(1, PHASE_BITS, True, 0, True)
+    rtl_metrics = LockMetrics(len(points), WINDOW, phase_bits=PHASE_BITS)
+    model_metrics = LockMetrics(len(points), WINDOW, phase_bits=PHASE_BITS)
+    rtl_phase = np.empty((NUM_CLOCKS, len(points)), dtype=np.uint64)
+    rtl_err = np.empty((NUM_CLOCKS, len(points)), dtype=np.uint8)
+    model_phase = np.empty_like(rtl_phase)
+    model_err = np.empty_like(rtl_err)
+    ref = np.empty((NUM_CLOCKS, len(points)))
+
+    for p, (lgcoeff, offset, jitter) in enumerate(points):
+        freq = FREQUENCY * (1.0 + offset)
+        phase = rng.random()
+        i_input, _ = input_clock(freq, NUM_CLOCKS, jitter, phase, rng)
+        ref[:, p] = np.mod(phase + (np.arange(NUM_CLOCKS) + 1) * freq, 1.0)
+
+        rtl_phase[:, p], rtl_err[:, p] = await run_point(dut, lgcoeff, i_step, i_input)
+
+        model.step(0, lgcoeff, i_ce=False, i_ld=True, i_step=i_step)
+        ph, err = model.run(i_input[:, None], lgcoeff)
+        model_phase[:, p], model_err[:, p] = ph[:, 0], err[:, 0]
+
+        mismatches = np.flatnonzero((rtl_phase[:, p] != model_phase[:, p]) | (rtl_err[:, p] != model_err[:, p]))
+        if len(mismatches):
+            first = mismatches[0]
+            dut._log.error(f"{len(mismatches)} mismatches at i_lgcoeff={lgcoeff} offset={offset} "
+                           f"jitter={jitter}, first at clock {first}: dut o_phase 0x{int(rtl_phase[first, p]):08x} "
+                           f"o_err {rtl_err[first, p]}, model o_phase 0x{int(model_phase[first, p]):08x} "
+                           f"o_err {model_err[first, p]}")
+        assert len(mismatches) == 0, "dut o_phase/o_err don't match the model"
+
+    rtl_metrics.update(rtl_phase, rtl_err, ref)
+    model_metrics.update(model_phase, model_err, ref)
+    lg, off, jit = (np.array(column) for column in zip(*points))
+    dut._log.info("RTL characterization:\n" + format_table(dict(lgcoeff=lg, offset=off, jitter=jit,
+                                                                **rtl_metrics.results())))
+
+    rtl_results, model_results = rtl_metrics.results(), model_metrics.results()
+    for key in rtl_results:
+        assert np.array_equal(rtl_results[key], model_results[key], equal_nan=True), f"{key} differs from the model"
+
+@cocotb.test()
+async def test_lock_early_exit(dut):
+    """Run until o_dbg shows lock rather than for a fixed number of clocks"""
+    if not hasattr(dut, "o_dbg"):
+        dut._log.info("o_dbg only exists under Verilator, skipping")
+        return
+    cocotb.start_soon(Clock(dut.i_clk, 10, units="ns").start())
+    monitor = DbgMonitor(dut, DbgLockDetector())
+    cocotb.start_soon(monitor.run())
+
+    rng = np.random.default_rng(SEED)
+    freq = FREQUENCY * (1.0 + LOCK_OFFSET)
+    phase = rng.random()
+    await FallingEdge(dut.i_clk)
+    dut.i_lgcoeff.value = LOCK_LGCOEFF
+    dut.i_step.value = int(round(FREQUENCY * 2.0**PHASE_BITS)) & ((1 << (PHASE_BITS - 1)) - 1)
+    dut.i_ld.value = 1
+    dut.i_ce.value = 1
+    clocks = 0
+    while clocks < LOCK_MAX_CLOCKS and not monitor.locked:
+        i_input, phase = input_clock(freq, BATCH, LOCK_JITTER, phase, rng)
+        for bit in i_input.tolist():
+            dut.i_input.value = int(bit)
+            await FallingEdge(dut.i_clk)
+            dut.i_ld.value = 0
+        clocks += BATCH
+    dut.i_ce.value = 0
+    await RisingEdge(dut.i_clk)
+    await RisingEdge(dut.i_clk)
+    monitor.flush()
+
+    # o_dbg must be the boxcar of o_err, wherever the window lies within
+    # this run
+    o_dbg = np.concatenate(monitor.dbg_batches)
+    o_err = np.concatenate(monitor.err_batches)
+    expected = dbg_trace(o_err)
+    mismatches = np.flatnonzero(o_dbg[DBG_NAVG + 1:] != expected[DBG_NAVG + 1:]) + DBG_NAVG + 1
+    if len(mismatches):
+        first = mismatches[0]
+        dut._log.error(f"{len(mismatches)} o_dbg mismatches, first at clock {first}: "
+                       f"dut {decode_dbg(o_dbg[first])} model {decode_dbg(expected[first])}")
+    assert len(mismatches) == 0, "o_dbg isn't the boxcar sum of o_err"
+
+    detector = monitor.detector
+    assert detector.locked, f"no lock within {LOCK_MAX_CLOCKS} clocks"
+    dut._log.info(f"Locked at clock {detector.lock_time}, stopped after {len(o_dbg)} of "
+                  f"{LOCK_MAX_CLOCKS} clocks (bias {detector.bias:.4f})")
@@ -0,0 +1,11 @@
+import sys
+from pathlib import Path
+
+# The repository root holds the shared test tools
+sys.path.insert(0, str(Path(__file__).resolve().parents[5]))
+from tools.runner import Bench, main
+
+BENCH = Bench(__file__, "pll", sources=["pll", "boxcar"])
+
+if __name__ == "__main__":
+    sys.exit(main(BENCH))
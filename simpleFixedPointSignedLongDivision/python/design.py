@@ -0,0 +1,101 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# The repository root holds the shared fixedpoint package
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from fixedpoint import hold, to_fixed, to_real
+
+WIDTH = 8   # simpleFixedPointSignedLongDivision.v's defaults
+FBITS = 4
+
+
+def divide(a, b, width=WIDTH, fbits=FBITS, initial=0, hold_o_val=True):
+    """
+    What simpleFixedPointSignedLongDivision leaves on its outputs at o_done,
+    for any number of divisions at once.
+
+    The core divides |a| by |b| one quotient bit a clock, flags an overflow
+    when the integer part doesn't fit, rounds the quotient half to even and
+    negates it if the signs differ. The most negative value overflows as
+    either operand. o_val is only written by a valid, non-zero quotient, so
+    a zero quotient, an overflow or a division by zero leave the previous
+    value; the divisions are taken to run in the order given (flattened).
+
+    Args:
+        a, b: Dividends and divisors, raw two's complement fixed-point
+            integers with 'fbits' fractional bits (negative, or their
+            unsigned 'width' bit encodings). They broadcast together.
+        width: WIDTH, up to 31 bits.
+        fbits: FBITS.
+        initial: o_val before the first division (0 after reset).
+        hold_o_val: False for the pipelined core, whose o_val is the
+            quotient of every valid result and 0 otherwise.
+
+    Returns:
+        A tuple (o_val, o_valid, o_dbz, o_ovf) of arrays shaped like the
+        broadcast inputs, o_val as signed integers.
+    """
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=np.int64), np.asarray(b, dtype=np.int64))
+    shape = a.shape
+    widthu = width - 1
+    fbitsw = max(fbits, 1)
+    mask = (1 << width) - 1
+    masku = (1 << widthu) - 1
+    smallest = 1 << widthu
+    a = a.ravel() & mask
+    b = b.ravel() & mask
+
+    o_dbz = b == 0
+    ovf_in = ~o_dbz & ((a == smallest) | (b == smallest))
+    calc = ~o_dbz & ~ovf_in
+
+    # Magnitudes as the core registers them, -x[WIDTHU-1:0] for negative x
+    au = np.where(a >= smallest, -(a & masku), a & masku) & masku
+    bu = np.where(b >= smallest, -(b & masku), b & masku) & masku
+    bu = np.where(calc, bu, 1)
+
+    # The integer part of the quotient, after WIDTHU iterations, must keep
+    # its top FBITS bits (one when FBITS is 0) clear
+    o_ovf = ovf_in | (calc & ((au // bu) >> (widthu - fbitsw) != 0))
+    o_valid = calc & ~o_ovf
+
+    # Truncated quotient, then round half to even on the next bit and the
+    # remainder beyond it
+    quo, rem = np.divmod(au << fbits, bu)
+    half = 2 * rem >= bu
+    up = half & (((quo & 1) == 1) | (2 * rem != bu))
+    quo = (quo + up) & masku
+    value = np.where((a >= smallest) != (b >= smallest), -quo, quo)
+
+    if hold_o_val:
+        o_val = hold(value, o_valid & (quo != 0), initial)
+    else:
+        o_val = np.where(o_valid, value, 0)
+    return o_val.reshape(shape), o_valid.reshape(shape), o_dbz.reshape(shape), o_ovf.reshape(shape)
+
+
+def latency(a, b, width=WIDTH, fbits=FBITS, radix=2):
+    """
+    Clocks from the edge that takes i_start to the one that raises o_done:
+    one for a division by zero or a most negative operand, WIDTH+1 for an
+    overflow found on the way and WIDTH+FBITS+3 for a result. RADIX=4
+    takes two iterations a clock, halving (rounding up) the WIDTH-1 or
+    WIDTH+FBITS-1 of them.
+    """
+    mask = (1 << width) - 1
+    smallest = 1 << (width - 1)
+    a = np.asarray(a, dtype=np.int64) & mask
+    b = np.asarray(b, dtype=np.int64) & mask
+    o_valid = divide(a, b, width, fbits)[1]
+    rejected = (b == 0) | (a == smallest) | (b == smallest)
+    steps = radix.bit_length() - 1  # iterations (quotient bits) a clock
+    overflow = 2 + -(-(width - 1) // steps)
+    result = 4 + -(-(width - 1 + fbits) // steps)
+    return np.where(rejected, 1, np.where(o_valid, result, overflow))
+
+
+def pipeline_latency(width=WIDTH, fbits=FBITS):
+    """Clocks from i_valid to o_done in pipelinedFixedPointSignedLongDivision."""
+    return width + fbits + 1
@@ -0,0 +1,141 @@
+// =============================================================================
+// File        : pipelinedFixedPointSignedLongDivision.v
+// Author      : @fjpolo
+// email       : fjpolo@gmail.com
+// Description : Unrolled, pipelined version of
+//               simpleFixedPointSignedLongDivision: one division per clock,
+//               results LATENCY clocks later, with the same rounding,
+//               divide by zero and overflow rules.
+// License     : MIT License
+//
+// Copyright (c) 2025 | @fjpolo
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in all
+// copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+// =============================================================================
+
+`default_nettype none
+`timescale 1ps/1ps
+
+module pipelinedFixedPointSignedLongDivision #(
+    parameter WIDTH=8,  // width of numbers in bits (integer and fractional)
+    parameter FBITS=4   // fractional bits within WIDTH
+    ) (
+    input wire logic i_clk,    // clock
+    input wire logic i_rst,    // reset
+    input wire logic i_valid,  // a and b hold a division to start
+    output     logic o_done,   // o_val, o_dbz and o_ovf hold a result (high for one tick per i_valid)
+    output     logic o_valid,  // o_val holds a quotient: o_done without o_dbz or o_ovf
+    output     logic o_dbz,    // divide by zero
+    output     logic o_ovf,    // overflow
+    input wire logic signed [WIDTH-1:0] a,      // dividend (numerator)
+    input wire logic signed [WIDTH-1:0] b,      // divisor (denominator)
+    output     logic signed [WIDTH-1:0] o_val   // result value: quotient, 0 on o_dbz or o_ovf
+    );
+
+    localparam WIDTHU = WIDTH - 1;                 // unsigned widths are 1 bit narrower
+    localparam FBITSW = (FBITS == 0) ? 1 : FBITS;  // avoid negative vector width when FBITS=0
+    localparam SMALLEST = {1'b1, {WIDTHU{1'b0}}};  // smallest negative number
+
+    localparam ITER = WIDTHU + FBITS;  // iterations: unsigned input width + fractional bits
+    localparam LATENCY = ITER + 2;     // input stage, one stage per iteration, rounding stage
+
+    // Stage k holds the division after k iterations; stage 0 is the
+    // registered input
+    logic [ITER:0] valid, dbz, ovf, sig_diff;
+    logic [WIDTHU-1:0] bu [0:ITER];           // absolute divisor
+    logic [WIDTHU-1:0] quo [0:ITER];          // intermediate quotients (unsigned)
+    logic [WIDTHU:0] acc [0:ITER];            // accumulators (unsigned but 1 bit wider)
+    logic [WIDTHU-1:0] quo_next [0:ITER];
+    logic [WIDTHU:0] acc_next [0:ITER];
+
+    // division algorithm iteration, one per stage (and one more for rounding)
+    genvar k;
+    generate
+        for (k = 0; k <= ITER; k = k + 1) begin : gen_iter
+            always_comb begin
+                if (acc[k] >= {1'b0, bu[k]}) begin
+                    acc_next[k] = acc[k] - bu[k];
+                    {acc_next[k], quo_next[k]} = {acc_next[k][WIDTHU-1:0], quo[k], 1'b1};
+                end else begin
+                    {acc_next[k], quo_next[k]} = {acc[k], quo[k]} << 1;
+                end
+            end
+        end
+    endgenerate
+
+    // input stage: flag divide by zero and overflowing operands, register
+    // the absolute values and whether the signs differ
+    always_ff @(posedge i_clk) begin
+        valid[0] <= i_valid;
+        dbz[0] <= (b == 0);
+        ovf[0] <= (b != 0) && (a == SMALLEST || b == SMALLEST);
+        sig_diff[0] <= a[WIDTH-1] ^ b[WIDTH-1];
+        bu[0] <= (b[WIDTH-1]) ? -b[WIDTHU-1:0] : b[WIDTHU-1:0];
+        {acc[0], quo[0]} <= {{WIDTHU{1'b0}}, (a[WIDTH-1]) ? -a[WIDTHU-1:0] : a[WIDTHU-1:0], 1'b0};
+        if (i_rst) valid[0] <= 0;
+    end
+
+    // iteration stages
+    generate
+        for (k = 0; k < ITER; k = k + 1) begin : gen_stage
+            always_ff @(posedge i_clk) begin
+                valid[k+1] <= valid[k];
+                dbz[k+1] <= dbz[k];
+                sig_diff[k+1] <= sig_diff[k];
+                bu[k+1] <= bu[k];
+                acc[k+1] <= acc_next[k];
+                quo[k+1] <= quo_next[k];
+                // the integer part doesn't fit once WIDTHU iterations leave
+                // bits in the top FBITS of the quotient
+                if (k == WIDTHU-1)
+                    ovf[k+1] <= ovf[k] || (!dbz[k] && quo_next[k][WIDTHU-1:WIDTHU-FBITSW] != 0);
+                else
+                    ovf[k+1] <= ovf[k];
+                if (i_rst) valid[k+1] <= 0;
+            end
+        end
+    endgenerate
+
+    // Gaussian rounding and sign
+    logic [WIDTHU-1:0] quo_round;
+    always_comb begin
+        quo_round = quo[ITER];
+        // next digit is 1: round up if quotient is odd or remainder is non-zero
+        if (quo_next[ITER][0] == 1'b1 && (quo[ITER][0] == 1'b1 || acc_next[ITER][WIDTHU:1] != 0))
+            quo_round = quo[ITER] + 1;
+    end
+
+    always_ff @(posedge i_clk) begin
+        o_done <= valid[ITER];
+        o_dbz <= dbz[ITER];
+        o_ovf <= ovf[ITER];
+        if (dbz[ITER] || ovf[ITER]) o_val <= 0;
+        else o_val <= (sig_diff[ITER] && quo_round != 0) ? {1'b1, -quo_round} : {1'b0, quo_round};
+        if (i_rst) begin
+            o_done <= 0;
+            o_dbz <= 0;
+            o_ovf <= 0;
+            o_val <= 0;
+        end
+    end
+
+    // like the iterative core, o_valid drops on a division by zero or an
+    // overflow while o_done marks every result
+    assign o_valid = o_done && !o_dbz && !o_ovf;
+endmodule
@@ -31,7 +31,8 @@
 
 module simpleFixedPointSignedLongDivision #(
     parameter WIDTH=8,  // width of numbers in bits (integer and fractional)
-    parameter FBITS=4   // fractional bits within WIDTH
+    parameter FBITS=4,  // fractional bits within WIDTH
+    parameter RADIX=2   // quotient bits per clock: 2 for one, 4 for two
     ) (
     input wire logic i_clk,    // clock
     input wire logic i_rst,    // reset
@@ -57,6 +58,9 @@ module simpleFixedPointSignedLongDivision #(
     logic [WIDTHU-1:0] au, bu;         // absolute version of inputs (unsigned)
     logic [WIDTHU-1:0] quo, quo_next;  // intermediate quotients (unsigned)
     logic [WIDTHU:0] acc, acc_next;    // accumulator (unsigned but 1 bit wider)
+    logic [WIDTHU-1:0] quo_next2;      // radix 4: quotient and accumulator after a second iteration
+    logic [WIDTHU:0] acc_next2;
+    logic two;                         // radix 4: two iterations this clock (all but an odd last one)
 
     // input signs
     always_comb begin
@@ -74,6 +78,17 @@ module simpleFixedPointSignedLongDivision #(
         end
     end
 
+    // second iteration, chained after the first, for radix 4
+    always_comb begin
+        if (acc_next >= {1'b0, bu}) begin
+            acc_next2 = acc_next - bu;
+            {acc_next2, quo_next2} = {acc_next2[WIDTHU-1:0], quo_next, 1'b1};
+        end else begin
+            {acc_next2, quo_next2} = {acc_next, quo_next} << 1;
+        end
+        two = (RADIX == 4) && (i != ITER-1);
+    end
+
     // calculation state machine
     enum {IDLE, INIT, CALC, ROUND, SIGN} state;
     always_ff @(posedge i_clk) begin
@@ -86,11 +101,18 @@ module simpleFixedPointSignedLongDivision #(
                 {acc, quo} <= {{WIDTHU{1'b0}}, au, 1'b0};  // initialize calculation
             end
             CALC: begin
-                if (i == WIDTHU-1 && quo_next[WIDTHU-1:WIDTHU-FBITSW] != 0) begin  // overflow
+                // overflow, checked on whichever iteration completes the integer part
+                if ((i == WIDTHU-1 && quo_next[WIDTHU-1:WIDTHU-FBITSW] != 0)
+                    || (two && i == WIDTHU-2 && quo_next2[WIDTHU-1:WIDTHU-FBITSW] != 0)) begin
                     state <= IDLE;
                     o_busy <= 0;
                     o_done <= 1;
                     o_ovf <= 1;
+                end else if (two) begin
+                    if (i == ITER-2) state <= ROUND;  // calculation complete after these iterations
+                    i <= i + 2;
+                    acc <= acc_next2;
+                    quo <= quo_next2;
                 end else begin
                     if (i == ITER-1) state <= ROUND;  // calculation complete after next iteration
                     i <= i + 1;
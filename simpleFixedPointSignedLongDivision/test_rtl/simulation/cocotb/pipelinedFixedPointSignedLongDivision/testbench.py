@@ -0,0 +1,94 @@
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import FallingEdge, RisingEdge
+
+# simpleFixedPointSignedLongDivision/python holds the vectorized model
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / "python"))
+from design import divide, pipeline_latency, to_real
+
+# Must match the parameters the runner builds with
+WIDTH = int(os.getenv("DIV_WIDTH", "9"))
+FBITS = int(os.getenv("DIV_FBITS", "4"))
+MASK = (1 << WIDTH) - 1
+LATENCY = pipeline_latency(WIDTH, FBITS)
+# Pairs to stream: "all" for every (a, b), or a number of random ones
+# (by default every pair up to 9 bits wide)
+STREAM = os.getenv("DIV_STREAM", "all" if WIDTH <= 9 else "100000")
+BUBBLES = float(os.getenv("DIV_BUBBLES", "0.1"))  # chance of an idle clock, below 1
+SEED = int(os.getenv("DIV_SEED", "1"))
+
+async def reset_dut(dut):
+    dut.i_valid.value = 0
+    dut.a.value = 0
+    dut.b.value = 0
+    dut.i_rst.value = 1
+    await RisingEdge(dut.i_clk)
+    await RisingEdge(dut.i_clk)
+    dut.i_rst.value = 0
+
+@cocotb.test()
+async def test_stream(dut):
+    """Stream divisions at one per clock, with random bubbles, and check them in bulk"""
+    cocotb.start_soon(Clock(dut.i_clk, 1, units="ns").start())
+    await reset_dut(dut)
+
+    rng = np.random.default_rng(SEED)
+    values = np.arange(-(1 << (WIDTH - 1)), 1 << (WIDTH - 1))
+    if STREAM == "all":
+        a, b = (grid.ravel() for grid in np.meshgrid(values, values, indexing="ij"))
+        order = rng.permutation(len(a))
+        a, b = a[order], b[order]
+    else:
+        a, b = rng.choice(values, (2, int(STREAM)))
+    num_pairs = len(a)
+
+    # Clock by clock: i_valid and which pair it carries, then the outputs.
+    # Each pair follows a geometric number of idle clocks.
+    idle = rng.geometric(1 - BUBBLES, num_pairs) - 1
+    starts = np.cumsum(idle + 1) - 1
+    i_valid = np.zeros(starts[-1] + 1, dtype=bool)
+    i_valid[starts] = True
+    pair = np.cumsum(i_valid) - 1
+    num_clocks = len(i_valid) + LATENCY
+    raw_a = (a & MASK).tolist()
+    raw_b = (b & MASK).tolist()
+    o_done = np.zeros(num_clocks, dtype=bool)
+    outputs = np.zeros((num_clocks, 4), dtype=np.int64)
+
+    # Inputs change on the falling edge, outputs are read on the next
+    # falling edge, half a clock after the rising edge that set them.
+    await FallingEdge(dut.i_clk)
+    for clock in range(num_clocks):
+        if clock < len(i_valid) and i_valid[clock]:
+            dut.i_valid.value = 1
+            dut.a.value = raw_a[pair[clock]]
+            dut.b.value = raw_b[pair[clock]]
+        else:
+            dut.i_valid.value = 0
+        await FallingEdge(dut.i_clk)
+        o_done[clock] = bool(dut.o_done.value)
+        if o_done[clock]:
+            outputs[clock] = (dut.o_val.value.signed_integer, int(dut.o_valid.value), int(dut.o_dbz.value),
+                              int(dut.o_ovf.value))
+
+    # Every token comes out LATENCY clocks after it went in, in order
+    expected_done = np.zeros(num_clocks, dtype=bool)
+    expected_done[np.flatnonzero(i_valid) + LATENCY - 1] = True
+    assert np.array_equal(o_done, expected_done), f"o_done doesn't follow i_valid by {LATENCY} clocks"
+
+    results = outputs[o_done]
+    o_val, o_valid, o_dbz, o_ovf = divide(a, b, WIDTH, FBITS, hold_o_val=False)
+    bad = (results[:, 0] != o_val) | (results[:, 1] != o_valid) | (results[:, 2] != o_dbz) | (results[:, 3] != o_ovf)
+    for k in np.flatnonzero(bad)[:8]:
+        dut._log.error(f"{to_real(a[k], FBITS)}/{to_real(b[k], FBITS)}: dut o_val {to_real(results[k, 0], FBITS)} "
+                       f"valid/dbz/ovf {results[k, 1:].tolist()}, model o_val {to_real(o_val[k], FBITS)} "
+                       f"valid/dbz/ovf {[int(o_valid[k]), int(o_dbz[k]), int(o_ovf[k])]}")
+    dut._log.info(f"{num_pairs} divisions in {num_clocks} clocks ({num_pairs / num_clocks:.3f} per clock), "
+                  f"latency {LATENCY}, {int(bad.sum())} mismatches")
+    assert not bad.any(), "dut doesn't match the model"
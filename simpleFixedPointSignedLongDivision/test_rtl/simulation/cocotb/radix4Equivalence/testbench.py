@@ -0,0 +1,104 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import FallingEdge, RisingEdge
+
+# simpleFixedPointSignedLongDivision/python holds the vectorized model
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / "python"))
+from design import divide, latency, to_real
+
+# Must match the parameters the runner builds with
+WIDTH = int(os.getenv("DIV_WIDTH", "7"))
+FBITS = int(os.getenv("DIV_FBITS", "3"))
+MASK = (1 << WIDTH) - 1
+# Pairs to divide: "all" for every (a, b), or a number of random ones
+PAIRS = os.getenv("DIV_PAIRS", "all")
+SEED = int(os.getenv("DIV_SEED", "1"))
+CYCLES_REPORT = os.getenv("DIV_CYCLES_REPORT")  # JSON file to add the clock counts to
+OUTPUTS = ("o_val", "o_valid", "o_dbz", "o_ovf")
+
+async def reset_dut(dut):
+    dut.i_start.value = 0
+    dut.a.value = 0
+    dut.b.value = 0
+    dut.i_rst.value = 1
+    await RisingEdge(dut.i_clk)
+    await RisingEdge(dut.i_clk)
+    dut.i_rst.value = 0
+
+def read_outputs(dut, radix):
+    return (getattr(dut, f"o_val_r{radix}").value.signed_integer,
+            int(getattr(dut, f"o_valid_r{radix}").value),
+            int(getattr(dut, f"o_dbz_r{radix}").value),
+            int(getattr(dut, f"o_ovf_r{radix}").value))
+
+def save_cycles(path, clocks):
+    """Adds this build's clock counts to the JSON report at 'path'."""
+    report = json.loads(Path(path).read_text()) if Path(path).exists() else {}
+    report[f"WIDTH={WIDTH} FBITS={FBITS}"] = clocks
+    Path(path).write_text(json.dumps(report, indent=2))
+
+@cocotb.test()
+async def test_radix4_equivalence(dut):
+    """Every pair through the RADIX=2 and RADIX=4 cores at once: same outputs, fewer clocks"""
+    cocotb.start_soon(Clock(dut.i_clk, 1, units="ns").start())
+    await reset_dut(dut)
+
+    values = np.arange(-(1 << (WIDTH - 1)), 1 << (WIDTH - 1))
+    if PAIRS == "all":
+        a, b = (grid.ravel() for grid in np.meshgrid(values, values, indexing="ij"))
+    else:
+        a, b = np.random.default_rng(SEED).choice(values, (2, int(PAIRS)))
+
+    # o_done's clock (counting the one that takes i_start as 1) and the
+    # outputs there, for each core
+    clocks = {radix: np.zeros(len(a), dtype=np.int64) for radix in (2, 4)}
+    results = {radix: np.zeros((len(a), len(OUTPUTS)), dtype=np.int64) for radix in (2, 4)}
+
+    # Inputs change on the falling edge and outputs are read on the next
+    # ones, half a clock after the rising edges that set them
+    await FallingEdge(dut.i_clk)
+    for k, (a_k, b_k) in enumerate(zip((a & MASK).tolist(), (b & MASK).tolist())):
+        dut.a.value = a_k
+        dut.b.value = b_k
+        dut.i_start.value = 1
+        clock = 0
+        while not (clocks[2][k] and clocks[4][k]):
+            await FallingEdge(dut.i_clk)
+            dut.i_start.value = 0
+            clock += 1
+            for radix in (2, 4):
+                if not clocks[radix][k] and getattr(dut, f"o_done_r{radix}").value:
+                    clocks[radix][k] = clock
+                    results[radix][k] = read_outputs(dut, radix)
+            assert clock <= WIDTH + FBITS + 3, f"{to_real(a[k], FBITS)}/{to_real(b[k], FBITS)} never finished"
+
+    # Radix 4 gives the radix 2 results, which are the model's
+    bad = np.any(results[4] != results[2], axis=1)
+    for k in np.flatnonzero(bad)[:8]:
+        dut._log.error(f"{to_real(a[k], FBITS)}/{to_real(b[k], FBITS)}: radix 2 {results[2][k].tolist()}, "
+                       f"radix 4 {results[4][k].tolist()} ({', '.join(OUTPUTS)})")
+    assert not bad.any(), f"{int(bad.sum())} of {len(a)} results differ between RADIX=2 and RADIX=4"
+    model = np.stack(divide(a, b, WIDTH, FBITS), axis=1).astype(np.int64)
+    assert np.array_equal(results[2], model), "RADIX=2 results don't match the model"
+
+    # Clock counts, against the model and each other
+    summary = {}
+    for radix in (2, 4):
+        assert np.array_equal(clocks[radix], latency(a, b, WIDTH, FBITS, radix)), \
+            f"RADIX={radix} clock counts don't match latency()"
+        counts, occurrences = np.unique(clocks[radix], return_counts=True)
+        summary[radix] = {"mean": float(clocks[radix].mean()),
+                          "clocks": dict(zip(counts.tolist(), occurrences.tolist()))}
+        dut._log.info(f"RADIX={radix}: {summary[radix]['mean']:.2f} clocks per division on average, "
+                      f"histogram {summary[radix]['clocks']}")
+    dut._log.info(f"{len(a)} pairs, WIDTH={WIDTH} FBITS={FBITS}: identical results, "
+                  f"RADIX=4 {summary[2]['mean'] / summary[4]['mean']:.2f}x faster")
+    if CYCLES_REPORT:
+        save_cycles(CYCLES_REPORT, {f"RADIX={radix}": summary[radix] for radix in (2, 4)})
@@ -12,14 +12,11 @@ unset LD_PRELOAD
 # Usually, /usr/bin is already in PATH by default, so this might not be needed.
 # export PATH="/usr/bin:$PATH" # Uncomment if 'iverilog' or 'vvp' are not found
 
-# Copy original simpleFixedPointSignedLongDivision.v
-cp "${PWD}/../../../../rtl/simpleFixedPointSignedLongDivision.v" .
-
 # Call cocoTB for Icarus
 echo "         [COCOTB][ICARUS] Running testbench..."
 # Explicitly use the system's python3.
 # This will automatically find the system-installed iverilog and vvp.
-/usr/bin/python3 testrunner_icarus.py
+/usr/bin/python3 testrunner.py --sim icarus
 if [ $? -ne 0 ]; then
     echo "           [COCOTB][ICARUS] FAIL: Simulation failed. Exiting script."
     exit 1
@@ -28,14 +25,11 @@ echo "         [COCOTB][ICARUS] PASS: CocoTB simulation passed!"
 
 # Call cocoTB for Verilator (assuming you have verilator also installed via system package manager)
 echo "         [COCOTB][VERILATOR] Running testbench..."
-/usr/bin/python3 testrunner_verilator.py
+/usr/bin/python3 testrunner.py --sim verilator
 if [ $? -ne 0 ]; then
     echo "           [COCOTB][VERILATOR] FAIL: Simulation failed. Exiting script."
     exit 1
 fi
 echo "         [COCOTB][VERILATOR] PASS: CocoTB simulation passed!"
 
-# Remove simpleFixedPointSignedLongDivision.v
-rm simpleFixedPointSignedLongDivision.v
-
-echo "Simulation script finished."
\ No newline at end of file
+echo "Simulation script finished."
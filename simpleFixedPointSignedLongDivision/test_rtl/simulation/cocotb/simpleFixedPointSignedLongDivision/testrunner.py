@@ -0,0 +1,15 @@
+import sys
+from pathlib import Path
+
+# The repository root holds the shared test tools
+sys.path.insert(0, str(Path(__file__).resolve().parents[5]))
+from tools.runner import Bench, main
+
+# Every pair of the two narrow builds, random ones of the wider builds
+BENCH = Bench(__file__, "simpleFixedPointSignedLongDivision",
+              builds=[{"WIDTH": 9, "FBITS": 4}, {"WIDTH": 8, "FBITS": 2}, {"WIDTH": 12, "FBITS": 6},
+                      {"WIDTH": 16, "FBITS": 8}],
+              env_prefix="DIV_")
+
+if __name__ == "__main__":
+    sys.exit(main(BENCH))
@@ -0,0 +1,78 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# The repository root holds the shared fixedpoint package
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from fixedpoint import hold, to_fixed, to_real
+
+WIDTH = 8   # simpleFixedPointUnsignedLongDivision.v's defaults
+FBITS = 4
+
+
+def divide(a, b, width=WIDTH, fbits=FBITS, initial=0, hold_o_val=True):
+    """
+    What simpleFixedPointUnsignedLongDivision leaves on its outputs at
+    o_done, for any number of divisions at once.
+
+    The core divides one quotient bit a clock and truncates the quotient,
+    flagging an overflow (o_val cleared) when the integer part doesn't fit.
+    A division by zero leaves o_val as it was; the divisions are taken to
+    run in the order given (flattened).
+
+    Args:
+        a, b: Dividends and divisors, raw unsigned fixed-point integers with
+            'fbits' fractional bits, reduced to 'width' bits. They broadcast
+            together.
+        width: WIDTH, up to 31 bits.
+        fbits: FBITS.
+        initial: o_val before the first division (0 after reset).
+        hold_o_val: False for the pipelined core, whose o_val is the
+            quotient of every valid result and 0 otherwise.
+
+    Returns:
+        A tuple (o_val, o_valid, o_dbz, o_ovf) of arrays shaped like the
+        broadcast inputs.
+    """
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=np.int64), np.asarray(b, dtype=np.int64))
+    shape = a.shape
+    mask = (1 << width) - 1
+    a = a.ravel() & mask
+    b = b.ravel() & mask
+
+    o_dbz = b == 0
+    b = np.where(o_dbz, 1, b)
+    # The integer part of the quotient, after WIDTH iterations, must keep its
+    # top FBITS bits clear; without fractional bits it always fits
+    if fbits > 0:
+        o_ovf = ~o_dbz & ((a // b) >> (width - fbits) != 0)
+    else:
+        o_ovf = np.zeros_like(o_dbz)
+    o_valid = ~o_dbz & ~o_ovf
+
+    value = np.where(o_valid, (a << fbits) // b, 0)
+    o_val = hold(value, ~o_dbz, initial) if hold_o_val else value
+    return o_val.reshape(shape), o_valid.reshape(shape), o_dbz.reshape(shape), o_ovf.reshape(shape)
+
+
+def latency(a, b, width=WIDTH, fbits=FBITS, radix=2):
+    """
+    Clocks from the edge that takes i_start to the one that raises o_done:
+    one for a division by zero, WIDTH+1 for an overflow and WIDTH+FBITS+1
+    for a result. RADIX=4 takes two iterations a clock, halving (rounding
+    up) the WIDTH or WIDTH+FBITS of them.
+    """
+    mask = (1 << width) - 1
+    a = np.asarray(a, dtype=np.int64) & mask
+    b = np.asarray(b, dtype=np.int64) & mask
+    _, o_valid, o_dbz, o_ovf = divide(a, b, width, fbits)
+    steps = radix.bit_length() - 1  # iterations (quotient bits) a clock
+    overflow = 1 + -(-width // steps)
+    result = 1 + -(-(width + fbits) // steps)
+    return np.where(o_dbz, 1, np.where(o_ovf, overflow, result))
+
+
+def pipeline_latency(width=WIDTH, fbits=FBITS):
+    """Clocks from i_valid to o_done in pipelinedFixedPointUnsignedLongDivision."""
+    return width + fbits + 1
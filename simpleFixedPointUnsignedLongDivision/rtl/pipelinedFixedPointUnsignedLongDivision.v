@@ -0,0 +1,131 @@
+// =============================================================================
+// File        : pipelinedFixedPointUnsignedLongDivision.v
+// Author      : @fjpolo
+// email       : fjpolo@gmail.com
+// Description : Unrolled, pipelined version of
+//               simpleFixedPointUnsignedLongDivision: one division per clock,
+//               results LATENCY clocks later, with the same truncation,
+//               divide by zero and overflow rules.
+// License     : MIT License
+//
+// Copyright (c) 2025 | @fjpolo
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in all
+// copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+// =============================================================================
+
+`default_nettype none
+`timescale 1ps/1ps
+
+module pipelinedFixedPointUnsignedLongDivision #(
+    parameter WIDTH=8,  // width of numbers in bits (integer and fractional)
+    parameter FBITS=4   // fractional bits within WIDTH
+    ) (
+    input wire logic i_clk,    // clock
+    input wire logic i_rst,    // reset
+    input wire logic i_valid,  // a and b hold a division to start
+    output     logic o_done,   // o_val, o_dbz and o_ovf hold a result (high for one tick per i_valid)
+    output     logic o_valid,  // o_val holds a quotient: o_done without o_dbz or o_ovf
+    output     logic o_dbz,    // divide by zero
+    output     logic o_ovf,    // overflow
+    input wire logic [WIDTH-1:0] a,   // dividend (numerator)
+    input wire logic [WIDTH-1:0] b,   // divisor (denominator)
+    output     logic [WIDTH-1:0] o_val  // result value: quotient, 0 on o_dbz or o_ovf
+    );
+
+    localparam FBITSW = (FBITS == 0) ? 1 : FBITS;  // avoid negative vector width when FBITS=0
+
+    localparam ITER = WIDTH + FBITS;  // iterations: input width + fractional bits
+    localparam LATENCY = ITER + 1;    // input stage, then one stage per iteration
+
+    // Stage k holds the division after k iterations; stage 0 is the
+    // registered input, and the last iteration writes the outputs
+    logic [ITER-1:0] valid, dbz, ovf;
+    logic [WIDTH-1:0] b1 [0:ITER-1];          // copy of divisor
+    logic [WIDTH-1:0] quo [0:ITER-1];         // intermediate quotients
+    logic [WIDTH:0] acc [0:ITER-1];           // accumulators (1 bit wider)
+    logic [WIDTH-1:0] quo_next [0:ITER-1];
+    logic [WIDTH:0] acc_next [0:ITER-1];
+
+    // division algorithm iteration, one per stage
+    genvar k;
+    generate
+        for (k = 0; k < ITER; k = k + 1) begin : gen_iter
+            always_comb begin
+                if (acc[k] >= {1'b0, b1[k]}) begin
+                    acc_next[k] = acc[k] - b1[k];
+                    {acc_next[k], quo_next[k]} = {acc_next[k][WIDTH-1:0], quo[k], 1'b1};
+                end else begin
+                    {acc_next[k], quo_next[k]} = {acc[k], quo[k]} << 1;
+                end
+            end
+        end
+    endgenerate
+
+    // input stage: flag divide by zero and initialize the calculation
+    always_ff @(posedge i_clk) begin
+        valid[0] <= i_valid;
+        dbz[0] <= (b == 0);
+        ovf[0] <= 0;
+        b1[0] <= b;
+        {acc[0], quo[0]} <= {{WIDTH{1'b0}}, a, 1'b0};
+        if (i_rst) valid[0] <= 0;
+    end
+
+    // iteration stages; the integer part doesn't fit once WIDTH iterations
+    // leave bits in the top FBITS of the quotient
+    logic [ITER-1:0] ovf_next;
+    generate
+        for (k = 0; k < ITER; k = k + 1) begin : gen_ovf
+            if (FBITS > 0 && k == WIDTH-1) begin : gen_check
+                assign ovf_next[k] = ovf[k] || (!dbz[k] && quo_next[k][WIDTH-1:WIDTH-FBITSW] != 0);
+            end else begin : gen_pass
+                assign ovf_next[k] = ovf[k];
+            end
+        end
+
+        for (k = 0; k < ITER-1; k = k + 1) begin : gen_stage
+            always_ff @(posedge i_clk) begin
+                valid[k+1] <= valid[k];
+                dbz[k+1] <= dbz[k];
+                ovf[k+1] <= ovf_next[k];
+                b1[k+1] <= b1[k];
+                acc[k+1] <= acc_next[k];
+                quo[k+1] <= quo_next[k];
+                if (i_rst) valid[k+1] <= 0;
+            end
+        end
+    endgenerate
+
+    always_ff @(posedge i_clk) begin
+        o_done <= valid[ITER-1];
+        o_dbz <= dbz[ITER-1];
+        o_ovf <= ovf_next[ITER-1];
+        o_val <= (dbz[ITER-1] || ovf_next[ITER-1]) ? 0 : quo_next[ITER-1];
+        if (i_rst) begin
+            o_done <= 0;
+            o_dbz <= 0;
+            o_ovf <= 0;
+            o_val <= 0;
+        end
+    end
+
+    // like the iterative core, o_valid drops on a division by zero or an
+    // overflow while o_done marks every result
+    assign o_valid = o_done && !o_dbz && !o_ovf;
+endmodule
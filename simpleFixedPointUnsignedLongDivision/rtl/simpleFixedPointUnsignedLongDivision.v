@@ -31,7 +31,8 @@
 
 module simpleFixedPointUnsignedLongDivision #(
     parameter WIDTH=8,  // width of numbers in bits (integer and fractional)
-    parameter FBITS=4   // fractional bits within WIDTH
+    parameter FBITS=4,  // fractional bits within WIDTH
+    parameter RADIX=2   // quotient bits per clock: 2 for one, 4 for two
     ) (
     input wire logic i_clk,    // clock
     input wire logic i_rst,    // reset
@@ -51,6 +52,9 @@ module simpleFixedPointUnsignedLongDivision #(
     logic [WIDTH-1:0] b1;             // copy of divisor
     logic [WIDTH-1:0] quo, quo_next;  // intermediate quotient
     logic [WIDTH:0] acc, acc_next;    // accumulator (1 bit wider)
+    logic [WIDTH-1:0] quo_next2;      // radix 4: quotient and accumulator after a second iteration
+    logic [WIDTH:0] acc_next2;
+    logic two;                        // radix 4: two iterations this clock (all but an odd last one)
 
     localparam ITER = WIDTH + FBITS;  // iteration count: unsigned input width + fractional bits
     logic [$clog2(ITER)-1:0] i;       // iteration counter
@@ -66,6 +70,18 @@ module simpleFixedPointUnsignedLongDivision #(
         end
     end
 
+    // second iteration, chained after the first, for radix 4
+    always_comb begin
+        if (acc_next >= {1'b0, b1}) begin
+            acc_next2 = acc_next - b1;
+            {acc_next2, quo_next2} = {acc_next2[WIDTH-1:0], quo_next, 1'b1};
+        end
+        else begin
+            {acc_next2, quo_next2} = {acc_next, quo_next} << 1;
+        end
+        two = (RADIX == 4) && (i != ITER-1);
+    end
+
     // calculation control
     always_ff @(posedge i_clk) begin
         o_done <= 0;
@@ -97,14 +113,27 @@ module simpleFixedPointUnsignedLongDivision #(
                 o_valid <= 1;
                 o_val <= quo_next;
             end
-            // Check overflow
-            else if (i == WIDTH-1 && quo_next[WIDTH-1:WIDTH-FBITSW] != 0) begin  // overflow?
+            // Check overflow, on whichever iteration completes the integer part
+            else if ((i == WIDTH-1 && quo_next[WIDTH-1:WIDTH-FBITSW] != 0)
+                     || (two && i == WIDTH-2 && i != ITER-2 && quo_next2[WIDTH-1:WIDTH-FBITSW] != 0)) begin  // overflow?
                 o_busy <= 0;
                 o_done <= 1;
                 o_ovf <= 1;
                 o_val <= 0;
             end
-            // next iteration
+            // Last two iterations (radix 4)
+            else if (two && i == ITER-2) begin  // o_done
+                o_busy <= 0;
+                o_done <= 1;
+                o_valid <= 1;
+                o_val <= quo_next2;
+            end
+            // next iteration(s)
+            else if (two) begin
+                i <= i + 2;
+                acc <= acc_next2;
+                quo <= quo_next2;
+            end
             else begin 
                 i <= i + 1;
                 acc <= acc_next;
@@ -0,0 +1,19 @@
+import sys
+from pathlib import Path
+
+# The repository root holds the shared synthesis helper
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from tools.resources import main
+
+RTL = Path(__file__).resolve().parent.parent / "rtl"
+MODULES = ["simpleFixedPointUnsignedLongDivision", "pipelinedFixedPointUnsignedLongDivision"]
+
+
+def builds(args):
+    """The iterative core, then the pipelined one, at the same WIDTH and FBITS."""
+    parameters = {"WIDTH": args.width, "FBITS": args.fbits}
+    return [{"name": module, "module": module, "parameters": parameters} for module in MODULES]
+
+
+if __name__ == "__main__":
+    main(RTL, builds, 'Compare the synthesized size of the iterative and pipelined dividers')
@@ -0,0 +1,18 @@
+# !/bin/bash
+
+# oss-cad-suite env
+echo "        [VERILATOR] Sourcing OSS CAD Suite environment..."
+[ -n "$OSS_CAD_SUITE" ] || source ~/oss-cad-suite/environment
+if [ $? -ne 0 ]; then
+    echo "        [VERILATOR] Failed to source OSS CAD Suite environment. Exiting script."
+    exit 1
+fi
+
+# Run verilator as linter
+echo "        [VERILATOR] Running linter..."
+verilator --lint-only --Wall --cc -I${PWD}/../../../rtl/ ${PWD}/../../../rtl/pipelinedFixedPointUnsignedLongDivision.v
+if [ $? -ne 0 ]; then
+    echo "        [VERILATOR] FAIL: Verilator linter failed. Exiting script."
+    exit 1
+fi
+echo "        [VERILATOR] PASS: Verilator linter passed!"
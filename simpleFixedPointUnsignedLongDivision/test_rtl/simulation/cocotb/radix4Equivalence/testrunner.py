@@ -0,0 +1,15 @@
+import sys
+from pathlib import Path
+
+# The repository root holds the shared test tools
+sys.path.insert(0, str(Path(__file__).resolve().parents[5]))
+from tools.runner import Bench, main
+
+# An odd and an even number of iterations, each way round for the
+# integer part the overflow check ends on
+BENCH = Bench(__file__, "radix4Equivalence", sources=["simpleFixedPointUnsignedLongDivision", "radix4Equivalence"],
+              builds=[{"WIDTH": 7, "FBITS": 3}, {"WIDTH": 6, "FBITS": 5}],
+              env_prefix="DIV_")
+
+if __name__ == "__main__":
+    sys.exit(main(BENCH))
@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# The repository root holds the shared fixedpoint package
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from fixedpoint import hold
+
+WIDTH = 8   # simpleLongDivision.v's default
+
+
+def divide(a, b, width=WIDTH, initial=0):
+    """
+    What simpleLongDivision leaves on its outputs at o_done, for any number
+    of divisions at once.
+
+    A division by zero leaves the quotient and remainder as they were; the
+    divisions are taken to run in the order given (flattened).
+
+    Args:
+        a, b: Dividends and divisors, unsigned integers reduced to 'width'
+            bits. They broadcast together.
+        width: WIDTH, up to 31 bits.
+        initial: Quotient and remainder before the first division (0 after
+            reset).
+
+    Returns:
+        A tuple (o_result_quotient, o_result_remainder, o_valid, o_dbz) of
+        arrays shaped like the broadcast inputs.
+    """
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=np.int64), np.asarray(b, dtype=np.int64))
+    shape = a.shape
+    mask = (1 << width) - 1
+    a = a.ravel() & mask
+    b = b.ravel() & mask
+
+    o_dbz = b == 0
+    quotient, remainder = np.divmod(a, np.where(o_dbz, 1, b))
+    quotient = hold(quotient, ~o_dbz, initial)
+    remainder = hold(remainder, ~o_dbz, initial)
+    return quotient.reshape(shape), remainder.reshape(shape), (~o_dbz).reshape(shape), o_dbz.reshape(shape)
+
+
+def latency(a, b, width=WIDTH, radix=2):
+    """
+    Clocks from the edge that takes i_start to the one that raises o_done:
+    one for a division by zero, WIDTH+1 otherwise. RADIX=4 takes two
+    iterations a clock, halving (rounding up) the WIDTH of them.
+    """
+    _, b = np.broadcast_arrays(np.asarray(a, dtype=np.int64), np.asarray(b, dtype=np.int64))
+    steps = radix.bit_length() - 1  # iterations (quotient bits) a clock
+    return np.where(b & ((1 << width) - 1) == 0, 1, 1 + -(-width // steps))
@@ -0,0 +1,142 @@
+// =============================================================================
+// File        : simpleLongDivision.v
+// Author      : @fjpolo
+// email       : fjpolo@gmail.com
+// Description : Iterative unsigned integer long division: quotient and
+//               remainder, one (RADIX=2) or two (RADIX=4) bits a clock.
+// License     : MIT License
+//
+// Copyright (c) 2025 | @fjpolo
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in all
+// copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+// =============================================================================
+
+`default_nettype none
+`timescale 1ps/1ps
+
+module simpleLongDivision #(
+    parameter WIDTH=8,  // width of numbers in bits
+    parameter RADIX=2   // quotient bits per clock: 2 for one, 4 for two
+    ) (
+    input wire logic i_clk,    // clock
+    input wire logic i_rst,    // reset
+    input wire logic i_start,  // start calculation
+    output     logic o_busy,   // calculation in progress
+    output     logic o_done,   // calculation is complete (high for one tick)
+    output     logic o_valid,  // result is valid
+    output     logic o_dbz,    // divide by zero
+    input wire logic [WIDTH-1:0] i_operandA,          // dividend (numerator)
+    input wire logic [WIDTH-1:0] i_operandB,          // divisor (denominator)
+    output     logic [WIDTH-1:0] o_result_quotient,   // result value: quotient
+    output     logic [WIDTH-1:0] o_result_remainder   // result: remainder
+    );
+
+    logic [WIDTH-1:0] b1;             // copy of divisor
+    logic [WIDTH-1:0] quo, quo_next;  // intermediate quotient
+    logic [WIDTH:0] acc, acc_next;    // accumulator (1 bit wider)
+    logic [WIDTH-1:0] quo_next2;      // radix 4: quotient and accumulator after a second iteration
+    logic [WIDTH:0] acc_next2;
+    logic two;                        // radix 4: two iterations this clock (all but an odd last one)
+    logic [$clog2(WIDTH)-1:0] i;      // iteration counter
+
+    // division algorithm iteration
+    always_comb begin
+        if (acc >= {1'b0, b1}) begin
+            acc_next = acc - b1;
+            {acc_next, quo_next} = {acc_next[WIDTH-1:0], quo, 1'b1};
+        end
+        else begin
+            {acc_next, quo_next} = {acc, quo} << 1;
+        end
+    end
+
+    // second iteration, chained after the first, for radix 4
+    always_comb begin
+        if (acc_next >= {1'b0, b1}) begin
+            acc_next2 = acc_next - b1;
+            {acc_next2, quo_next2} = {acc_next2[WIDTH-1:0], quo_next, 1'b1};
+        end
+        else begin
+            {acc_next2, quo_next2} = {acc_next, quo_next} << 1;
+        end
+        two = (RADIX == 4) && (i != WIDTH-1);
+    end
+
+    // calculation control
+    always_ff @(posedge i_clk) begin
+        o_done <= 0;
+        // i_start
+        if (i_start) begin
+            o_valid <= 0;
+            i <= 0;
+            // i_operandB == 0
+            if (i_operandB == 0) begin  // catch divide by zero
+                o_busy <= 0;
+                o_done <= 1;
+                o_dbz <= 1;
+            end
+            // i_operandB != 0
+            else begin
+                o_busy <= 1;
+                o_dbz <= 0;
+                b1 <= i_operandB;
+                {acc, quo} <= {{WIDTH{1'b0}}, i_operandA, 1'b0};  // initialize calculation
+            end
+        end
+        // o_busy
+        else if (o_busy) begin
+            // Last counter iteration
+            if (i == WIDTH-1) begin  // o_done
+                o_busy <= 0;
+                o_done <= 1;
+                o_valid <= 1;
+                o_result_quotient <= quo_next;
+                o_result_remainder <= acc_next[WIDTH:1];  // undo final shift
+            end
+            // Last two iterations (radix 4)
+            else if (two && i == WIDTH-2) begin  // o_done
+                o_busy <= 0;
+                o_done <= 1;
+                o_valid <= 1;
+                o_result_quotient <= quo_next2;
+                o_result_remainder <= acc_next2[WIDTH:1];  // undo final shift
+            end
+            // next iteration(s)
+            else if (two) begin
+                i <= i + 2;
+                acc <= acc_next2;
+                quo <= quo_next2;
+            end
+            else begin
+                i <= i + 1;
+                acc <= acc_next;
+                quo <= quo_next;
+            end
+        end
+        // i_rst
+        if (i_rst) begin
+            o_busy <= 0;
+            o_done <= 0;
+            o_valid <= 0;
+            o_dbz <= 0;
+            o_result_quotient <= 0;
+            o_result_remainder <= 0;
+        end
+    end
+endmodule
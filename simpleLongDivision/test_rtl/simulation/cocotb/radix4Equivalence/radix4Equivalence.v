@@ -0,0 +1,89 @@
+// =============================================================================
+// File        : radix4Equivalence.v
+// Author      : @fjpolo
+// email       : fjpolo@gmail.com
+// Description : Two simpleLongDivision cores, RADIX=2 and RADIX=4,
+//               side by side on the same inputs for the equivalence and
+//               clock count test.
+// License     : MIT License
+//
+// Copyright (c) 2025 | @fjpolo
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in all
+// copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+// =============================================================================
+
+`default_nettype none
+`timescale 1ps/1ps
+
+module radix4Equivalence #(
+    parameter WIDTH=8   // width of numbers in bits
+    ) (
+    input wire logic i_clk,    // clock
+    input wire logic i_rst,    // reset
+    input wire logic i_start,  // start both calculations
+    input wire logic [WIDTH-1:0] i_operandA,  // dividend (numerator)
+    input wire logic [WIDTH-1:0] i_operandB,  // divisor (denominator)
+    output     logic o_done_r2,   // radix 2 core's outputs
+    output     logic o_valid_r2,
+    output     logic o_dbz_r2,
+    output     logic [WIDTH-1:0] o_result_quotient_r2,
+    output     logic [WIDTH-1:0] o_result_remainder_r2,
+    output     logic o_done_r4,   // radix 4 core's outputs
+    output     logic o_valid_r4,
+    output     logic o_dbz_r4,
+    output     logic [WIDTH-1:0] o_result_quotient_r4,
+    output     logic [WIDTH-1:0] o_result_remainder_r4
+    );
+
+    logic o_busy_r2, o_busy_r4;
+
+    simpleLongDivision #(
+        .WIDTH(WIDTH),
+        .RADIX(2)
+    ) radix2 (
+        .i_clk(i_clk),
+        .i_rst(i_rst),
+        .i_start(i_start),
+        .i_operandA(i_operandA),
+        .i_operandB(i_operandB),
+        .o_busy(o_busy_r2),
+        .o_dbz(o_dbz_r2),
+        .o_done(o_done_r2),
+        .o_valid(o_valid_r2),
+        .o_result_quotient(o_result_quotient_r2),
+        .o_result_remainder(o_result_remainder_r2)
+    );
+
+    simpleLongDivision #(
+        .WIDTH(WIDTH),
+        .RADIX(4)
+    ) radix4 (
+        .i_clk(i_clk),
+        .i_rst(i_rst),
+        .i_start(i_start),
+        .i_operandA(i_operandA),
+        .i_operandB(i_operandB),
+        .o_busy(o_busy_r4),
+        .o_dbz(o_dbz_r4),
+        .o_done(o_done_r4),
+        .o_valid(o_valid_r4),
+        .o_result_quotient(o_result_quotient_r4),
+        .o_result_remainder(o_result_remainder_r4)
+    );
+endmodule
@@ -0,0 +1,14 @@
+import sys
+from pathlib import Path
+
+# The repository root holds the shared test tools
+sys.path.insert(0, str(Path(__file__).resolve().parents[5]))
+from tools.runner import Bench, main
+
+# An even and an odd number of iterations
+BENCH = Bench(__file__, "radix4Equivalence", sources=["simpleLongDivision", "radix4Equivalence"],
+              builds=[{"WIDTH": 8}, {"WIDTH": 7}],
+              env_prefix="DIV_")
+
+if __name__ == "__main__":
+    sys.exit(main(BENCH))
@@ -2,158 +2,149 @@
 ## (C)2023 Will Green, open source software released under the MIT License
 ## Learn more at https://projectf.io/verilog-lib/
 
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
 import cocotb
 from cocotb.clock import Clock
-from cocotb.triggers import RisingEdge, Timer
+from cocotb.triggers import FallingEdge, RisingEdge, Timer
+from cocotb.utils import get_sim_time
+
+# simpleLongDivision/python holds the vectorized model
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / "python"))
+from design import hold, latency
+
+# The repository root holds the shared test tools
+sys.path.insert(0, str(Path(__file__).resolve().parents[5]))
+from tools.latency import LatencyMonitor
+
+# Must match the parameters the runner builds with
+WIDTH = int(os.getenv("DIV_WIDTH", "8"))
+RADIX = int(os.getenv("DIV_RADIX", "2"))
+# Random pairs to divide after the corner cases, or "all" for every (a, b)
+PAIRS = os.getenv("DIV_PAIRS", "1000000")
+SEED = int(os.getenv("DIV_SEED", "1"))
+# Random pairs timed (after the hand-picked ones) for the latency
+# histograms, and a JSON file to add the histograms to
+LATENCY_PAIRS = int(os.getenv("DIV_LATENCY_PAIRS", "2000"))
+LATENCY_REPORT = os.getenv("LATENCY_REPORT")
+
+# The pairs the testbench used to run one test each: exact quotients,
+# remainders, the widest operands and a division after a division by zero
+HAND_PICKED = [(1, 1), (0, 2), (6, 2), (15, 3), (15, 5), (7, 2), (2, 7), (97, 13),
+               (255, 16), (255, 255), (255, 254), (254, 255), (2, 0), (251, 13)]
+
+def operands():
+    """Hand-picked and corner pairs, every combination of the corner values, then PAIRS random ones."""
+    top = (1 << WIDTH) - 1
+    if PAIRS == "all":
+        values = np.arange(top + 1, dtype=np.int64)
+        a, b = np.meshgrid(values, values, indexing="ij")
+        return a.ravel(), b.ravel()
+    hand = np.array(HAND_PICKED, dtype=np.int64) & top
+    corners = np.unique(np.array([0, 1, 2, 3, top >> 1, (top >> 1) + 1, top - 1, top], dtype=np.int64))
+    ca, cb = np.meshgrid(corners, corners, indexing="ij")
+    rng = np.random.default_rng(SEED)
+    ra, rb = rng.integers(0, top + 1, (2, int(PAIRS)), dtype=np.int64)
+    return np.concatenate([hand[:, 0], ca.ravel(), ra]), np.concatenate([hand[:, 1], cb.ravel(), rb])
 
 async def reset_dut(dut):
-    await RisingEdge(dut.i_clk)
-    dut.i_rst.value = 0
-    await RisingEdge(dut.i_clk)
+    dut.i_start.value = 0
+    dut.i_operandA.value = 0
+    dut.i_operandB.value = 0
     dut.i_rst.value = 1
     await RisingEdge(dut.i_clk)
-    dut.i_rst.value = 0
-    await RisingEdge(dut.i_clk)
-
-async def test_dut_divide(dut, i_operandA, i_operandB, log=True):
-    cocotb.start_soon(Clock(dut.i_clk, 1, units="ns").start())
-    await reset_dut(dut)
-
-    await RisingEdge(dut.i_clk)
-    dut.i_operandA.value = i_operandA
-    dut.i_operandB.value = i_operandB
-    dut.i_start.value = 1
-
     await RisingEdge(dut.i_clk)
-    dut.i_start.value = 0
-
-    # wait for calculation to complete
-    while not dut.o_done.value:
-        await RisingEdge(dut.i_clk)
-
-    # model division
-    model_c = i_operandA // i_operandB
-    model_r = i_operandA % i_operandB
-
-    # log numberical signals (note width formatting of model answers)
-    if (log):
-        dut._log.info('dut i_operandA:     ' + dut.i_operandA.value.binstr)
-        dut._log.info('dut i_operandB:     ' + dut.i_operandB.value.binstr)
-        dut._log.info('dut o_result_quotient:   ' + dut.o_result_quotient.value.binstr)
-        dut._log.info('dut o_result_remainder:   ' + dut.o_result_remainder.value.binstr)
-        dut._log.info('model o_result_quotient: ' + '{0:08b}'.format(model_c))
-        dut._log.info('model o_result_remainder: ' + '{0:08b}'.format(model_r))
-
-    # check output signals on 'o_done'
-    assert dut.o_busy.value == 0, "o_busy is not 0!"
-    assert dut.o_done.value == 1, "o_done is not 1!"
-    assert dut.o_valid.value == 1, "o_valid is not 1!"
-    assert dut.o_dbz.value == 0, "o_dbz is not 0!"
-    assert dut.o_result_quotient.value == model_c, "dut o_result_quotient doesn't match model o_result_quotient"
-    assert dut.o_result_remainder.value == model_r, "dut o_result_remainder doesn't match model o_result_remainder"
-
-    # check 'o_done' is high for one tick
-    await RisingEdge(dut.i_clk)
-    assert dut.o_done.value == 0, "o_done is not 0!"
-
-
-# simple division tests (no remainder)
-@cocotb.test()
-async def simple_1(dut):
-    """Test 1/1"""
-    await test_dut_divide(dut=dut, i_operandA=1, i_operandB=1)
-
-@cocotb.test()
-async def simple_2(dut):
-    """Test 0/2"""
-    await test_dut_divide(dut=dut, i_operandA=0, i_operandB=2)
-
-@cocotb.test()
-async def simple_3(dut):
-    """Test 6/2"""
-    await test_dut_divide(dut=dut, i_operandA=6, i_operandB=2)
-
-@cocotb.test()
-async def simple_4(dut):
-    """Test 15/3"""
-    await test_dut_divide(dut=dut, i_operandA=15, i_operandB=3)
-
-@cocotb.test()
-async def simple_5(dut):
-    """Test 15/5"""
-    await test_dut_divide(dut=dut, i_operandA=15, i_operandB=5)
-
-
-# remainder tests
-@cocotb.test()
-async def rem_1(dut):
-    """Test 7/2"""
-    await test_dut_divide(dut=dut, i_operandA=7, i_operandB=2)
-
-@cocotb.test()
-async def rem_2(dut):
-    """Test 2/7"""
-    await test_dut_divide(dut=dut, i_operandA=2, i_operandB=7)
-
-@cocotb.test()
-async def rem_3(dut):
-    """Test 97/13"""
-    await test_dut_divide(dut=dut, i_operandA=97, i_operandB=13)
-
-
-# edge tests
-@cocotb.test()
-async def edge_1(dut):
-    """Test 255/16"""
-    await test_dut_divide(dut=dut, i_operandA=255, i_operandB=16)
-
-@cocotb.test()
-async def edge_2(dut):
-    """Test 255/255"""
-    await test_dut_divide(dut=dut, i_operandA=255, i_operandB=255)
+    dut.i_rst.value = 0
 
-@cocotb.test()
-async def edge_3(dut):
-    """Test 255/254"""
-    await test_dut_divide(dut=dut, i_operandA=255, i_operandB=254)
+async def stream(dut, a, b, period_ns=1):
+    """
+    Divides the pairs back to back in one simulation: each i_start comes
+    on the clock o_done rises for the previous pair, and the testbench
+    sleeps through the iterations instead of waking up every clock.
+
+    Returns, per pair, o_busy and o_done the clock after i_start, then
+    o_done, o_valid, o_dbz, quotient and remainder at latency().
+    """
+    results = np.zeros((len(a), 7), dtype=np.int64)
+    clocks = latency(a, b, WIDTH, RADIX).tolist()
+    # Inputs change on the falling edge, outputs are read on falling edges
+    await FallingEdge(dut.i_clk)
+    for k, (a_k, b_k, clocks_k) in enumerate(zip(a.tolist(), b.tolist(), clocks)):
+        dut.i_operandA.value = a_k
+        dut.i_operandB.value = b_k
+        dut.i_start.value = 1
+        await FallingEdge(dut.i_clk)
+        dut.i_start.value = 0
+        first = (int(dut.o_busy.value), int(dut.o_done.value))
+        if clocks_k > 1:
+            await Timer((clocks_k - 1) * period_ns, units="ns")
+        results[k] = (*first, int(dut.o_done.value), int(dut.o_valid.value), int(dut.o_dbz.value),
+                      dut.o_result_quotient.value.integer, dut.o_result_remainder.value.integer)
+    return results
 
 @cocotb.test()
-async def edge_4(dut):
-    """Test 254/255"""
-    await test_dut_divide(dut=dut, i_operandA=254, i_operandB=255)
+async def test_divide_stream(dut):
+    """Corner and random pairs back to back in one simulation, checked against np.divmod in bulk"""
+    cocotb.start_soon(Clock(dut.i_clk, 1, units="ns").start())
+    await reset_dut(dut)
 
+    a, b = operands()
+    start = get_sim_time(units="ns")
+    results = await stream(dut, a, b)
+    clocks = int(get_sim_time(units="ns") - start)
+    busy, done_early, done, valid, dbz, quotient, remainder = results.T
+
+    # A division by zero finishes on the clock that takes i_start and
+    # leaves quotient and remainder as they were (0 after reset)
+    o_dbz = b == 0
+    model_q, model_r = np.divmod(a, np.where(o_dbz, 1, b))
+    model_q = hold(model_q, ~o_dbz)
+    model_r = hold(model_r, ~o_dbz)
+
+    assert done.all(), f"o_done low latency() clocks after i_start for {int((done == 0).sum())} pairs"
+    assert np.array_equal(busy, ~o_dbz), "o_busy isn't high (only) while dividing"
+    assert np.array_equal(done_early, o_dbz), "o_done isn't high for one tick at the end"
+    bad = (valid != ~o_dbz) | (dbz != o_dbz) | (quotient != model_q) | (remainder != model_r)
+    for k in np.flatnonzero(bad)[:8]:
+        dut._log.error(f"{a[k]:0{WIDTH}b} / {b[k]:0{WIDTH}b}: dut quotient {quotient[k]:0{WIDTH}b} "
+                       f"remainder {remainder[k]:0{WIDTH}b} valid {valid[k]} dbz {dbz[k]}, model quotient "
+                       f"{model_q[k]:0{WIDTH}b} remainder {model_r[k]:0{WIDTH}b} dbz {int(o_dbz[k])}")
+    dut._log.info(f"WIDTH={WIDTH} RADIX={RADIX}: {len(a)} pairs ({int(o_dbz.sum())} by zero) in {clocks} clocks, "
+                  f"{int(bad.sum())} mismatches")
+    assert not bad.any(), "dut doesn't match np.divmod"
+
+def operand_class(operands, flags):
+    a, _ = operands
+    o_dbz, = flags
+    if o_dbz:
+        return "dbz"
+    return "zero" if a == 0 else "result"
 
-# divide by zero tests
 @cocotb.test()
-async def dbz_1(dut):
-    """Test 2/0 [div by zero]"""
+async def test_latency_histogram(dut):
+    """Times hand-picked and random divisions on the ports and checks their latency histograms against the model"""
     cocotb.start_soon(Clock(dut.i_clk, 1, units="ns").start())
     await reset_dut(dut)
 
-    await RisingEdge(dut.i_clk)
-    i_operandA = 2
-    i_operandB = 0
-    dut.i_operandA.value = i_operandA
-    dut.i_operandB.value = i_operandB
-    dut.i_start.value = 1
-
-    await RisingEdge(dut.i_clk)
-    dut.i_start.value = 0
-    # wait for calculation to complete
-    while not dut.o_done.value:
-        await RisingEdge(dut.i_clk)
-
-    # check output signals on 'o_done'
-    assert dut.o_busy.value == 0, "o_busy is not 0!"
-    assert dut.o_done.value == 1, "o_done is not 1!"
-    assert dut.o_valid.value == 0, "o_valid is not 0!"
-    assert dut.o_dbz.value == 1, "o_dbz is not 1!"
-
-    # check 'o_done' is high for one tick
-    await RisingEdge(dut.i_clk)
-    assert dut.o_done.value == 0, "o_done is not 0!"
-
-@cocotb.test()
-async def dbz_2(dut):
-    """Test 251/13 [after o_dbz]"""
-    await test_dut_divide(dut=dut, i_operandA=251, i_operandB=13)
\ No newline at end of file
+    top = (1 << WIDTH) - 1
+    hand = np.array(HAND_PICKED, dtype=np.int64) & top
+    rng = np.random.default_rng(SEED)
+    ra, rb = rng.integers(0, top + 1, (2, LATENCY_PAIRS), dtype=np.int64)
+    a, b = np.concatenate([hand[:, 0], ra]), np.concatenate([hand[:, 1], rb])
+
+    monitor = LatencyMonitor(dut.i_clk, dut.i_start, dut.o_done, f"simpleLongDivision WIDTH={WIDTH} RADIX={RADIX}",
+                             sample_start=lambda: (dut.i_operandA.value.integer, dut.i_operandB.value.integer),
+                             sample_done=lambda: (int(dut.o_dbz.value),),
+                             classify=operand_class).start()
+    results = await stream(dut, a, b)
+    monitor.stop()
+    dut._log.info(monitor.summary())
+    if LATENCY_REPORT:
+        monitor.write_json(LATENCY_REPORT)
+
+    assert results[:, 2].all(), "o_done low latency() clocks after i_start"
+    assert monitor.latencies == latency(a, b, WIDTH, RADIX).tolist(), "latencies don't match the model's latency()"
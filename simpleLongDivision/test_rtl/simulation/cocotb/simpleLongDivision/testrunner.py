@@ -0,0 +1,15 @@
+import sys
+from pathlib import Path
+
+# The repository root holds the shared test tools
+sys.path.insert(0, str(Path(__file__).resolve().parents[5]))
+from tools.runner import Bench, main
+
+# A million random pairs plus the corners through each build, in one
+# simulation each
+BENCH = Bench(__file__, "simpleLongDivision",
+              builds=[{"WIDTH": 8, "RADIX": 2}, {"WIDTH": 8, "RADIX": 4}, {"WIDTH": 16, "RADIX": 2}],
+              env_prefix="DIV_")
+
+if __name__ == "__main__":
+    sys.exit(main(BENCH))
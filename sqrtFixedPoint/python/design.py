@@ -0,0 +1,70 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# The repository root holds the shared fixedpoint package
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from fixedpoint import to_fixed, to_real
+
+WIDTH = 8   # sqrtFixedPoint.v's defaults
+FBITS = 0
+
+
+def isqrt(n):
+    """
+    Integer square roots, floor(sqrt(n)), of an array of non-negative
+    integers below 2**62.
+
+    The float64 square root is within one of the answer for n this size;
+    the two integer corrections make it exact.
+    """
+    n = np.asarray(n, dtype=np.int64)
+    root = np.sqrt(n.astype(np.float64)).astype(np.int64)
+    root -= root * root > n
+    root += (root + 1) * (root + 1) <= n
+    return root
+
+
+def sqrt(rad, width=WIDTH, fbits=FBITS):
+    """
+    What sqrtFixedPoint leaves on root and rem once valid, for any number of
+    radicands at once.
+
+    The core takes the square root of rad * 2**fbits two bits at a time, so
+    root is floor(sqrt(rad)) with 'fbits' fractional bits and rem is what is
+    left of rad * 2**fbits, both reduced to 'width' bits as the registers
+    hold them (rem needs up to ceil((width+fbits)/2)+1 bits).
+
+    Args:
+        rad: Radicands, raw unsigned fixed-point integers with 'fbits'
+            fractional bits, reduced to 'width' bits.
+        width: WIDTH, with width + fbits up to 62 bits.
+        fbits: FBITS, at most WIDTH (WIDTH-1 if WIDTH+FBITS is odd) so the
+            root fits.
+
+    Returns:
+        A tuple (root, rem) of arrays shaped like rad.
+    """
+    mask = (1 << width) - 1
+    n = (np.asarray(rad, dtype=np.int64) & mask) << fbits
+    root = isqrt(n)
+    return root & mask, (n - root * root) & mask
+
+
+def iterations(width=WIDTH, fbits=FBITS):
+    """ITER_COUNT: one iteration per two bits of rad * 2**fbits, rounded up."""
+    return (width + fbits + 1) // 2
+
+
+def latency(width=WIDTH, fbits=FBITS):
+    """Clocks from the edge that takes start to the one that raises valid."""
+    return iterations(width, fbits) + 1
+
+
+def pipeline_latency(width=WIDTH, fbits=FBITS, steps=1):
+    """
+    Clocks from start to valid in pipelinedSqrtFixedPoint: the input stage
+    and one per STEPS iterations (the same as sqrtFixedPoint for STEPS=1).
+    """
+    return -(-iterations(width, fbits) // steps) + 1
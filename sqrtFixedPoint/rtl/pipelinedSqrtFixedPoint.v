@@ -0,0 +1,131 @@
+// =============================================================================
+// File        : pipelinedSqrtFixedPoint.v
+// Author      : @fjpolo
+// email       : fjpolo@gmail.com
+// Description : Pipelined version of sqrtFixedPoint: one square root per
+//               clock, STEPS iterations per stage, same root and remainder.
+// License     : MIT License
+//
+// Copyright (c) 2025 | @fjpolo
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in all
+// copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+// =============================================================================
+
+`default_nettype none
+`timescale 1ps/1ps
+
+module pipelinedSqrtFixedPoint #(
+    parameter WIDTH=8,   // width of radicand
+    parameter FBITS=0,   // fractional bits (for fixed point)
+    parameter STEPS=1    // iterations per pipeline stage
+)(
+    input wire logic clk,
+    input wire logic rst,
+    input wire logic start,            // rad holds a radicand to take (one per clock)
+    output      logic valid,           // root and rem hold a result (for one clock)
+    input wire logic [WIDTH-1:0] rad,  // radicand
+    output      logic [WIDTH-1:0] root,  // root (holds the last result)
+    output      logic [WIDTH-1:0] rem    // remainder (holds the last result)
+);
+
+    // Same iterations as sqrtFixedPoint, STEPS to a stage
+    localparam ITER_COUNT = (WIDTH + FBITS + 1) / 2;             // Iterations needed, ceiling division
+    localparam ALIGN = 2 * ITER_COUNT - (WIDTH + FBITS);        // 1 for an odd WIDTH+FBITS
+    localparam STAGES = (ITER_COUNT + STEPS - 1) / STEPS;       // pipeline stages after the input one
+    localparam LATENCY = STAGES + 1;                            // clocks from start to valid
+
+    // Stage s registers hold the calculation after s*STEPS iterations
+    logic [STAGES-1:0] stage_valid;
+    logic [WIDTH-1:0] x [0:STAGES-1];     // radicand copies
+    logic [WIDTH-1:0] q [0:STAGES-1];     // intermediate roots
+    logic [WIDTH+1:0] ac [0:STAGES-1];    // accumulators (2 bits wider)
+
+    // Iteration k's inputs (a stage register, or the previous iteration)
+    // and results
+    logic [WIDTH-1:0] x_in [0:ITER_COUNT-1], x_next [0:ITER_COUNT-1];
+    logic [WIDTH-1:0] q_in [0:ITER_COUNT-1], q_next [0:ITER_COUNT-1];
+    logic [WIDTH+1:0] ac_in [0:ITER_COUNT-1], ac_next [0:ITER_COUNT-1];
+    logic [WIDTH+1:0] test_res [0:ITER_COUNT-1];  // sign test results (2 bits wider)
+
+    genvar k;
+    generate
+        for (k = 0; k < ITER_COUNT; k = k + 1) begin : gen_iter
+            if (k % STEPS == 0) begin : gen_first  // first of a stage's iterations
+                always @(*) begin
+                    x_in[k] = x[k/STEPS];
+                    q_in[k] = q[k/STEPS];
+                    ac_in[k] = ac[k/STEPS];
+                end
+            end else begin : gen_chained
+                always @(*) begin
+                    x_in[k] = x_next[k-1];
+                    q_in[k] = q_next[k-1];
+                    ac_in[k] = ac_next[k-1];
+                end
+            end
+
+            always @(*) begin
+                test_res[k] = ac_in[k] - {q_in[k], 2'b01};
+                if (test_res[k][WIDTH+1] == 0) begin  // test_res ≥0? (check MSB)
+                    {ac_next[k], x_next[k]} = {test_res[k][WIDTH-1:0], x_in[k], 2'b0};
+                    q_next[k] = {q_in[k][WIDTH-2:0], 1'b1};
+                end else begin
+                    {ac_next[k], x_next[k]} = {ac_in[k][WIDTH-1:0], x_in[k], 2'b0};
+                    q_next[k] = q_in[k] << 1;
+                end
+            end
+        end
+    endgenerate
+
+    // input stage: ac takes the radicand's top two bits (one for ALIGN=1),
+    // x the rest followed by zeros
+    always @(posedge clk) begin
+        stage_valid[0] <= start;
+        q[0] <= 0;
+        {ac[0], x[0]} <= {{WIDTH{1'b0}}, rad, 2'b0} >> ALIGN;
+        if (rst) stage_valid[0] <= 0;
+    end
+
+    // iteration stages
+    generate
+        for (k = 1; k < STAGES; k = k + 1) begin : gen_stage
+            always @(posedge clk) begin
+                stage_valid[k] <= stage_valid[k-1];
+                x[k] <= x_next[k*STEPS-1];
+                q[k] <= q_next[k*STEPS-1];
+                ac[k] <= ac_next[k*STEPS-1];
+                if (rst) stage_valid[k] <= 0;
+            end
+        end
+    endgenerate
+
+    // results
+    always @(posedge clk) begin
+        valid <= stage_valid[STAGES-1];
+        if (stage_valid[STAGES-1]) begin
+            root <= q_next[ITER_COUNT-1];
+            rem <= ac_next[ITER_COUNT-1][WIDTH+1:2];  // undo final shift
+        end
+        if (rst) begin
+            valid <= 0;
+            root <= 0;
+            rem <= 0;
+        end
+    end
+endmodule
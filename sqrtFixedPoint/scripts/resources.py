@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+# The repository root holds the shared synthesis helper, sqrtFixedPoint/python the model
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "python"))
+from tools.resources import main
+from design import iterations, latency, pipeline_latency
+
+RTL = Path(__file__).resolve().parent.parent / "rtl"
+
+
+def arguments(parser):
+    parser.add_argument('--steps', default=None,
+                        help='comma separated iterations per stage (default 1, 2, 3, 4, 6 and all of them)')
+
+
+def builds(args):
+    """
+    The iterative core, then pipelinedSqrtFixedPoint with each --steps
+    iterations per stage, with their latency and results per clock.
+    """
+    iters = iterations(args.width, args.fbits)
+    if args.steps:
+        steps = [int(step) for step in args.steps.split(',')]
+    else:
+        steps = sorted({step for step in (1, 2, 3, 4, 6) if step < iters} | {iters})
+
+    parameters = {"WIDTH": args.width, "FBITS": args.fbits}
+    rows = [{"name": "sqrtFixedPoint", "module": "sqrtFixedPoint", "parameters": parameters,
+             "latency": latency(args.width, args.fbits), "per_clock": 1 / latency(args.width, args.fbits)}]
+    for step in steps:
+        rows.append({"name": f"pipelinedSqrtFixedPoint STEPS={step}", "module": "pipelinedSqrtFixedPoint",
+                     "parameters": {**parameters, "STEPS": step},
+                     "latency": pipeline_latency(args.width, args.fbits, step), "per_clock": 1.0})
+    return rows
+
+
+if __name__ == "__main__":
+    main(RTL, builds, 'Area of the pipelined square root per pipeline depth, against the iterative core',
+         width=16, fbits=8, arguments=arguments)
@@ -0,0 +1,85 @@
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import FallingEdge, RisingEdge
+
+# sqrtFixedPoint/python holds the vectorized model
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / "python"))
+from design import pipeline_latency, sqrt, to_real
+
+# Must match the parameters the runner builds with
+WIDTH = int(os.getenv("SQRT_WIDTH", "16"))
+FBITS = int(os.getenv("SQRT_FBITS", "8"))
+STEPS = int(os.getenv("SQRT_STEPS", "1"))
+LATENCY = pipeline_latency(WIDTH, FBITS, STEPS)
+# Radicands: "all" of them (the default up to WIDTH=16), or a number of random ones
+STREAM = os.getenv("SQRT_STREAM", "all" if WIDTH <= 16 else "100000")
+BUBBLES = float(os.getenv("SQRT_BUBBLES", "0.1"))  # chance of an idle clock, below 1
+SEED = int(os.getenv("SQRT_SEED", "1"))
+
+async def reset_dut(dut):
+    dut.start.value = 0
+    dut.rad.value = 0
+    dut.rst.value = 1
+    await RisingEdge(dut.clk)
+    await RisingEdge(dut.clk)
+    dut.rst.value = 0
+
+@cocotb.test()
+async def test_stream(dut):
+    """Stream radicands at one per clock, with random bubbles, and check the roots in bulk"""
+    cocotb.start_soon(Clock(dut.clk, 1, units="ns").start())
+    await reset_dut(dut)
+
+    rng = np.random.default_rng(SEED)
+    if STREAM == "all":
+        rad = rng.permutation(1 << WIDTH)
+    else:
+        rad = rng.integers(0, 1 << WIDTH, int(STREAM), dtype=np.int64)
+    num_rad = len(rad)
+
+    # Clock by clock: start and which radicand it carries, then the outputs.
+    # Each radicand follows a geometric number of idle clocks.
+    idle = rng.geometric(1 - BUBBLES, num_rad) - 1
+    starts = np.cumsum(idle + 1) - 1
+    start = np.zeros(starts[-1] + 1, dtype=bool)
+    start[starts] = True
+    which = np.cumsum(start) - 1
+    num_clocks = len(start) + LATENCY
+    values = rad.tolist()
+    valid = np.zeros(num_clocks, dtype=bool)
+    outputs = np.zeros((num_clocks, 2), dtype=np.int64)
+
+    # Inputs change on the falling edge, outputs are read on the next
+    # falling edge, half a clock after the rising edge that set them.
+    await FallingEdge(dut.clk)
+    for clock in range(num_clocks):
+        if clock < len(start) and start[clock]:
+            dut.start.value = 1
+            dut.rad.value = values[which[clock]]
+        else:
+            dut.start.value = 0
+        await FallingEdge(dut.clk)
+        valid[clock] = bool(dut.valid.value)
+        if valid[clock]:
+            outputs[clock] = (dut.root.value.integer, dut.rem.value.integer)
+
+    # Every radicand comes out LATENCY clocks after it went in, in order
+    expected_valid = np.zeros(num_clocks, dtype=bool)
+    expected_valid[np.flatnonzero(start) + LATENCY - 1] = True
+    assert np.array_equal(valid, expected_valid), f"valid doesn't follow start by {LATENCY} clocks"
+
+    results = outputs[valid]
+    root, rem = sqrt(rad, WIDTH, FBITS)
+    bad = (results[:, 0] != root) | (results[:, 1] != rem)
+    for k in np.flatnonzero(bad)[:8]:
+        dut._log.error(f"sqrt({to_real(rad[k], FBITS)}): dut root {to_real(results[k, 0], FBITS)} rem {results[k, 1]}, "
+                       f"model root {to_real(root[k], FBITS)} rem {rem[k]}")
+    dut._log.info(f"WIDTH={WIDTH} FBITS={FBITS} STEPS={STEPS}: {num_rad} roots in {num_clocks} clocks "
+                  f"({num_rad / num_clocks:.3f} per clock), latency {LATENCY}, {int(bad.sum())} mismatches")
+    assert not bad.any(), "dut doesn't match the model"
@@ -0,0 +1,16 @@
+import sys
+from pathlib import Path
+
+# The repository root holds the shared test tools
+sys.path.insert(0, str(Path(__file__).resolve().parents[5]))
+from tools.runner import Bench, main
+
+# Every radicand through a full pipeline and a three-iterations-a-stage
+# one, then random ones through a wide build
+BENCH = Bench(__file__, "pipelinedSqrtFixedPoint",
+              builds=[{"WIDTH": 16, "FBITS": 8, "STEPS": 1}, {"WIDTH": 16, "FBITS": 8, "STEPS": 3},
+                      {"WIDTH": 32, "FBITS": 16, "STEPS": 4}],
+              env_prefix="SQRT_")
+
+if __name__ == "__main__":
+    sys.exit(main(BENCH))
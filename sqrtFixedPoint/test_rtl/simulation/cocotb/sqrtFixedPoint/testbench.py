@@ -1,8 +1,101 @@
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
 import cocotb
-from cocotb.triggers import Timer
+from cocotb.clock import Clock
+from cocotb.triggers import FallingEdge, Timer
+from cocotb.utils import get_sim_time
+
+# sqrtFixedPoint/python holds the vectorized model
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / "python"))
+from design import latency, sqrt, to_real
+
+# The repository root holds the shared test tools
+sys.path.insert(0, str(Path(__file__).resolve().parents[5]))
+from tools.latency import LatencyMonitor
+
+# Must match the parameters the runner builds with
+WIDTH = int(os.getenv("SQRT_WIDTH", "16"))
+FBITS = int(os.getenv("SQRT_FBITS", "8"))
+# Radicands: "all" of them (the default up to WIDTH=16), or a number of random ones
+SWEEP = os.getenv("SQRT_SWEEP", "all" if WIDTH <= 16 else "100000")
+SEED = int(os.getenv("SQRT_SEED", "1"))
+# Random radicands timed (after the corners) for the latency histograms,
+# and a JSON file to add the histograms to
+LATENCY_RADICANDS = int(os.getenv("SQRT_LATENCY_RADICANDS", "2000"))
+LATENCY_REPORT = os.getenv("LATENCY_REPORT")
+
+def radicands():
+    if SWEEP == "all":
+        return np.arange(1 << WIDTH, dtype=np.int64)
+    rng = np.random.default_rng(SEED)
+    rad = rng.integers(0, 1 << WIDTH, int(SWEEP), dtype=np.int64)
+    # and the corners, where the root and remainder are widest
+    return np.concatenate([[0, 1, (1 << WIDTH) - 2, (1 << WIDTH) - 1], rad])
+
+async def sweep(dut, rad, period_ns=1):
+    """
+    Takes the square roots of 'rad' back to back in one simulation: each
+    start comes on the clock after the previous result, and the testbench
+    sleeps through the iterations instead of waking up every clock.
+    Returns root, rem and valid as read for each radicand.
+    """
+    results = np.zeros((len(rad), 3), dtype=np.int64)
+    wait = latency(WIDTH, FBITS) - 1
+    # Inputs change on the falling edge, outputs are read on falling edges
+    await FallingEdge(dut.clk)
+    for k, value in enumerate(rad.tolist()):
+        dut.rad.value = value
+        dut.start.value = 1
+        await FallingEdge(dut.clk)
+        dut.start.value = 0
+        await Timer(wait * period_ns, units="ns")
+        results[k] = (dut.root.value.integer, dut.rem.value.integer, int(dut.valid.value))
+    return results
 
 @cocotb.test()
-async def test_sqrtFixedPoint(dut):
-    """Empty testbench that simply prints PASS."""
-    await Timer(1, units="ns")  # Wait for a small amount of time
-    dut._log.info("PASS")
\ No newline at end of file
+async def test_sqrt_sweep(dut):
+    """Square roots of every radicand (or random ones), back to back, checked against the model in bulk"""
+    cocotb.start_soon(Clock(dut.clk, 1, units="ns").start())
+    dut.start.value = 0
+    dut.rad.value = 0
+
+    rad = radicands()
+    start = get_sim_time(units="ns")
+    results = await sweep(dut, rad)
+    clocks = int(get_sim_time(units="ns") - start)
+
+    root, rem = sqrt(rad, WIDTH, FBITS)
+    assert results[:, 2].all(), f"valid low {latency(WIDTH, FBITS)} clocks after start for {int((results[:, 2] == 0).sum())} radicands"
+    bad = (results[:, 0] != root) | (results[:, 1] != rem)
+    for k in np.flatnonzero(bad)[:8]:
+        dut._log.error(f"sqrt({to_real(rad[k], FBITS)}): dut root {to_real(results[k, 0], FBITS)} rem {results[k, 1]}, "
+                       f"model root {to_real(root[k], FBITS)} rem {rem[k]}")
+    dut._log.info(f"WIDTH={WIDTH} FBITS={FBITS}: {len(rad)} radicands in {clocks} clocks "
+                  f"({latency(WIDTH, FBITS)} clocks each), {int(bad.sum())} mismatches")
+    assert not bad.any(), "dut doesn't match the model"
+
+@cocotb.test()
+async def test_latency_histogram(dut):
+    """Times corner and random square roots on the ports: every radicand takes latency() clocks"""
+    cocotb.start_soon(Clock(dut.clk, 1, units="ns").start())
+    dut.start.value = 0
+    dut.rad.value = 0
+
+    rng = np.random.default_rng(SEED)
+    rad = np.concatenate([[0, 1, 2, (1 << WIDTH) - 2, (1 << WIDTH) - 1],
+                          rng.integers(0, 1 << WIDTH, LATENCY_RADICANDS, dtype=np.int64)])
+    monitor = LatencyMonitor(dut.clk, dut.start, dut.valid, f"sqrtFixedPoint WIDTH={WIDTH} FBITS={FBITS}",
+                             sample_start=lambda: dut.rad.value.integer,
+                             classify=lambda rad, _: "zero" if rad == 0 else "nonzero").start()
+    results = await sweep(dut, rad)
+    monitor.stop()
+    dut._log.info(monitor.summary())
+    if LATENCY_REPORT:
+        monitor.write_json(LATENCY_REPORT)
+
+    assert results[:, 2].all(), f"valid low {latency(WIDTH, FBITS)} clocks after start"
+    assert monitor.latencies == [latency(WIDTH, FBITS)] * len(rad), "latencies don't match the model's latency()"
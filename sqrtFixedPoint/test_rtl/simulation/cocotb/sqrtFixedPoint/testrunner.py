@@ -0,0 +1,15 @@
+import sys
+from pathlib import Path
+
+# The repository root holds the shared test tools
+sys.path.insert(0, str(Path(__file__).resolve().parents[5]))
+from tools.runner import Bench, main
+
+# Every radicand of an even and an odd WIDTH+FBITS build, then random
+# ones of a wide build
+BENCH = Bench(__file__, "sqrtFixedPoint",
+              builds=[{"WIDTH": 16, "FBITS": 8}, {"WIDTH": 9, "FBITS": 4}, {"WIDTH": 32, "FBITS": 16}],
+              env_prefix="SQRT_")
+
+if __name__ == "__main__":
+    sys.exit(main(BENCH))
@@ -0,0 +1,6 @@
+"""
+Test infrastructure shared by the blocks' testbenches and scripts.
+
+The testbenches import it from the repository root, as they do the
+fixedpoint package.
+"""
@@ -0,0 +1,198 @@
+"""
+A local cache of simulator builds, shared by every bench, build and runner
+process.
+
+An entry is keyed by a hash of everything that goes into a build: the
+simulator and its version, the cocotb version, the toplevel, the HDL
+parameters and defines, and the contents of the sources. Runs that find
+their entry skip the compilation; the least recently used entries are
+evicted once the cache is over its size cap.
+
+Each entry has a lock file next to it. A process builds an entry under an
+exclusive lock and uses it under a shared one, so concurrent runners build
+each entry once, and eviction (which needs the exclusive lock without
+waiting for it) never removes an entry in use.
+"""
+
+import argparse
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DIRECTORY = Path(os.getenv("SIM_BUILD_CACHE", ROOT / ".build_cache"))
+MAX_MB = int(os.getenv("SIM_BUILD_CACHE_MB", "4096"))
+STAMP = "build.json"  # written into an entry once its build succeeds
+VERSION_COMMANDS = {"icarus": ["iverilog", "-V"], "verilator": ["verilator", "--version"]}
+
+
+@lru_cache(maxsize=None)
+def simulator_version(sim):
+    """The first line the simulator prints about its version ('unknown' if it doesn't run)."""
+    try:
+        result = subprocess.run(VERSION_COMMANDS.get(sim, [sim, "--version"]), capture_output=True, text=True,
+                                timeout=60)
+    except (OSError, subprocess.TimeoutExpired):
+        return "unknown"
+    lines = (result.stdout or result.stderr).splitlines()
+    return lines[0].strip() if lines else "unknown"
+
+
+def cocotb_version():
+    try:
+        return metadata.version("cocotb")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def key(sim, toplevel, sources, parameters=None, defines=None):
+    """Hash of a build's inputs, the name of its entry."""
+    digest = hashlib.sha256(json.dumps({
+        "sim": sim, "sim_version": simulator_version(sim), "cocotb": cocotb_version(), "toplevel": toplevel,
+        "parameters": sorted((parameters or {}).items()), "defines": sorted((defines or {}).items()),
+    }, default=str).encode())
+    for path in sources:
+        path = Path(path)
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return f"{sim}_{digest.hexdigest()[:24]}"
+
+
+def size(path):
+    """Bytes in the files under path."""
+    return sum(entry.stat().st_size for entry in Path(path).rglob("*") if entry.is_file() and not entry.is_symlink())
+
+
+class BuildCache:
+    """
+    The cache in 'directory', evicting down to 'max_mb' megabytes.
+
+    entry() is the whole interface:
+
+        with cache.entry(key, lambda build_dir: runner.build(..., build_dir=build_dir)) as build_dir:
+            runner.test(..., build_dir=build_dir)
+    """
+
+    def __init__(self, directory=DIRECTORY, max_mb=MAX_MB):
+        self.directory = Path(directory)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, key):
+        return self.directory / key
+
+    @contextmanager
+    def entry(self, key, make):
+        """
+        The entry's directory, held with a shared lock for the duration of
+        the with block. make(path) builds it first if it isn't cached yet
+        (or an earlier build was interrupted); an exception from make()
+        leaves no entry behind.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path(key)
+        stamp = path / STAMP
+        with open(self.directory / f"{key}.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_SH)
+            if stamp.exists():
+                self.hits += 1
+            else:
+                # Another process may be building it: wait for it, then check again
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                if stamp.exists():
+                    self.hits += 1
+                else:
+                    self.misses += 1
+                    shutil.rmtree(path, ignore_errors=True)
+                    path.mkdir()
+                    try:
+                        make(path)
+                    except BaseException:
+                        shutil.rmtree(path, ignore_errors=True)
+                        raise
+                    stamp.write_text(json.dumps({"key": key, "built": time.time()}))
+                fcntl.flock(lock, fcntl.LOCK_SH)
+            # The stamp's modification time is when the entry was last used
+            os.utime(stamp)
+            try:
+                yield path
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+        self.evict()
+
+    def entries(self):
+        """(last used, bytes, key) of every complete entry, least recently used first."""
+        found = []
+        for stamp in self.directory.glob(f"*/{STAMP}"):
+            try:
+                found.append((stamp.stat().st_mtime, size(stamp.parent), stamp.parent.name))
+            except FileNotFoundError:  # evicted meanwhile
+                continue
+        return sorted(found)
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache is within
+        its cap, skipping those in use. One process evicts at a time; the
+        others don't wait for it. Returns the keys removed.
+        """
+        removed = []
+        with open(self.directory / ".evict.lock", "a") as evicting:
+            try:
+                fcntl.flock(evicting, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return removed
+            entries = self.entries()
+            total = sum(bytes_ for _, bytes_, _ in entries)
+            for _, bytes_, key in entries:
+                if total <= self.max_bytes:
+                    break
+                # Lock files stay, so every process agrees on which file guards an entry
+                with open(self.directory / f"{key}.lock", "a") as lock:
+                    try:
+                        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except BlockingIOError:
+                        continue
+                    shutil.rmtree(self.path(key), ignore_errors=True)
+                total -= bytes_
+                removed.append(key)
+        return removed
+
+    def clear(self):
+        """Removes every entry not in use."""
+        max_bytes, self.max_bytes = self.max_bytes, -1
+        try:
+            return self.evict()
+        finally:
+            self.max_bytes = max_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Show or clear the simulator build cache')
+    parser.add_argument('--clear', action='store_true', help='remove every entry not in use')
+    parser.add_argument('--directory', default=DIRECTORY, help=f'cache directory (default $SIM_BUILD_CACHE, or {DIRECTORY})')
+    args = parser.parse_args()
+
+    cache = BuildCache(args.directory)
+    if not cache.directory.exists():
+        print(f"{cache.directory}: empty")
+        return
+    if args.clear:
+        print(f"removed {len(cache.clear())} entries")
+    entries = cache.entries()
+    for used, bytes_, key in entries:
+        print(f"{key:40s} {bytes_ / 2**20:9.1f} MB  last used {time.strftime('%Y-%m-%d %H:%M', time.localtime(used))}")
+    print(f"{cache.directory}: {len(entries)} entries, {sum(b for _, b, _ in entries) / 2**20:.1f} of {MAX_MB} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import json
+from collections import Counter, deque
+from pathlib import Path
+
+import cocotb
+from cocotb.triggers import ReadOnly, RisingEdge
+
+
+def histogram(values):
+    """Counts of each value, as a dict sorted by value (JSON keys are strings)."""
+    return {str(value): count for value, count in sorted(Counter(values).items())}
+
+
+def stats(values):
+    """min, max, mean and histogram of a list of clock counts."""
+    if not values:
+        return {"count": 0}
+    return {"count": len(values), "min": min(values), "max": max(values),
+            "mean": sum(values) / len(values), "histogram": histogram(values)}
+
+
+class LatencyMonitor:
+    """
+    Timestamps the clock edges that take a start and that raise a done (or
+    valid) on a core, and builds latency and throughput histograms.
+
+    On each rising edge of 'clk', 'start' is read as the edge took it
+    (before anything the testbench writes after the edge lands), and 'done'
+    once the edge has settled. Starts and dones are matched in order, so
+    pipelined cores with several operations in flight work as well as
+    iterative ones. An operation's latency counts the edge that takes the
+    start as clock 1, like the models' latency(): a core that raises done
+    on the same edge has latency 1.
+
+    Args:
+        clk, start, done: Signal handles, e.g. dut.i_clk, dut.i_start and
+            dut.o_done (or dut.clk, dut.start and dut.valid).
+        name: Key of this monitor's report in the JSON file.
+        sample_start: Called on the edge that takes a start; returns what
+            to remember about the operation (its operands, say).
+        sample_done: Called once the edge that raises done has settled;
+            returns what to remember about the outcome (flags, say).
+        classify: Called with the two samples of each operation; returns
+            its class (e.g. "dbz", "overflow" or "zero"). Every class gets
+            its own latency histogram.
+        busy: For cores that ignore start while busy (a divider with
+            i_start held high), e.g. dut.o_busy: a start then only counts on
+            edges that find busy low.
+    """
+
+    def __init__(self, clk, start, done, name="core", sample_start=None, sample_done=None, classify=None,
+                 busy=None):
+        self.clk = clk
+        self.start_signal = start
+        self.done_signal = done
+        self.name = name
+        self.sample_start = sample_start
+        self.sample_done = sample_done
+        self.classify = classify
+        self.busy_signal = busy
+        self.operations = []  # (start clock, done clock, class)
+        self._pending = deque()
+        self._clock = 0
+        self._busy = False  # busy as the last edge left it
+        self._task = None
+
+    def start(self):
+        """Starts watching the clock."""
+        self._task = cocotb.start_soon(self._run())
+        return self
+
+    def stop(self):
+        """Stops watching; the operations so far stay."""
+        if self._task is not None:
+            self._task.kill()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await RisingEdge(self.clk)
+            self._clock += 1
+            if self.start_signal.value.is_resolvable and self.start_signal.value and not self._busy:
+                sample = self.sample_start() if self.sample_start else None
+                self._pending.append((self._clock, sample))
+            await ReadOnly()
+            if self.done_signal.value.is_resolvable and self.done_signal.value and self._pending:
+                started, sample = self._pending.popleft()
+                outcome = self.sample_done() if self.sample_done else None
+                kind = self.classify(sample, outcome) if self.classify else "all"
+                self.operations.append((started, self._clock, kind))
+            if self.busy_signal is not None:
+                self._busy = bool(self.busy_signal.value.is_resolvable and self.busy_signal.value)
+
+    @property
+    def latencies(self):
+        """Latency of each finished operation, in start order."""
+        return [done - started + 1 for started, done, _ in self.operations]
+
+    def report(self):
+        """
+        The histograms as a dict: overall and per class latency stats(), and
+        throughput as operations per clock over the monitored span and the
+        histogram of clocks between consecutive dones.
+        """
+        latencies = self.latencies
+        classes = {}
+        for (_, _, kind), latency in zip(self.operations, latencies):
+            classes.setdefault(kind, []).append(latency)
+        dones = [done for _, done, _ in self.operations]
+        report = {"operations": len(self.operations), "unfinished": len(self._pending),
+                  "latency": stats(latencies),
+                  "classes": {kind: stats(values) for kind, values in sorted(classes.items())}}
+        if self.operations:
+            span = dones[-1] - self.operations[0][0] + 1
+            report["throughput"] = {"clocks": span, "ops_per_clock": len(dones) / span,
+                                    "interval": stats([b - a for a, b in zip(dones, dones[1:])])}
+        return report
+
+    def summary(self):
+        """One line per class for the log."""
+        lines = [f"{self.name}: {len(self.operations)} operations"]
+        report = self.report()
+        for kind, kind_stats in report["classes"].items():
+            lines.append(f"  {kind}: {kind_stats['count']} operations, latency {kind_stats['min']}-{kind_stats['max']} "
+                         f"clocks (mean {kind_stats['mean']:.2f}), histogram {kind_stats['histogram']}")
+        if "throughput" in report:
+            lines.append(f"  {report['throughput']['ops_per_clock']:.3f} operations per clock "
+                         f"over {report['throughput']['clocks']} clocks")
+        return "\n".join(lines)
+
+    def write_json(self, path):
+        """Adds (or replaces) this monitor's report in the JSON file at 'path'."""
+        path = Path(path)
+        reports = json.loads(path.read_text()) if path.exists() else {}
+        reports[self.name] = self.report()
+        path.write_text(json.dumps(reports, indent=2))
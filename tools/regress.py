@@ -0,0 +1,340 @@
+"""
+Runs the blocks' regressions (lint, formal, simulation, synthesis, UVM and
+mutation tests) as one graph of tasks on a pool of worker processes.
+
+A task is one test directory's run.sh (<block>/test_rtl/<stage>/<test>),
+or one simulator of a cocotb bench, running the bench's builds in
+parallel. Within a block lint runs first and the other stages wait for
+it, mutation also for the icarus simulation whose testbench it mutates;
+blocks don't wait for each other, so a full regression takes about as
+long as its slowest block rather than the sum of them. The OSS CAD Suite
+environment is sourced once for every task, each task's output goes to
+its own log, a failed task fails the run (and skips what waits on it),
+and the run ends with a timing report.
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from .runner import SIMULATORS, load
+
+ROOT = Path(__file__).resolve().parent.parent
+# In the order the test_all.sh scripts used to run them
+STAGES = ("formal", "lint", "mutation", "simulation/cocotb", "simulation/icarus", "simulation/verilator", "synth",
+          "uvm/icarus_uvm", "uvm/pyuvm")
+ENVIRONMENT = Path("~/oss-cad-suite/environment").expanduser()
+LOGS = ROOT / "regress_logs"
+REPORT = "report.json"
+DURATIONS = "durations.json"  # each task's last duration, to schedule the long chains first
+MCY_JOBS = 8  # the mutation run.sh files run mcy -j8
+
+PASS, FAIL, TIMEOUT, SKIP = "PASS", "FAIL", "TIMEOUT", "SKIP"
+
+
+class Task:
+    """
+    One test: 'command' run in 'directory', after the tasks in 'needs' have
+    passed. 'weight' is the number of workers it keeps busy.
+    """
+
+    def __init__(self, block, stage, name, directory, command, weight=1):
+        self.block = block
+        self.stage = stage
+        self.name = name
+        self.directory = Path(directory)
+        self.command = list(command)
+        self.weight = weight
+        self.needs = []
+        self.status = None
+        self.returncode = None
+        self.started = None
+        self.finished = None
+        self.process = None
+
+    @property
+    def id(self):
+        return f"{self.block}/{self.stage}/{self.name}"
+
+    @property
+    def seconds(self):
+        return self.finished - self.started if self.finished is not None else 0.0
+
+    def log(self, logs):
+        return Path(logs) / f"{self.id}.log"
+
+
+def link(tasks):
+    """A block's dependencies: lint before everything else, the icarus simulation before mutation."""
+    lint = [task for task in tasks if task.stage == "lint"]
+    icarus = [task for task in tasks if task.stage == "simulation/icarus"]
+    for task in tasks:
+        if task.stage != "lint":
+            task.needs += lint
+        if task.stage == "mutation":
+            task.needs += icarus
+    return tasks
+
+
+def discover(root=ROOT):
+    """Every test under root/<block>/test_rtl, linked by block."""
+    tasks = []
+    for test_rtl in sorted(Path(root).glob("*/test_rtl")):
+        block = []
+        for stage in STAGES:
+            for script in sorted(test_rtl.glob(f"{stage}/*/run.sh")):
+                directory = script.parent
+                if (directory / "testrunner.py").exists():
+                    # run.sh runs the simulators one after the other; each
+                    # runs the bench's builds in parallel, a worker each
+                    builds = len(load(directory / "testrunner.py").builds)
+                    block += [Task(test_rtl.parent.name, stage, f"{directory.name}.{sim}", directory,
+                                   [sys.executable, "testrunner.py", "--sim", sim, "--jobs", str(builds)], builds)
+                              for sim in SIMULATORS]
+                else:
+                    block.append(Task(test_rtl.parent.name, stage, directory.name, directory, ["bash", "run.sh"],
+                                      MCY_JOBS if stage == "mutation" else 1))
+        tasks += link(block)
+    return tasks
+
+
+def select(tasks, targets=(), stages=()):
+    """
+    The tasks in the given blocks or under the given directories (all of
+    them if there are none), and in the given stages ("simulation" takes
+    every simulator).
+    """
+    chosen = set()
+    for target in targets:
+        path = Path(target).resolve()
+        matched = {task.id for task in tasks
+                   if task.block == target or path == task.directory or path in task.directory.parents}
+        if not matched:
+            raise SystemExit(f"no tests in {target}")
+        chosen |= matched
+    return [task for task in tasks
+            if (not targets or task.id in chosen)
+            and (not stages or any(task.stage == stage or task.stage.startswith(stage + "/") for stage in stages))]
+
+
+def environment(path):
+    """os.environ as it is after sourcing the shell script at 'path'."""
+    result = subprocess.run(["bash", "-c", 'source "$1" > /dev/null && env -0', "bash", str(path)],
+                            capture_output=True, check=False)
+    if result.returncode:
+        raise SystemExit(f"sourcing {path} failed:\n{result.stderr.decode(errors='replace')}")
+    env = dict(entry.split("=", 1) for entry in result.stdout.decode(errors="replace").split("\0") if "=" in entry)
+    # The run.sh scripts skip sourcing it again when this is set
+    env["OSS_CAD_SUITE"] = str(path)
+    return env
+
+
+def priorities(tasks, durations):
+    """
+    Each task's critical path: its expected seconds (from 'durations', else
+    the mean of those known) plus the longest chain of tasks waiting on it.
+    """
+    known = [durations[task.id] for task in tasks if task.id in durations]
+    default = sum(known) / len(known) if known else 1.0
+    waiting = {task.id: [] for task in tasks}
+    for task in tasks:
+        for need in task.needs:
+            if need.id in waiting:
+                waiting[need.id].append(task)
+    paths = {}
+
+    def critical(task):
+        if task.id not in paths:
+            paths[task.id] = max(durations.get(task.id, default), 1e-3) + max(map(critical, waiting[task.id]), default=0)
+        return paths[task.id]
+
+    return {task.id: critical(task) for task in tasks}
+
+
+def execute(task, log, env, timeout):
+    """
+    Runs a task in its own process group, its output to 'log'. The status
+    is set last: the scheduler takes a task with one as done.
+    """
+    log.parent.mkdir(parents=True, exist_ok=True)
+    task.started = time.monotonic()
+    try:
+        with open(log, "w") as out:
+            out.write(f"$ cd {task.directory} && {' '.join(task.command)}\n")
+            out.flush()
+            task.process = subprocess.Popen(task.command, cwd=task.directory, env=env, stdin=subprocess.DEVNULL,
+                                            stdout=out, stderr=subprocess.STDOUT, start_new_session=True)
+            try:
+                task.returncode = task.process.wait(timeout=timeout)
+                status = PASS if task.returncode == 0 else FAIL
+            except subprocess.TimeoutExpired:
+                kill(task)
+                task.returncode = task.process.wait()
+                status = TIMEOUT
+                out.write(f"\ntimed out after {timeout} s\n")
+    except OSError as error:
+        status = FAIL
+        with open(log, "a") as out:
+            out.write(f"\n{error}\n")
+    task.finished = time.monotonic()
+    task.status = status
+    return task
+
+
+def kill(task):
+    if task.process is not None and task.process.poll() is None:
+        try:
+            os.killpg(task.process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+def run(tasks, jobs=None, logs=LOGS, env=None, timeout=None, keep_going=False, durations=None, echo=print):
+    """
+    Runs the tasks, at most 'jobs' workers' worth at a time (one per core
+    if None), the longest chains first; a dependency outside 'tasks' counts
+    as passed. Unless 'keep_going', a task whose dependency didn't pass is
+    skipped. Sets each task's status and times; returns the wall clock
+    seconds.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    selected = {task.id for task in tasks}
+    needs = {task.id: [need for need in task.needs if need.id in selected] for task in tasks}
+    priority = priorities(tasks, durations or {})
+    pending = sorted(tasks, key=lambda task: -priority[task.id])
+    running = {}
+    free = jobs
+    finished = 0
+    start = time.monotonic()
+
+    def done(task, log=None):
+        nonlocal finished
+        finished += 1
+        echo(f"[{finished:{len(str(len(tasks)))}d}/{len(tasks)}] {task.status:7s} {task.seconds:8.1f} s  {task.id}"
+             + (f"  ({log})" if log and task.status != PASS else ""))
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        try:
+            while pending or running:
+                ready = []
+                for task in list(pending):
+                    if any(need.status is None for need in needs[task.id]):
+                        continue
+                    if not keep_going and any(need.status != PASS for need in needs[task.id]):
+                        pending.remove(task)
+                        task.status = SKIP
+                        done(task)
+                    else:
+                        ready.append(task)
+                if not ready and not running:
+                    continue  # skipped some: look again at what waited on them
+                # In priority order; a task that doesn't fit yet holds back the rest, so heavy ones aren't starved
+                for task in ready:
+                    weight = min(task.weight, jobs)
+                    if weight > free:
+                        break
+                    pending.remove(task)
+                    free -= weight
+                    running[pool.submit(execute, task, task.log(logs), env, timeout)] = task
+                finished_futures, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished_futures:
+                    task = running.pop(future)
+                    future.result()
+                    free += min(task.weight, jobs)
+                    done(task, task.log(logs))
+        except KeyboardInterrupt:
+            for task in running.values():
+                kill(task)
+            raise
+    return time.monotonic() - start
+
+
+def report(tasks, wall, logs=LOGS):
+    """The timing report, by block, and the run as a dict for report.json."""
+    blocks = {}
+    for task in tasks:
+        blocks.setdefault(task.block, []).append(task)
+    lines = [f"{'block':40s} {'pass':>5s} {'fail':>5s} {'skip':>5s} {'task s':>9s} {'span s':>9s}"]
+    spans = {}
+    for block, group in blocks.items():
+        ran = [task for task in group if task.started is not None]
+        spans[block] = max(task.finished for task in ran) - min(task.started for task in ran) if ran else 0.0
+        statuses = [task.status for task in group]
+        lines.append(f"{block:40s} {statuses.count(PASS):5d} {statuses.count(FAIL) + statuses.count(TIMEOUT):5d} "
+                     f"{statuses.count(SKIP):5d} {sum(task.seconds for task in group):9.1f} {spans[block]:9.1f}")
+    lines.append("")
+    lines.append("slowest tasks:")
+    for task in sorted(tasks, key=lambda task: -task.seconds)[:5]:
+        lines.append(f"  {task.seconds:9.1f} s  {task.id}")
+    failed = [task for task in tasks if task.status not in (PASS, SKIP)]
+    if failed:
+        lines.append("")
+        lines.append("failed:")
+        lines += [f"  {task.status:7s} {task.id}  ({task.log(logs)})" for task in failed]
+    busy = sum(task.seconds for task in tasks)
+    lines.append("")
+    slowest = max(spans, key=spans.get) if spans else None
+    lines.append(f"{len(tasks)} tasks in {wall:.1f} s wall clock for {busy:.1f} s of tasks"
+                 + (f"; the slowest block, {slowest}, took {spans[slowest]:.1f} s" if slowest else ""))
+    data = {"wall_seconds": wall, "task_seconds": busy, "block_seconds": spans,
+            "tasks": {task.id: {"status": task.status, "returncode": task.returncode, "seconds": task.seconds,
+                                "log": str(task.log(logs))} for task in tasks}}
+    return "\n".join(lines), data
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the block regressions in parallel')
+    parser.add_argument('targets', nargs='*', help='blocks or test directories (default every block)')
+    parser.add_argument('-s', '--stage', action='append', default=[], choices=sorted({*STAGES, "simulation", "uvm"}),
+                        help='run only this stage (repeatable)')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                        help=f'workers (default one per core, {os.cpu_count()})')
+    parser.add_argument('--timeout', type=float, help='seconds before a task is killed and fails')
+    parser.add_argument('--keep-going', action='store_true', help='run tasks whose dependencies failed anyway')
+    parser.add_argument('--env', default=ENVIRONMENT,
+                        help=f'script to source once for every task (default {ENVIRONMENT}, if it exists; "" for none)')
+    parser.add_argument('--logs', type=Path, default=LOGS, help=f'directory for the task logs and report (default {LOGS})')
+    parser.add_argument('--list', action='store_true', help='list the tasks and their dependencies, then exit')
+    args = parser.parse_args()
+
+    tasks = select(discover(), args.targets, args.stage)
+    if args.list:
+        for task in tasks:
+            print(f"{task.id:75s} {' '.join(need.id for need in task.needs)}")
+        return 0
+    if not tasks:
+        print("no tests to run")
+        return 0
+
+    env = None
+    if args.env:
+        if Path(args.env).exists():
+            env = environment(args.env)
+        elif Path(args.env) != ENVIRONMENT:
+            raise SystemExit(f"{args.env} not found")
+        else:
+            print(f"{ENVIRONMENT} not found: running with the current environment")
+
+    durations_path = args.logs / DURATIONS
+    durations = json.loads(durations_path.read_text()) if durations_path.exists() else {}
+    print(f"{len(tasks)} tasks on {args.jobs} workers, logs in {args.logs}")
+    wall = run(tasks, args.jobs, args.logs, env, args.timeout, args.keep_going, durations)
+
+    text, data = report(tasks, wall, args.logs)
+    print()
+    print(text)
+    args.logs.mkdir(parents=True, exist_ok=True)
+    (args.logs / REPORT).write_text(json.dumps(data, indent=2))
+    durations.update({task.id: task.seconds for task in tasks if task.status != SKIP})
+    durations_path.write_text(json.dumps(durations, indent=2, sort_keys=True))
+    return 0 if all(task.status == PASS for task in tasks) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Synthesized size of a block's cores, to compare them.
+
+A block's scripts/resources.py declares which modules to synthesize with
+which parameters, as rows for builds() to return, and runs main(); this
+module synthesizes each one with yosys' generic 'synth' and prints their
+cells, flip-flops and logic cells side by side.
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+
+def synth_stat(rtl, module, parameters, yosys="yosys"):
+    """
+    Synthesizes <rtl>/<module>.v with yosys' generic 'synth' for the given
+    HDL parameters and returns its 'stat -json' design figures.
+
+    yosys runs in a scratch directory with relative paths only, so the
+    WebAssembly build (yowasp-yosys) works too.
+    """
+    with tempfile.TemporaryDirectory() as scratch:
+        shutil.copy(Path(rtl) / f"{module}.v", scratch)
+        settings = " ".join(f"-set {name} {value}" for name, value in parameters.items())
+        chparam = f"chparam {settings} {module}; " if parameters else ""
+        script = (f"read_verilog -sv {module}.v; "
+                  f"{chparam}"
+                  f"synth -top {module}; "
+                  f"tee -q -o stat.json stat -json")
+        subprocess.run([yosys, "-q", "-p", script], cwd=scratch, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return json.loads((Path(scratch) / "stat.json").read_text())["design"]
+
+
+def figures(rtl, module, parameters, yosys="yosys"):
+    """Cells, flip-flops and logic cells of one build."""
+    cells = synth_stat(rtl, module, parameters, yosys)["num_cells_by_type"]
+    flops = sum(count for kind, count in cells.items() if "DFF" in kind)
+    total = sum(cells.values())
+    return {"cells": total, "flops": flops, "logic": total - flops}
+
+
+def resources(rtl, rows, yosys="yosys"):
+    """
+    Each row (a dict with the 'name' to show, the 'module' and its HDL
+    'parameters', and any other columns, e.g. a latency) synthesized: its
+    name and other columns followed by figures().
+    """
+    result = []
+    for row in rows:
+        columns = {key: value for key, value in row.items() if key not in ("module", "parameters")}
+        result.append({**columns, **figures(rtl, row["module"], row["parameters"], yosys)})
+    return result
+
+
+def table(rows):
+    """The rows as a text table, then each row's size against the first's."""
+    columns = [key for key in rows[0] if key != "name"]
+    width = max(len("core"), *(len(row["name"]) for row in rows))
+    lines = [f"{'core':{width}s} " + " ".join(f"{column.replace('_', ' '):>9s}" for column in columns)]
+    for row in rows:
+        cells = (f"{row[column]:9.3f}" if isinstance(row[column], float) else f"{row[column]:9d}" for column in columns)
+        lines.append(f"{row['name']:{width}s} " + " ".join(cells))
+    first = rows[0]
+    for row in rows[1:]:
+        lines.append(f"{row['name']}/{first['name']}: {row['cells'] / first['cells']:.1f}x cells, "
+                     f"{row['flops'] / max(first['flops'], 1):.1f}x flops")
+    return "\n".join(lines)
+
+
+def main(rtl, builds, description, width=8, fbits=4, arguments=None):
+    """
+    A block's scripts/resources.py entry point: --width and --fbits (and
+    whatever 'arguments' adds to the parser) go to builds(args), which
+    returns the rows for resources().
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--width', type=int, default=width, help=f'WIDTH (default {width})')
+    parser.add_argument('--fbits', type=int, default=fbits, help=f'FBITS (default {fbits})')
+    parser.add_argument('--yosys', default='yosys', help='yosys executable, e.g. yowasp-yosys (default yosys)')
+    parser.add_argument('--json', action='store_true', help='print the figures as JSON')
+    if arguments is not None:
+        arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        rows = resources(rtl, builds(args), args.yosys)
+    except (OSError, subprocess.CalledProcessError) as err:
+        sys.exit(f"yosys failed: {err}")
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"WIDTH={args.width} FBITS={args.fbits}")
+    print(table(rows))
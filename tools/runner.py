@@ -0,0 +1,286 @@
+"""
+One cocotb runner for every testbench in the repository.
+
+Each testbench directory (<block>/test_rtl/simulation/cocotb/<bench>)
+declares what to build in a short testrunner.py, a Bench, and runs it
+through main(); `python3 -m tools.runner` from the repository root finds
+every bench and runs any of them. The HDL comes straight from the block's
+rtl directory, and the builds come from the shared build cache
+(build_cache.py), so running a bench again, or another bench with the
+same build, skips the compilation.
+
+A bench declares a sweep of HDL parameter sets, which the runner passes
+to the build and, through the environment, to the testbench; the builds
+of a sweep, or of every bench, run in parallel on the cores, and their
+results are reported together.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from xml.etree import ElementTree
+
+from . import build_cache
+from .build_cache import BuildCache
+
+ROOT = Path(__file__).resolve().parent.parent
+COCOTB = Path("test_rtl") / "simulation" / "cocotb"
+SIMULATORS = ("icarus", "verilator")
+
+
+class Bench:
+    """
+    A cocotb testbench and the builds it runs against.
+
+    Args:
+        path: The bench's testrunner.py (pass __file__); the testbench
+            module is testbench.py next to it.
+        toplevel: HDL toplevel.
+        sources: Verilog modules to compile, by name: <name>.v in the
+            bench directory (a test wrapper) or in the block's rtl
+            directory. Just the toplevel if None.
+        data: Other files from the rtl directory the simulation reads,
+            e.g. a $readmemh table; they're copied into the build directory
+            the simulation runs in.
+        generate: A function(parameters, directory) that writes the files
+            the simulation reads which depend on the build, e.g. a table
+            sized by its parameters, into the directory the simulation runs
+            in. It's pickled into the worker processes, so it must be
+            importable: a module-level function, not a lambda.
+        builds: One dict of HDL parameters per build (the HDL defaults if
+            empty): the configurations the testbench runs against, one
+            simulation each.
+        env_prefix: If set, each build also passes its parameters to the
+            testbench as environment variables <env_prefix><NAME>.
+        defines: Verilog defines for every build.
+    """
+
+    def __init__(self, path, toplevel, sources=None, data=(), generate=None, builds=({},), env_prefix=None,
+                 defines=None):
+        self.directory = Path(path).resolve().parent
+        self.block = self.directory.parents[len(COCOTB.parts)]
+        self.toplevel = toplevel
+        self.sources = [toplevel] if sources is None else list(sources)
+        self.data = list(data)
+        self.generate = generate
+        self.builds = [dict(build) for build in builds]
+        self.env_prefix = env_prefix
+        self.defines = dict(defines or {})
+
+    @property
+    def name(self):
+        return f"{self.block.name}/{self.directory.name}"
+
+    def source_files(self):
+        files = []
+        for source in self.sources:
+            local = self.directory / f"{source}.v"
+            files.append(local if local.exists() else self.block / "rtl" / f"{source}.v")
+        return files
+
+    def data_files(self):
+        return [self.block / "rtl" / name for name in self.data]
+
+    def env(self, parameters):
+        if self.env_prefix is None:
+            return {}
+        return {f"{self.env_prefix}{name}": str(value) for name, value in parameters.items()}
+
+    def test_dir(self, key):
+        """sim_build/<build cache key>: where the simulation runs and leaves results.xml."""
+        return self.directory / "sim_build" / key
+
+
+def outcomes(results_xml):
+    """Each testcase in a cocotb results file and whether it passed (one failure if the file is missing)."""
+    if not Path(results_xml).exists():
+        return {"results file missing": False}
+    return {case.get("name"): case.find("failure") is None and case.find("error") is None
+            for case in ElementTree.parse(results_xml).iter("testcase")}
+
+
+def builds(bench, parameters=None):
+    """The bench's builds, or one build of the first with 'parameters' overriding its own."""
+    return bench.builds if parameters is None else [{**bench.builds[0], **parameters}]
+
+
+def run_build(bench, sim, parameters, env=None, testcase=None, cache=None, log=False):
+    """
+    Runs the testbench against one build, taken from 'cache' (the default
+    BuildCache if None). 'env' adds environment variables for the
+    testbench. With 'log', the build's and the simulation's output go to
+    build.log and test.log in the test directory instead of the terminal.
+
+    Returns the build's result: the bench, simulator and parameters, each
+    testcase and whether it passed, the seconds it took and the test
+    directory.
+    """
+    from cocotb.runner import get_runner
+
+    start = time.monotonic()
+    cache = BuildCache() if cache is None else cache
+    runner = get_runner(sim)
+    key = build_cache.key(sim, bench.toplevel, bench.source_files(), parameters, bench.defines)
+    test_dir = bench.test_dir(key)
+    test_dir.mkdir(parents=True, exist_ok=True)
+    for path in bench.data_files():
+        shutil.copy(path, test_dir)
+    if bench.generate is not None:
+        bench.generate(parameters, test_dir)
+    logs = {"build": test_dir / "build.log", "test": test_dir / "test.log"} if log else {"build": None, "test": None}
+
+    def make(build_dir):
+        runner.build(sources=bench.source_files(), hdl_toplevel=bench.toplevel, parameters=parameters,
+                     defines=bench.defines, build_dir=build_dir, always=True, log_file=logs["build"])
+
+    # The simulator imports testbench.py from the runner's sys.path
+    sys.path.insert(0, str(bench.directory))
+    try:
+        misses = cache.misses
+        with cache.entry(key, make) as build_dir:
+            if cache.misses == misses and not log:
+                print(f"[{bench.name}][{sim}] cached build {key} for {parameters or 'defaults'}")
+            # The toplevel's language is given, as a cached build leaves the runner without sources
+            results = runner.test(hdl_toplevel=bench.toplevel, hdl_toplevel_lang="verilog", test_module="testbench",
+                                  testcase=testcase, build_dir=build_dir, test_dir=test_dir, parameters=parameters,
+                                  extra_env={**bench.env(parameters), **(env or {})}, log_file=logs["test"])
+        testcases = outcomes(results)
+    except Exception as error:  # a build or simulator that fails to run fails the build, not the sweep
+        if not log:
+            raise
+        testcases = {f"{type(error).__name__}: {error}": False}
+    finally:
+        sys.path.remove(str(bench.directory))
+    return {"bench": bench.name, "sim": sim, "parameters": parameters, "testcases": testcases,
+            "seconds": time.monotonic() - start, "directory": str(test_dir)}
+
+
+def run(benches, sim="icarus", parameters=None, env=None, testcase=None, jobs=1, echo=print):
+    """
+    Runs every build of the benches (see builds()), up to 'jobs' at once
+    in worker processes, each logging to its test directory; one at a
+    time, in this process and to the terminal, if 'jobs' is 1. Returns
+    the results of run_build(), in the benches' order.
+    """
+    work = [(bench, build_parameters) for bench in benches for build_parameters in builds(bench, parameters)]
+    if jobs <= 1 or len(work) <= 1:
+        return [run_build(bench, sim, build_parameters, env, testcase) for bench, build_parameters in work]
+
+    results = [None] * len(work)
+    with ProcessPoolExecutor(max_workers=min(jobs, len(work))) as pool:
+        futures = {pool.submit(run_build, bench, sim, build_parameters, env, testcase, None, True): k
+                   for k, (bench, build_parameters) in enumerate(work)}
+        try:
+            for future in as_completed(futures):
+                result = results[futures[future]] = future.result()
+                passed = all(result["testcases"].values())
+                echo(f"{'PASS' if passed else 'FAIL'} {result['bench']} [{sim}] {json.dumps(result['parameters'])} "
+                     f"{result['seconds']:.1f} s" + ("" if passed else f" ({result['directory']})"))
+        except KeyboardInterrupt:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+    return results
+
+
+def load(path):
+    """The Bench a testrunner.py declares."""
+    spec = importlib.util.spec_from_file_location(f"testrunner_{path.parent.name}", path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered, so the worker processes can unpickle the bench's functions
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module.BENCH
+
+
+def discover(root=ROOT):
+    """Every bench under root, sorted by name."""
+    paths = sorted(root.glob(f"*/{COCOTB.as_posix()}/*/testrunner.py"))
+    return [load(path) for path in paths]
+
+
+def select(benches, patterns):
+    """The benches whose block or block/bench name is in patterns (all of them if there are none)."""
+    if not patterns:
+        return benches
+    chosen = [bench for bench in benches if bench.name in patterns or bench.block.name in patterns]
+    unknown = set(patterns) - {bench.name for bench in chosen} - {bench.block.name for bench in chosen}
+    if unknown:
+        raise SystemExit(f"no such bench: {', '.join(sorted(unknown))}")
+    return chosen
+
+
+def parse_parameters(pairs):
+    """NAME=VALUE strings to a dict, integers where they parse as integers."""
+    parameters = {}
+    for pair in pairs:
+        name, sep, value = pair.partition("=")
+        if not sep:
+            raise SystemExit(f"parameter {pair!r} isn't NAME=VALUE")
+        try:
+            parameters[name] = int(value, 0)
+        except ValueError:
+            parameters[name] = value
+    return parameters
+
+
+def arguments(parser):
+    parser.add_argument('--sim', choices=SIMULATORS, default=os.getenv("SIM", "icarus"),
+                        help='simulator (default $SIM, or icarus)')
+    parser.add_argument('-p', '--parameter', action='append', default=[], metavar='NAME=VALUE',
+                        help='build once with this HDL parameter over the first build\'s (repeatable)')
+    parser.add_argument('-t', '--testcase', help='run only these tests (comma separated)')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                        help='builds to run at once, each logging to its test directory (default one per core)')
+    parser.add_argument('--results', help='JSON file to write every build\'s testcases and times to')
+    return parser
+
+
+def report(results, wall=None):
+    """Prints every build's result, then the failures; returns the exit status."""
+    failed = 0
+    for result in results:
+        testcases = result["testcases"]
+        passed = sum(testcases.values())
+        print(f"{'PASS' if passed == len(testcases) else 'FAIL'} {result['bench']:50s} {result['sim']:9s} "
+              f"{json.dumps(result['parameters']):40s} {passed:4d}/{len(testcases):<4d} {result['seconds']:8.1f} s")
+    for result in results:
+        bad = [name for name, passed in result["testcases"].items() if not passed]
+        if bad:
+            failed += 1
+            print(f"FAIL {result['bench']} {json.dumps(result['parameters'])}: {', '.join(bad)}")
+    if wall is not None and results:
+        print(f"{len(results)} builds, {failed} failed, in {wall:.1f} s wall clock for "
+              f"{sum(result['seconds'] for result in results):.1f} s of builds")
+    return 1 if failed else 0
+
+
+def main(bench=None):
+    """A bench's testrunner.py entry point, or the repository's (no bench) to run any of them."""
+    parser = arguments(argparse.ArgumentParser(description='Build and run cocotb testbenches'))
+    if bench is None:
+        parser.add_argument('benches', nargs='*', help='blocks or block/bench names (default all)')
+        parser.add_argument('--list', action='store_true', help='list the benches and their builds, then exit')
+    args = parser.parse_args()
+
+    benches = [bench] if bench is not None else select(discover(), args.benches)
+    if bench is None and args.list:
+        for each in benches:
+            print(f"{each.name:60s} {each.toplevel:40s} {' '.join(json.dumps(b) for b in each.builds)}")
+        return 0
+    parameters = parse_parameters(args.parameter) if args.parameter else None
+    start = time.monotonic()
+    results = run(benches, args.sim, parameters, testcase=args.testcase, jobs=args.jobs)
+    wall = time.monotonic() - start
+    if args.results:
+        Path(args.results).write_text(json.dumps(results, indent=2))
+    return report(results, wall)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+import os
+import sys
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tools import build_cache
+from tools.build_cache import BuildCache
+
+
+def fill(size):
+    """A make() that writes a file of 'size' bytes into the entry."""
+    def make(path):
+        (path / "sim.vvp").write_bytes(b"\0" * size)
+    return make
+
+
+def test_key_covers_sources_parameters_and_defines(tmp_path):
+    source = tmp_path / "core.v"
+    source.write_text("module core; endmodule\n")
+    base = build_cache.key("icarus", "core", [source], {"WIDTH": 8})
+    assert build_cache.key("icarus", "core", [source], {"WIDTH": 8}) == base
+    assert build_cache.key("icarus", "core", [source], {"WIDTH": 9}) != base
+    assert build_cache.key("icarus", "core", [source], {"WIDTH": 8}, {"FORMAL": 1}) != base
+    assert build_cache.key("verilator", "core", [source], {"WIDTH": 8}) != base
+    source.write_text("module core; wire w; endmodule\n")
+    assert build_cache.key("icarus", "core", [source], {"WIDTH": 8}) != base
+
+
+def test_builds_once_then_hits(tmp_path):
+    cache = BuildCache(tmp_path)
+    built = []
+    for _ in range(3):
+        with cache.entry("icarus_a", built.append) as path:
+            assert path == tmp_path / "icarus_a"
+    assert built == [tmp_path / "icarus_a"]
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_failed_build_leaves_no_entry(tmp_path):
+    cache = BuildCache(tmp_path)
+
+    def broken(path):
+        (path / "partial").write_text("")
+        raise RuntimeError("compile error")
+
+    with pytest.raises(RuntimeError):
+        with cache.entry("icarus_a", broken):
+            pass
+    assert not (tmp_path / "icarus_a").exists()
+    with cache.entry("icarus_a", fill(10)) as path:
+        assert (path / "sim.vvp").exists()
+
+
+def test_evicts_least_recently_used_entries_not_in_use(tmp_path):
+    filling = BuildCache(tmp_path)
+    for n, key in enumerate("abcd"):
+        with filling.entry(key, fill(400 * 1024)):
+            pass
+        os.utime(tmp_path / key / build_cache.STAMP, (n, n))
+    cache = BuildCache(tmp_path, max_mb=1)
+    with filling.entry("a", fill(0)):
+        os.utime(tmp_path / "a" / build_cache.STAMP, (0, 0))
+        # a was used longest ago but is in use, so b and c go
+        assert cache.evict() == ["b", "c"]
+    assert [key for _, _, key in cache.entries()] == ["a", "d"]
+    assert cache.clear() == ["a", "d"]
+    assert cache.entries() == []
+
+
+def build_shared(directory):
+    cache = BuildCache(directory)
+
+    def slow(path):
+        with open(Path(directory) / "builds.log", "a") as log:
+            log.write(f"{os.getpid()}\n")
+        time.sleep(0.2)
+        fill(1024)(path)
+
+    with cache.entry("verilator_shared", slow) as path:
+        return (path / "sim.vvp").stat().st_size
+
+
+def test_concurrent_runners_build_once(tmp_path):
+    with Pool(8) as pool:
+        assert pool.map(build_shared, [tmp_path] * 8) == [1024] * 8
+    assert len((tmp_path / "builds.log").read_text().splitlines()) == 1
@@ -0,0 +1,104 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tools import regress
+from tools.regress import FAIL, PASS, SKIP, TIMEOUT
+
+
+def block(root, name, scripts):
+    """A block whose tests, by <stage>/<test>, run these shell snippets."""
+    for test, script in scripts.items():
+        directory = root / name / "test_rtl" / test
+        directory.mkdir(parents=True)
+        (directory / "run.sh").write_text(f"#!/bin/bash\necho {test}\n{script}\n")
+
+
+def statuses(tasks):
+    return {task.id: task.status for task in tasks}
+
+
+def test_discovers_and_links_a_block(tmp_path):
+    block(tmp_path, "core", {"lint/core": "", "formal/core": "", "simulation/icarus/core": "",
+                             "mutation/core": "", "synth/core": ""})
+    bench = tmp_path / "core" / "test_rtl" / "simulation" / "cocotb" / "core"
+    bench.mkdir(parents=True)
+    (bench / "run.sh").write_text("")
+    (bench / "testrunner.py").write_text("from tools.runner import Bench\n"
+                                         "BENCH = Bench(__file__, 'core', builds=[{'W': 8}, {'W': 16}])\n")
+    tasks = {task.id: task for task in regress.discover(tmp_path)}
+    assert sorted(tasks) == ["core/formal/core", "core/lint/core", "core/mutation/core",
+                             "core/simulation/cocotb/core.icarus", "core/simulation/cocotb/core.verilator",
+                             "core/simulation/icarus/core", "core/synth/core"]
+    assert tasks["core/lint/core"].needs == []
+    assert [need.id for need in tasks["core/synth/core"].needs] == ["core/lint/core"]
+    assert [need.id for need in tasks["core/mutation/core"].needs] == ["core/lint/core", "core/simulation/icarus/core"]
+    assert tasks["core/mutation/core"].weight == regress.MCY_JOBS
+    assert tasks["core/simulation/cocotb/core.verilator"].command[-4:] == ["--sim", "verilator", "--jobs", "2"]
+    assert tasks["core/simulation/cocotb/core.verilator"].weight == 2
+
+
+def test_selects_blocks_directories_and_stages(tmp_path):
+    block(tmp_path, "a", {"lint/a": "", "simulation/icarus/a": "", "synth/a": ""})
+    block(tmp_path, "b", {"lint/b": "", "synth/b": ""})
+    tasks = regress.discover(tmp_path)
+    assert [task.id for task in regress.select(tasks, ["b"])] == ["b/lint/b", "b/synth/b"]
+    assert [task.id for task in regress.select(tasks, [tmp_path / "a" / "test_rtl" / "simulation"])] == \
+        ["a/simulation/icarus/a"]
+    assert [task.id for task in regress.select(tasks, stages=["synth"])] == ["a/synth/a", "b/synth/b"]
+
+
+def test_failures_skip_what_waits_on_them_and_are_logged(tmp_path):
+    block(tmp_path, "good", {"lint/good": "", "synth/good": "", "formal/good": "exit 3"})
+    block(tmp_path, "bad", {"lint/bad": "echo oops; exit 1", "synth/bad": "", "simulation/icarus/bad": "",
+                            "mutation/bad": ""})
+    tasks = regress.discover(tmp_path)
+    regress.run(tasks, jobs=4, logs=tmp_path / "logs", echo=lambda line: None)
+    assert statuses(tasks) == {"good/lint/good": PASS, "good/synth/good": PASS, "good/formal/good": FAIL,
+                               "bad/lint/bad": FAIL, "bad/synth/bad": SKIP, "bad/simulation/icarus/bad": SKIP,
+                               "bad/mutation/bad": SKIP}
+    formal = next(task for task in tasks if task.id == "good/formal/good")
+    assert formal.returncode == 3
+    assert "oops" in (tmp_path / "logs" / "bad" / "lint" / "bad.log").read_text()
+
+    for task in tasks:
+        task.status = None
+    regress.run(tasks, jobs=4, logs=tmp_path / "logs", keep_going=True, echo=lambda line: None)
+    assert statuses(tasks)["bad/synth/bad"] == PASS
+
+
+def test_blocks_run_in_parallel(tmp_path):
+    for name in "abcd":
+        block(tmp_path, name, {f"lint/{name}": "sleep 0.5", f"synth/{name}": "sleep 0.5"})
+    tasks = regress.discover(tmp_path)
+    wall = regress.run(tasks, jobs=4, logs=tmp_path / "logs", echo=lambda line: None)
+    assert set(statuses(tasks).values()) == {PASS}
+    # Bound by one block's chain (1 s), not the sum of the blocks (4 s)
+    assert wall < 2.5
+    for task in tasks:
+        if task.stage == "synth":
+            lint = task.needs[0]
+            assert task.started >= lint.finished
+
+
+def test_weights_and_timeouts(tmp_path):
+    block(tmp_path, "a", {"lint/a": "sleep 10", "lint/b": "sleep 0.2", "lint/c": "sleep 0.2"})
+    tasks = regress.discover(tmp_path)
+    tasks[0].weight = 2
+    wall = regress.run(tasks, jobs=2, logs=tmp_path / "logs", timeout=0.5, echo=lambda line: None)
+    assert statuses(tasks) == {"a/lint/a": TIMEOUT, "a/lint/b": PASS, "a/lint/c": PASS}
+    # The two-worker task ran alone
+    b, c = tasks[1], tasks[2]
+    assert tasks[0].finished <= min(b.started, c.started) or tasks[0].started >= max(b.finished, c.finished)
+    assert wall < 5
+
+
+def test_report(tmp_path):
+    block(tmp_path, "a", {"lint/a": "", "synth/a": "exit 1"})
+    tasks = regress.discover(tmp_path)
+    wall = regress.run(tasks, jobs=2, logs=tmp_path / "logs", echo=lambda line: None)
+    text, data = regress.report(tasks, wall, tmp_path / "logs")
+    assert "a/synth/a" in text.split("failed:")[1]
+    assert data["tasks"]["a/lint/a"]["status"] == PASS
+    assert data["tasks"]["a/synth/a"]["returncode"] == 1
+    assert set(data["block_seconds"]) == {"a"}
@@ -0,0 +1,390 @@
+import wave
+
+import numpy as np
+
+
+def read_wav(path, channel=0):
+    """
+    Reads one channel of a PCM WAV file as 16-bit samples.
+
+    Args:
+        path: WAV file, 8, 16, 24 or 32-bit PCM.
+        channel: Channel to keep.
+
+    Returns:
+        A tuple (samples, rate): an int16 array, wider formats keeping their
+        top 16 bits and 8-bit (unsigned) ones scaled up, and the sample rate
+        in Hz.
+    """
+    with wave.open(str(path), 'rb') as wav:
+        width = wav.getsampwidth()
+        channels = wav.getnchannels()
+        rate = wav.getframerate()
+        raw = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.uint8)
+
+    frames = raw.reshape(-1, channels, width)[:, channel, :].astype(np.int32)
+    if width == 1:
+        samples = (frames[:, 0] - 128) << 8
+    else:
+        # Little-endian two's complement; keep the top two bytes
+        samples = frames[:, -2] | (frames[:, -1] << 8)
+        samples = np.where(samples >= 1 << 15, samples - (1 << 16), samples)
+
+    return samples.astype(np.int16), rate
+
+
+def tone(frequency, num_samples, rate=44100, amplitude=0.5):
+    """A sine tone as int16 samples, frequency in Hz at the given rate."""
+    t = np.arange(num_samples) / rate
+    return np.round(amplitude * 32767 * np.sin(2 * np.pi * frequency * t)).astype(np.int16)
+
+
+#
+# Model of the PWM output
+#
+PWM_BITS = 16
+DEFAULT_RELOAD = 1814   # wbpwmaudio.v's default, about 44.1 kHz at 80 MHz
+
+_BITREV = None
+
+
+def bitrev_table():
+    """br_counter for every value of pwm_counter, as a uint16 array."""
+    global _BITREV
+    if _BITREV is None:
+        counter = np.arange(1 << PWM_BITS, dtype=np.uint32)
+        table = np.zeros_like(counter)
+        for k in range(PWM_BITS):
+            table |= ((counter >> k) & 1) << (PWM_BITS - 1 - k)
+        _BITREV = table.astype(np.uint16)
+    return _BITREV
+
+
+def sample_period(reload=DEFAULT_RELOAD, timing_bits=16, written=False):
+    """
+    Clocks between two samples.
+
+    Args:
+        reload: DEFAULT_RELOAD, or with written=True the value written to
+            address 1 of a VARIABLE_RATE core (which stores it minus one).
+        timing_bits: TIMING_BITS, the width of the timer.
+
+    Returns:
+        The number of clocks per sample: the timer counts reload down to
+        zero, then spends a clock reloading.
+    """
+    mask = (1 << timing_bits) - 1
+    if written:
+        return ((reload - 1) & mask) + 1
+    return (reload & mask) + 1
+
+
+def offset_binary(samples):
+    """Two's complement samples to the unsigned form kept in sample_out."""
+    return (np.asarray(samples, dtype=np.int64) & 0xffff ^ 0x8000).astype(np.uint16)
+
+
+def pwm_bits(played, period, first, count, start=None):
+    """
+    o_pwm after 'count' clocks, counted from the clock after reset.
+
+    After reset the timer moves a new sample into sample_out every
+    'period' clocks, the first at clock period-1, and o_pwm compares
+    sample_out against the bit-reversed free running counter. Clock e thus
+    plays sample (e - start) // period, start being 'period'.
+
+    A reload value written to a VARIABLE_RATE core only takes effect at the
+    next reload; pass the clock after that reload as 'start'.
+
+    Args:
+        played: Samples moved into sample_out, offset binary (see
+            offset_binary()), in order.
+        period: sample_period() of the core.
+        first: First clock, at least 'start' (before that, sample_out
+            holds whatever it held before reset).
+        count: Number of clocks.
+        start: First clock of the first played sample.
+
+    Returns:
+        A boolean array, o_pwm after each clock, False past the last sample.
+    """
+    if start is None:
+        start = period
+    played = np.asarray(played, dtype=np.uint16)
+    clock = np.arange(first, first + count, dtype=np.int64)
+    k = (clock - start) // period
+    valid = k < len(played)
+    sample = played[np.where(valid, k, 0)]
+    br = bitrev_table()[clock & ((1 << PWM_BITS) - 1)]
+
+    return valid & (sample >= br)
+
+
+def pwm_chunks(played, period, block=1 << 22, start=None):
+    """pwm_bits() over every played sample, as consecutive blocks."""
+    if start is None:
+        start = period
+    end = start + len(played) * period
+    for first in range(start, end, block):
+        yield pwm_bits(played, period, first, min(block, end - first), start)
+
+
+def lowpass(cutoff, rate, num_taps=None):
+    """Kaiser-windowed sinc low-pass FIR taps, unity gain at DC."""
+    if num_taps is None:
+        num_taps = int(8 * rate / cutoff) | 1
+    n = np.arange(num_taps) - (num_taps - 1) / 2
+    taps = np.sinc(2 * cutoff / rate * n) * np.kaiser(num_taps, 10.0)
+    return taps / taps.sum()
+
+
+def reconstruct(chunks, clock_hz, cutoff=20e3, decimation=16, out_rate=96e3):
+    """
+    Reconstruction filter for a PWM bit stream.
+
+    The bits are first averaged over blocks of 'decimation' clocks, then
+    low-pass filtered at 'cutoff' and resampled to about out_rate, as an
+    analog filter and an audio ADC would.
+
+    Args:
+        chunks: Iterable of boolean o_pwm blocks, each a multiple of
+            'decimation' long but for the last one.
+        clock_hz: Clock rate.
+
+    Returns:
+        A tuple (signal, rate): the output, centred on zero and scaled so
+        that full scale is +/-1, and its sample rate.
+    """
+    averages = []
+    for bits in chunks:
+        whole = len(bits) // decimation * decimation
+        averages.append(bits[:whole].reshape(-1, decimation).mean(axis=1))
+    signal = 2.0 * np.concatenate(averages) - 1.0
+    rate = clock_hz / decimation
+
+    step = max(1, int(rate // out_rate))
+    taps = lowpass(cutoff, rate)
+    signal = np.convolve(signal, taps, mode='valid')[::step]
+
+    return signal, rate / step
+
+
+def tone_metrics(signal, rate, frequency, band=20e3, num_harmonics=9):
+    """
+    SNR, THD and SINAD of a single tone.
+
+    A Blackman-Harris window keeps leakage below the noise; each tone
+    takes its bin and the four on each side.
+
+    Returns:
+        A dict with 'snr', 'thd' and 'sinad' in dB, 'enob' in bits and the
+        measured 'amplitude' of the fundamental.
+    """
+    n = len(signal)
+    a = [0.35875, 0.48829, 0.14128, 0.01168]
+    k = np.arange(n) / n
+    window = a[0] - a[1] * np.cos(2 * np.pi * k) + a[2] * np.cos(4 * np.pi * k) - a[3] * np.cos(6 * np.pi * k)
+    spectrum = np.abs(np.fft.rfft((signal - signal.mean()) * window))**2
+    bin_hz = rate / n
+    in_band = np.arange(len(spectrum)) * bin_hz <= band
+    in_band[:5] = False     # DC
+
+    def tone_bins(f):
+        center = int(round(f / bin_hz))
+        return slice(max(center - 4, 0), center + 5)
+
+    fundamental = spectrum[tone_bins(frequency)].sum()
+    harmonics = 0.0
+    used = np.zeros(len(spectrum), dtype=bool)
+    used[tone_bins(frequency)] = True
+    for h in range(2, num_harmonics + 2):
+        if h * frequency > band:
+            break
+        harmonics += spectrum[tone_bins(h * frequency)].sum()
+        used[tone_bins(h * frequency)] = True
+    noise = spectrum[in_band & ~used].sum()
+
+    sinad = 10 * np.log10(fundamental / (noise + harmonics))
+    return {'snr': 10 * np.log10(fundamental / noise),
+            'thd': 10 * np.log10(harmonics / fundamental),
+            'sinad': sinad,
+            'enob': (sinad - 1.76) / 6.02,
+            'amplitude': 2 * np.sqrt(fundamental / (n * (window**2).sum()))}
+
+
+def measure(clock_hz=80e6, period=DEFAULT_RELOAD + 1, frequency=1000.0, amplitude=0.5, duration=0.1,
+            cutoff=20e3):
+    """
+    Plays a tone through the PWM model and measures it.
+
+    Returns:
+        The tone_metrics() dict, plus the 'sample_rate' the period gives.
+    """
+    sample_rate = clock_hz / period
+    played = offset_binary(tone(frequency, int(duration * sample_rate), sample_rate, amplitude))
+    signal, rate = reconstruct(pwm_chunks(played, period), clock_hz, cutoff)
+    # Drop the filter's start-up
+    signal = signal[len(signal) // 10:]
+
+    return dict(tone_metrics(signal, rate, frequency, cutoff), sample_rate=sample_rate)
+
+
+def save_bitstream(path, bits):
+    """Saves o_pwm bits packed eight to a byte, first bit in the LSB."""
+    np.packbits(np.asarray(bits, dtype=bool), bitorder='little').tofile(path)
+
+
+def load_bitstream(path, count=None):
+    """Loads a save_bitstream() capture as a boolean array."""
+    bits = np.unpackbits(np.fromfile(path, dtype=np.uint8), bitorder='little').astype(bool)
+    return bits if count is None else bits[:count]
+
+
+#
+# Model of the sample FIFO (LGFIFO > 0)
+#
+class SampleFifo:
+    """
+    The sample FIFO of a core built with LGFIFO > 0.
+
+    Samples are pushed by bus writes and popped by the timer, one per sample
+    period. A push to a full FIFO is dropped; a pop from an empty one is an
+    underrun, sample_out then playing its previous sample again. o_int is
+    high whenever the level is at or below the watermark.
+    """
+    def __init__(self, lgfifo, watermark=0):
+        self.depth = 1 << lgfifo
+        self.watermark = watermark
+        self.samples = []
+        self.sample_out = 0x8000
+        self.underruns = 0
+        self.dropped = 0
+
+    @property
+    def level(self):
+        return len(self.samples)
+
+    @property
+    def irq(self):
+        return self.level <= self.watermark
+
+    def status(self):
+        """The control register: watermark in bits 31:16, level in 15:0."""
+        return (self.watermark << 16) | self.level
+
+    def push(self, sample):
+        """Writes a two's complement sample; returns False if it was dropped."""
+        if self.level >= self.depth:
+            self.dropped += 1
+            return False
+        self.samples.append((int(sample) & 0xffff) ^ 0x8000)
+        return True
+
+    def pop(self):
+        """A timer reload; returns the new sample_out."""
+        if self.samples:
+            self.sample_out = self.samples.pop(0)
+        else:
+            self.underruns += 1
+        return self.sample_out
+
+
+def refill_latency_budget(watermark, period):
+    """
+    Longest interrupt latency, in clocks, that never underruns.
+
+    Once o_int rises the FIFO holds 'watermark' samples, which last until
+    the timer's next watermark+1 reloads; the status read and the first
+    write that follow the latency must land before the last of them. The
+    watermark must be below the depth, or o_int never drops.
+    """
+    return (watermark + 1) * period - 3
+
+
+def refill(lgfifo, watermark, period, samples, latency, rng=None):
+    """
+    Streams samples through a SampleFifo the way an interrupt handler would.
+
+    On every interrupt the handler waits 'latency' clocks, reads the FIFO
+    level (one clock) and then writes as many samples as fit, one per clock.
+    Timer reloads happen every 'period' clocks from clock period-1 on, as
+    after a reset, and the FIFO is filled right away, before the interrupt
+    is enabled.
+
+    Args:
+        lgfifo, watermark: The core's LGFIFO and the watermark written.
+        period: sample_period() of the core.
+        samples: Two's complement samples to stream.
+        latency: Clocks from o_int to the status read, an int or a (low,
+            high) range to draw from uniformly (inclusive).
+        rng: numpy Generator for random latencies.
+
+    Returns:
+        A dict with the 'played' samples (offset binary, up to the last
+        streamed one), the 'underruns' on the way, the number of
+        'interrupts' taken and the 'clocks' it all took.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    fifo = SampleFifo(lgfifo, watermark)
+    played = []
+    next_pop = period - 1
+    position = 0
+    interrupts = 0
+
+    def pop_until(clock):
+        # Reloads up to and including 'clock', ahead of a write at it
+        nonlocal next_pop
+        while next_pop <= clock:
+            played.append(fifo.pop())
+            next_pop += period
+
+    clock = 0
+    delay = 0
+    while position < len(samples):
+        if position:
+            if not fifo.irq:
+                # The reload that brings the level down to the watermark
+                clock = next_pop + (fifo.level - fifo.watermark - 1) * period
+                pop_until(clock)
+            interrupts += 1
+            if np.isscalar(latency):
+                delay = int(latency)
+            else:
+                delay = int(rng.integers(latency[0], latency[1] + 1))
+        # The status read at 'clock' sees the level before that clock's
+        # reload; the writes follow from two clocks later
+        clock += delay
+        pop_until(clock - 1)
+        count = min(fifo.depth - fifo.level, len(samples) - position)
+        clock += 1
+        for sample in samples[position:position + count]:
+            clock += 1
+            # A reload in the same clock as a write still sees the FIFO
+            # without it
+            pop_until(clock)
+            fifo.push(sample)
+        position += count
+        pop_until(clock)
+
+    # Drain what's left
+    pop_until(next_pop + (fifo.level - 1) * period)
+    return {'played': np.array(played, dtype=np.uint16), 'underruns': fifo.underruns,
+            'interrupts': interrupts, 'clocks': clock}
+
+
+def main():
+    # (clock, DEFAULT_RELOAD, TIMING_BITS) combinations to compare
+    settings = [(80e6, 1814, 16), (100e6, 2268, 16), (80e6, 906, 16), (80e6, 3628, 16), (80e6, 1814, 10)]
+
+    print(f"{'clock':>7} {'reload':>6} {'bits':>4} {'period':>6} {'rate':>8} {'SNR':>6} {'THD':>7} "
+          f"{'SINAD':>6} {'ENOB':>5}")
+    for clock_hz, reload, timing_bits in settings:
+        period = sample_period(reload, timing_bits)
+        m = measure(clock_hz, period, frequency=1000.0, amplitude=0.5, duration=0.1)
+        print(f"{clock_hz / 1e6:>5.0f}M {reload:>6} {timing_bits:>4} {period:>6} {m['sample_rate']:>8.0f} "
+              f"{m['snr']:>6.1f} {m['thd']:>7.1f} {m['sinad']:>6.1f} {m['enob']:>5.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -44,6 +44,22 @@
 //	stay constant.
 //
 //
+//	With LGFIFO > 0, the one sample buffer becomes a FIFO of 2^LGFIFO
+//	samples, and the bus gains a second address bit:
+//
+//	Addr[0] (and Addr[1] if VARIABLE_RATE is 0) writes push samples
+//		into the FIFO.  Writes to a full FIFO are dropped.
+//
+//	Addr[2] (or 3) is the FIFO control register.  Writes set the low
+//		watermark: the interrupt is raised whenever the FIFO holds no
+//		more than this many samples.  Reads return the watermark in
+//		bits 31:16 and the FIFO level in bits 15:0.
+//
+//	A watermark of zero interrupts on an empty FIFO, as the one sample
+//	buffer does.  A higher one leaves the CPU time to refill the FIFO in
+//	a burst, taking one interrupt per burst rather than one per sample.
+//
+//
 //	Of course, if you don't want to deal with the interrupts or sample
 //	rates, you can still get a pseudo analog output by just setting the
 //	value to the analog output you would like and then not updating
@@ -90,10 +106,12 @@ module	wbpwmaudio(i_clk, i_reset,
 			//DEFAULT_RELOAD = 16'd2268,//about 44.1 kHz @ 100MHz
 			NAUX=2, // Dev control values
 			VARIABLE_RATE=0,
-			TIMING_BITS=16;
+			TIMING_BITS=16,
+			LGFIFO=0; // Log2 FIFO depth (up to 14), 0 for one sample
+	localparam	AW = (LGFIFO > 0) ? 2 : 1;
 	input	wire		i_clk, i_reset;
 	input	wire		i_wb_cyc, i_wb_stb, i_wb_we;
-	input	wire		i_wb_addr;
+	input	wire	[(AW-1):0]	i_wb_addr;
 	input	wire	[31:0]	i_wb_data;
 	output	reg		o_wb_ack;
 	output	wire		o_wb_stall;
@@ -102,6 +120,20 @@ module	wbpwmaudio(i_clk, i_reset,
 	output	reg	[(NAUX-1):0]	o_aux;
 	output	wire		o_int;
 
+	// Address decoding.  Without the FIFO there's no control register,
+	// and the one address bit is all there is.
+	wire	[1:0]	w_addr;
+	generate
+	if (LGFIFO > 0)
+	begin : GEN_FIFO_ADDR
+		assign	w_addr = i_wb_addr;
+	end else begin : GEN_BUFFER_ADDR
+		assign	w_addr = { 1'b0, i_wb_addr };
+	end endgenerate
+
+	wire	data_write;
+	assign	data_write = (i_wb_stb)&&(i_wb_we)&&(!w_addr[1])
+				&&((!w_addr[0])||(VARIABLE_RATE==0));
 
 	// How often shall we create an interrupt?  Every reload_value clocks!
 	// If VARIABLE_RATE==0, this value will never change and will be kept
@@ -113,7 +145,7 @@ module	wbpwmaudio(i_clk, i_reset,
 		reg	[(TIMING_BITS-1):0]	r_reload_value;
 		initial	r_reload_value = DEFAULT_RELOAD;
 		always @(posedge i_clk) // Data write
-			if ((i_wb_stb)&&(i_wb_addr)&&(i_wb_we))
+			if ((i_wb_stb)&&(w_addr == 2'b01)&&(i_wb_we))
 				r_reload_value <= i_wb_data[(TIMING_BITS-1):0] - 1'b1;
 		assign	w_reload_value = r_reload_value;
 	end else begin : FIXED_RELOAD_VALUE
@@ -144,44 +176,116 @@ module	wbpwmaudio(i_clk, i_reset,
 			timer <= timer - {{(TIMING_BITS-1){1'b0}},1'b1};
 
 	//
-	// Whenever the timer runs out, accept the next value from the single
-	// sample buffer.
+	// The aux bits are written along with any sample
 	//
-	reg	[15:0]	sample_out;
 	always @(posedge i_clk)
-		if (ztimer)
-			sample_out <= next_sample;
-
+		if ((data_write)&&(i_wb_data[16]))
+			o_aux <= i_wb_data[(NAUX+20-1):20];
 
 	//
-	// Control what's in the single sample buffer, next_sample, as well as
-	// whether or not it's a valid sample.  Specifically, if next_valid is
-	// false, then the sample buffer needs a new value.  Once the buffer
-	// has a value within it, further writes will just quietly overwrite
-	// this value.
-	reg	[15:0]	next_sample;
-	reg		next_valid;
-	initial	next_valid = 1'b1;
-	initial	next_sample = 16'h8000;
-	always @(posedge i_clk) // Data write
-		if ((i_wb_stb)&&(i_wb_we)
-				&&((!i_wb_addr)||(VARIABLE_RATE==0)))
-		begin
-			// Write with two's complement data, convert it
-			// internally to an unsigned binary offset
-			// representation
-			next_sample <= { !i_wb_data[15], i_wb_data[14:0] };
-			next_valid <= 1'b1;
-			if (i_wb_data[16])
-				o_aux <= i_wb_data[(NAUX+20-1):20];
-		end else if (ztimer)
-			next_valid <= 1'b0;
-
-	// If the value in our sample buffer isn't valid, create an interrupt
-	// that can be sent to a processor to know when to send a new sample.
-	// This output can also be used to control a read from a FIFO as well,
-	// depending on how you wish to use the core.
-	assign	o_int = (!next_valid);
+	// Whenever the timer runs out, accept the next value from the sample
+	// buffer.  sample_valid is true while the buffer holds a sample that
+	// hasn't been played yet; when it's false at that time, the previous
+	// sample plays again (an underrun).
+	//
+	reg	[15:0]	sample_out;
+	wire		sample_valid;
+	wire	[31:0]	fifo_status;
+
+	generate
+	if (LGFIFO == 0)
+	begin : GEN_SAMPLE_BUFFER
+
+		//
+		// Control what's in the single sample buffer, next_sample, as
+		// well as whether or not it's a valid sample.  Specifically, if
+		// next_valid is false, then the sample buffer needs a new
+		// value.  Once the buffer has a value within it, further writes
+		// will just quietly overwrite this value.
+		reg	[15:0]	next_sample;
+		reg		next_valid;
+		initial	next_valid = 1'b1;
+		initial	next_sample = 16'h8000;
+		always @(posedge i_clk) // Data write
+			if (data_write)
+			begin
+				// Write with two's complement data, convert it
+				// internally to an unsigned binary offset
+				// representation
+				next_sample <= { !i_wb_data[15], i_wb_data[14:0] };
+				next_valid <= 1'b1;
+			end else if (ztimer)
+				next_valid <= 1'b0;
+
+		always @(posedge i_clk)
+			if (ztimer)
+				sample_out <= next_sample;
+
+		assign	sample_valid = next_valid;
+
+		// If the value in our sample buffer isn't valid, create an
+		// interrupt that can be sent to a processor to know when to
+		// send a new sample.  This output can also be used to control
+		// a read from a FIFO as well, depending on how you wish to use
+		// the core.
+		assign	o_int = (!next_valid);
+		assign	fifo_status = 32'h0;
+
+	end else begin : GEN_SAMPLE_FIFO
+
+		//
+		// Sample FIFO.  The pointers carry one extra bit, so that
+		// their difference is the FIFO level from empty to full.
+		//
+		reg	[15:0]		fifo_mem [0:((1<<LGFIFO)-1)];
+		reg	[LGFIFO:0]	wr_addr, rd_addr, r_watermark;
+		wire	[LGFIFO:0]	fifo_level;
+		wire			fifo_full, fifo_empty;
+
+		assign	fifo_level = wr_addr - rd_addr;
+		assign	fifo_full  = fifo_level[LGFIFO];
+		assign	fifo_empty = (fifo_level == 0);
+
+		initial	wr_addr = 0;
+		always @(posedge i_clk)
+			if (i_reset)
+				wr_addr <= 0;
+			else if ((data_write)&&(!fifo_full))
+				wr_addr <= wr_addr + 1'b1;
+
+		always @(posedge i_clk)
+			if ((data_write)&&(!fifo_full))
+				// Two's complement in, unsigned binary offset
+				// out, as for the one sample buffer
+				fifo_mem[wr_addr[(LGFIFO-1):0]]
+					<= { !i_wb_data[15], i_wb_data[14:0] };
+
+		initial	rd_addr = 0;
+		always @(posedge i_clk)
+			if (i_reset)
+				rd_addr <= 0;
+			else if ((ztimer)&&(!fifo_empty))
+				rd_addr <= rd_addr + 1'b1;
+
+		// The FIFO starts out empty, so the first sample period plays
+		// mid-scale rather than an unknown value
+		initial	sample_out = 16'h8000;
+		always @(posedge i_clk)
+			if ((ztimer)&&(!fifo_empty))
+				sample_out <= fifo_mem[rd_addr[(LGFIFO-1):0]];
+
+		// Low watermark
+		initial	r_watermark = 0;
+		always @(posedge i_clk)
+			if ((i_wb_stb)&&(i_wb_we)&&(w_addr[1]))
+				r_watermark <= i_wb_data[LGFIFO:0];
+
+		assign	sample_valid = !fifo_empty;
+		assign	o_int = (fifo_level <= r_watermark);
+		assign	fifo_status = { {(15-LGFIFO){1'b0}}, r_watermark,
+					{(15-LGFIFO){1'b0}}, fifo_level };
+
+	end endgenerate
 
 	//
 	// To generate our waveform, we'll compare our sample value against
@@ -211,7 +315,7 @@ module	wbpwmaudio(i_clk, i_reset,
 	//
 	// Handle the bus return traffic.
 	generate
-	if (VARIABLE_RATE == 0)
+	if ((VARIABLE_RATE == 0)&&(LGFIFO == 0))
 	begin : FIXWB_RETURN
 		// If we are running off of a fixed rate, then just return
 		// the current setting of the aux registers, the current
@@ -222,11 +326,15 @@ module	wbpwmaudio(i_clk, i_reset,
 		// On the other hand, if we have been built to support a
 		// variable sample rate, then return the reload value for
 		// address one but otherwise the data value (above) for address
-		// zero.
+		// zero.  With a FIFO, addresses two and three return its
+		// control register.
 		reg	[31:0]	r_wb_data;
 		always @(posedge i_clk)
-			if (i_wb_addr)
-				r_wb_data <= { (32-TIMING_BITS),w_reload_value};
+			if (w_addr[1])
+				r_wb_data <= fifo_status;
+			else if ((w_addr[0])&&(VARIABLE_RATE != 0))
+				r_wb_data <= { {(32-TIMING_BITS){1'b0}},
+						w_reload_value };
 			else
 				r_wb_data <= { {(12-NAUX){1'b0}}, o_aux,
 						3'h0, o_int, sample_out };
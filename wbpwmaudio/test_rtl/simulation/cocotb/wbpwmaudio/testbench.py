@@ -1,8 +1,260 @@
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
 import cocotb
-from cocotb.triggers import Timer
+from cocotb.clock import Clock
+from cocotb.triggers import RisingEdge
+from cocotb.utils import get_sim_time
+
+from wishbone import WishboneMaster
+
+# wbpwmaudio/python holds the audio helpers
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / "python"))
+from design import (offset_binary, pwm_bits, read_wav, refill, refill_latency_budget, sample_period,
+                    save_bitstream, tone)
+
+NAUX = 2                # must match wbpwmaudio.v
+# Must match the parameters the runner builds with
+DEFAULT_RELOAD = int(os.getenv("WBPWM_DEFAULT_RELOAD", "1814"))
+LGFIFO = int(os.getenv("WBPWM_LGFIFO", "0"))
+AUDIO = os.getenv("WBPWM_AUDIO")  # WAV file to stream, a tone otherwise
+NUM_SAMPLES = int(os.getenv("WBPWM_SAMPLES", "32"))
+PWM_SAMPLES = int(os.getenv("WBPWM_PWM_SAMPLES", "6"))  # sample periods of o_pwm checked
+PWM_CAPTURE = os.getenv("WBPWM_PWM_CAPTURE")  # file to save the o_pwm capture to
+FIFO_SAMPLES = int(os.getenv("WBPWM_FIFO_SAMPLES", "256"))
+FIFO_WATERMARK = int(os.getenv("WBPWM_FIFO_WATERMARK", "4"))
+SEED = int(os.getenv("WBPWM_SEED", "1"))
+
+async def reset_dut(dut):
+    dut.i_wb_addr.value = 0
+    dut.i_wb_data.value = 0
+    dut.i_reset.value = 1
+    await RisingEdge(dut.i_clk)
+    await RisingEdge(dut.i_clk)
+    dut.i_reset.value = 0
+    await RisingEdge(dut.i_clk)
+
+class PlaybackMonitor:
+    """
+    Records every sample the timer moves into sample_out, with the clock
+    it did so at (counting from the first clock run()), and counts an
+    underrun whenever it does so with the buffer or FIFO empty
+    (sample_valid low), i.e. repeats the previous sample.
+    """
+    def __init__(self, dut):
+        self.dut = dut
+        self.played = []
+        self.clocks = []
+        self.underruns = 0
+
+    async def run(self):
+        dut = self.dut
+        clock = 0
+        reload = False
+        while True:
+            await RisingEdge(dut.i_clk)
+            # sample_out as the reload one clock back left it
+            if reload:
+                self.played.append(dut.sample_out.value.integer)
+                self.clocks.append(clock - 1)
+            reload = bool(dut.ztimer.value)
+            if reload and not dut.sample_valid.value:
+                self.underruns += 1
+            clock += 1
+
+class AudioStreamer:
+    """Writes samples over the bus, 'burst' at a time, whenever o_int asks for more."""
+    def __init__(self, dut, bus, samples, burst=1):
+        self.dut = dut
+        self.bus = bus
+        self.samples = samples
+        self.burst = burst
+
+    async def run(self):
+        dut = self.dut
+        position = 0
+        while position < len(self.samples):
+            await RisingEdge(dut.i_clk)
+            if dut.o_int.value:
+                chunk = self.samples[position:position + self.burst]
+                await self.bus.write(0, [int(s) & 0xffff for s in chunk])
+                position += len(chunk)
+
+class FifoRefiller:
+    """
+    Interrupt handler for a FIFO build: fills the FIFO, then on every o_int
+    waits a random latency, reads the FIFO level and writes as many samples
+    as fit in one burst.
+    """
+    def __init__(self, dut, bus, samples, latency, rng):
+        self.dut = dut
+        self.bus = bus
+        self.samples = samples
+        self.latency = latency
+        self.rng = rng
+        self.interrupts = 0
+        self.min_burst = None
+
+    async def refill(self, position):
+        status = (await self.bus.read(2))[0]
+        count = min((1 << LGFIFO) - (status & 0xffff), len(self.samples) - position)
+        await self.bus.write(0, [int(s) & 0xffff for s in self.samples[position:position + count]])
+        return count
+
+    async def run(self):
+        dut = self.dut
+        position = await self.refill(0)
+        while position < len(self.samples):
+            await RisingEdge(dut.i_clk)
+            if dut.o_int.value:
+                self.interrupts += 1
+                for _ in range(int(self.rng.integers(self.latency[0], self.latency[1] + 1))):
+                    await RisingEdge(dut.i_clk)
+                count = await self.refill(position)
+                position += count
+                if position < len(self.samples):
+                    self.min_burst = count if self.min_burst is None else min(self.min_burst, count)
+
+@cocotb.test()
+async def test_bus_bursts(dut):
+    """Pipelined write and read bursts, one ack per request"""
+    cocotb.start_soon(Clock(dut.i_clk, 10, units="ns").start())
+    bus = WishboneMaster(dut)
+    await reset_dut(dut)
+
+    # Only the last write of a burst stays in next_sample (the FIFO keeps
+    # them all); bit 16 also writes o_aux from bits 20 and up
+    aux = (1 << NAUX) - 1
+    await bus.write(0, [(aux << 20) | (1 << 16) | k for k in range(8)])
+    assert bus.outstanding == 0, "Requests left outstanding after a write burst"
+    assert bus.transfers == 8, f"{bus.transfers} acks for 8 writes"
+    assert bus.cycles == 9, f"Write burst took {bus.cycles} clocks, 9 expected"
+
+    words = await bus.read(0, 4)
+    assert len(words) == 4 and bus.transfers == 12, "Read burst lost acks"
+    for word in words:
+        assert (word >> 20) & aux == aux, f"o_aux reads back as {(word >> 20) & aux}"
+    dut._log.info(f"{bus.transfers} transfers in {bus.bursts} bursts, {bus.cycles} bus clocks")
 
 @cocotb.test()
-async def test_wbpwmaudio(dut):
-    """Empty testbench that simply prints PASS."""
-    await Timer(1, units="ns")  # Wait for a small amount of time
-    dut._log.info("PASS")
\ No newline at end of file
+async def test_stream_audio(dut):
+    """Stream an audio file at the o_int rate; report bus utilization and underruns"""
+    cocotb.start_soon(Clock(dut.i_clk, 10, units="ns").start())
+    bus = WishboneMaster(dut)
+    await reset_dut(dut)
+
+    if AUDIO:
+        samples, _ = read_wav(AUDIO)
+        samples = samples[:NUM_SAMPLES]
+    else:
+        samples = tone(1000, NUM_SAMPLES)
+
+    # Start from an empty buffer, whatever the previous test left in it
+    while not dut.o_int.value:
+        await RisingEdge(dut.i_clk)
+    monitor = PlaybackMonitor(dut)
+    cocotb.start_soon(monitor.run())
+
+    streamer = AudioStreamer(dut, bus, samples)
+    start = get_sim_time(units="ns")
+    await streamer.run()
+    # Let the last sample reach sample_out
+    while len(monitor.played) < len(samples):
+        await RisingEdge(dut.i_clk)
+    clocks = int((get_sim_time(units="ns") - start) // 10)
+
+    dut._log.info(f"{len(samples)} samples in {clocks} clocks: {bus.transfers} transfers, "
+                  f"bus busy {100 * bus.cycles / clocks:.3f}% of clocks, "
+                  f"utilization {100 * bus.transfers / clocks:.3f}%, {monitor.underruns} underruns")
+
+    assert monitor.underruns == 0, f"{monitor.underruns} sample underruns"
+    # sample_out holds the offset binary form of the written samples
+    expected = offset_binary(samples)
+    played = np.array(monitor.played[:len(samples)])
+    assert np.array_equal(played, expected), "Played samples differ from the streamed ones"
+
+@cocotb.test()
+async def test_pwm_bitstream(dut):
+    """Capture o_pwm over several sample periods and compare it with the model in bulk"""
+    cocotb.start_soon(Clock(dut.i_clk, 10, units="ns").start())
+    bus = WishboneMaster(dut)
+    dut.i_wb_addr.value = 0
+    dut.i_wb_data.value = 0
+    dut.i_reset.value = 1
+    await RisingEdge(dut.i_clk)
+    await RisingEdge(dut.i_clk)
+    dut.i_reset.value = 0
+
+    # Clock 0 is the first one out of reset
+    monitor = PlaybackMonitor(dut)
+    cocotb.start_soon(monitor.run())
+    cocotb.start_soon(AudioStreamer(dut, bus, tone(3000, PWM_SAMPLES)).run())
+
+    # sample_out is only known from the first reload on, clock 'period'
+    period = sample_period(DEFAULT_RELOAD)
+    bits = np.zeros(PWM_SAMPLES * period, dtype=bool)
+    for clock in range(period + len(bits) + 1):
+        await RisingEdge(dut.i_clk)
+        # o_pwm as set by the previous clock
+        if clock > period:
+            bits[clock - 1 - period] = bool(dut.o_pwm.value)
+    if PWM_CAPTURE:
+        save_bitstream(PWM_CAPTURE, bits)
+
+    expected_clocks = period - 1 + period * np.arange(len(monitor.clocks))
+    assert np.array_equal(monitor.clocks, expected_clocks), "Samples aren't taken every DEFAULT_RELOAD+1 clocks"
+    expected = pwm_bits(monitor.played, period, period, len(bits))
+    mismatches = np.flatnonzero(bits != expected)
+    if len(mismatches):
+        first = mismatches[0]
+        dut._log.error(f"{len(mismatches)} o_pwm mismatches, first at clock {period + first}: "
+                       f"dut {int(bits[first])} model {int(expected[first])}")
+    assert len(mismatches) == 0, "o_pwm doesn't match the model"
+    dut._log.info(f"{len(bits)} o_pwm bits over {PWM_SAMPLES} samples match the model")
+
+@cocotb.test()
+async def test_fifo_bursty_refill(dut):
+    """Refill the FIFO in bursts after random interrupt latencies; nothing may underrun"""
+    if LGFIFO == 0:
+        dut._log.info("Built without a FIFO (LGFIFO=0), skipping")
+        return
+    cocotb.start_soon(Clock(dut.i_clk, 10, units="ns").start())
+    bus = WishboneMaster(dut)
+    await reset_dut(dut)
+    monitor = PlaybackMonitor(dut)
+    cocotb.start_soon(monitor.run())
+
+    depth = 1 << LGFIFO
+    watermark = min(FIFO_WATERMARK, depth - 1)
+    period = sample_period(DEFAULT_RELOAD)
+    await bus.write(2, [watermark])
+    status = (await bus.read(2))[0]
+    assert status >> 16 == watermark, f"Watermark reads back as {status >> 16}, {watermark} written"
+    assert status & 0xffff == 0, f"FIFO level {status & 0xffff} after reset"
+
+    # o_int is seen a clock late here, and the status read takes a clock
+    # longer to return than refill_latency_budget() allows for
+    rng = np.random.default_rng(SEED)
+    latency = (0, refill_latency_budget(watermark, period) - 2)
+    samples = tone(1000, FIFO_SAMPLES)
+    handler = FifoRefiller(dut, bus, samples, latency, rng)
+    await handler.run()
+    while len(monitor.played) < len(samples):
+        await RisingEdge(dut.i_clk)
+
+    model = refill(LGFIFO, watermark, period, samples, latency, np.random.default_rng(SEED))
+    dut._log.info(f"{len(samples)} samples through a {depth} sample FIFO, watermark {watermark}, "
+                  f"latency up to {latency[1]} clocks: {handler.interrupts} interrupts "
+                  f"(model {model['interrupts']}), bursts of at least {handler.min_burst}, "
+                  f"{monitor.underruns} underruns")
+
+    assert monitor.underruns == 0, f"{monitor.underruns} sample underruns"
+    assert model['underruns'] == 0, f"The model underran {model['underruns']} times"
+    played = np.array(monitor.played[:len(samples)])
+    assert np.array_equal(played, offset_binary(samples)), "Played samples differ from the streamed ones"
+    # Every interrupt finds no more than the watermark in the FIFO
+    assert handler.min_burst is None or handler.min_burst >= depth - watermark, \
+        f"A refill burst of {handler.min_burst} samples, {depth - watermark} expected at least"
@@ -0,0 +1,15 @@
+import sys
+from pathlib import Path
+
+# The repository root holds the shared test tools
+sys.path.insert(0, str(Path(__file__).resolve().parents[5]))
+from tools.runner import Bench, main
+
+# The defaults, then again with a sample FIFO and a shorter sample period
+# to keep the refill test quick
+BENCH = Bench(__file__, "wbpwmaudio",
+              builds=[{}, {"LGFIFO": 4, "DEFAULT_RELOAD": 99}],
+              env_prefix="WBPWM_")
+
+if __name__ == "__main__":
+    sys.exit(main(BENCH))
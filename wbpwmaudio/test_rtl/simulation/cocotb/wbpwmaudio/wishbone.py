@@ -0,0 +1,135 @@
+from cocotb.triggers import RisingEdge
+
+
+class WishboneMaster:
+    """
+    Wishbone bus-functional master for cocotb, pipelined or classic.
+
+    Transfers go out as bursts within one bus cycle, i_wb_cyc held high
+    from the first request to the last ack.
+
+    Pipelined mode issues a new request on every clock the slave does not
+    stall, with up to max_outstanding requests waiting for their ack; acks
+    are matched to requests in order. Classic mode holds each request on
+    the bus until it is acknowledged, so only suits slaves that qualify
+    i_wb_stb with their own ack (a slave that acks every i_wb_stb one clock
+    later, like wbpwmaudio, has to be driven pipelined).
+
+    Signals are sampled at the rising edge, i.e. as they were during the
+    clock that edge ends, and driven right after it.
+
+    The counters (transfers, cycles, stall_cycles, bursts) accumulate over
+    every burst, for bus utilization figures.
+    """
+    def __init__(self, dut, clk=None, prefix="i_wb_", out_prefix="o_wb_", pipelined=True,
+                 max_outstanding=16, timeout=1000):
+        self.clk = dut.i_clk if clk is None else clk
+        self.cyc = getattr(dut, prefix + "cyc")
+        self.stb = getattr(dut, prefix + "stb")
+        self.we = getattr(dut, prefix + "we")
+        self.addr = getattr(dut, prefix + "addr")
+        self.data = getattr(dut, prefix + "data")
+        self.ack = getattr(dut, out_prefix + "ack")
+        self.stall = getattr(dut, out_prefix + "stall", None)
+        self.rdata = getattr(dut, out_prefix + "data")
+
+        self.pipelined = pipelined
+        self.max_outstanding = max_outstanding if pipelined else 1
+        self.timeout = timeout
+
+        self.transfers = 0      # acknowledged transfers
+        self.cycles = 0         # clocks with i_wb_cyc high
+        self.stall_cycles = 0   # clocks a request was held off by o_wb_stall
+        self.bursts = 0
+
+        self._issued = 0
+        self._acked = 0
+        self.idle()
+
+    def idle(self):
+        """Drives an idle bus."""
+        self.cyc.value = 0
+        self.stb.value = 0
+        self.we.value = 0
+
+    @property
+    def outstanding(self):
+        """Requests issued and not yet acknowledged; zero between bursts."""
+        return self._issued - self._acked
+
+    async def burst(self, ops):
+        """
+        Runs a list of (we, addr, data) transfers as one bus cycle.
+
+        Returns:
+            One entry per transfer: the o_wb_data of a read, None for a
+            write.
+        """
+        num_ops = len(ops)
+        results = [None] * num_ops
+        self._issued = 0
+        self._acked = 0
+        self.bursts += 1
+        if not num_ops:
+            return results
+
+        waited = 0
+        self.cyc.value = 1
+        while self._acked < num_ops:
+            # Request to present this clock, if any
+            if self.pipelined:
+                current = self._issued
+                request = current < num_ops and current - self._acked < self.max_outstanding
+            else:
+                current = self._acked
+                request = True
+                self._issued = current + 1
+            if request:
+                we, addr, data = ops[current]
+                self.stb.value = 1
+                self.we.value = int(we)
+                self.addr.value = addr
+                if we:
+                    self.data.value = data
+            else:
+                self.stb.value = 0
+
+            await RisingEdge(self.clk)
+            self.cycles += 1
+            stalled = self.stall is not None and bool(self.stall.value)
+
+            # An ack at this edge answers a request accepted at an earlier
+            # one (or, in classic mode, the request on the bus now)
+            if self.ack.value:
+                if self.pipelined and self._acked >= self._issued:
+                    raise RuntimeError(f"Wishbone ack without an outstanding request "
+                                       f"(transfer {self._acked} of {num_ops})")
+                if not ops[self._acked][0]:
+                    results[self._acked] = self.rdata.value.integer
+                self._acked += 1
+                self.transfers += 1
+                waited = 0
+            else:
+                waited += 1
+                if waited > self.timeout:
+                    raise TimeoutError(f"Wishbone slave didn't ack within {self.timeout} clocks "
+                                       f"(transfer {self._acked} of {num_ops})")
+
+            if request and stalled:
+                self.stall_cycles += 1
+            elif request and self.pipelined:
+                self._issued += 1
+        self._issued = self._acked
+        self.idle()
+
+        return results
+
+    async def write(self, addr, values):
+        """Writes a burst of values, all to addr or one per address if addr is a list."""
+        addrs = addr if isinstance(addr, (list, tuple)) else [addr] * len(values)
+        await self.burst([(True, a, int(v)) for a, v in zip(addrs, values)])
+
+    async def read(self, addr, count=1):
+        """Reads count words from addr (or from each address of a list)."""
+        addrs = addr if isinstance(addr, (list, tuple)) else [addr] * count
+        return await self.burst([(False, a, 0) for a in addrs])